@@ -6,7 +6,7 @@ import Loader from '@/components/Loader';
 import ModalNewTask from '@/components/ModalNewTask';
 import TaskCard from '@/components/TaskCard';
 import { dataGridClassNames, dataGridSxStyles } from '@/lib/utils';
-import { Priority, Task, useGetTaskByUserQuery } from '@/state/api';
+import { Priority, Task, useGetTaskByUserPriorityQuery } from '@/state/api';
 import { DataGrid, GridColDef } from '@mui/x-data-grid';
 import { format, parseISO } from 'date-fns';
 import React, { useState, useMemo } from 'react';
@@ -178,17 +178,14 @@ const ReusablePage = ({ priority }: Props) => {
 
     const { data: currentUser } = useGetAuthUserQuery({});
     const userId = currentUser?.userDetails?.id;
-    const { data: tasks, isLoading, isError } = useGetTaskByUserQuery(userId || 0, {
+    // Filtered by priority on the server
+    const { data: tasks, isLoading, isError } = useGetTaskByUserPriorityQuery({ userId: userId || 0, priority }, {
         skip: !userId
     });
 
     const isDarkMode = useAppSelector((state) => state.global.isDarkMode);
 
-    // Memoize filtered tasks
-    const filteredTasks = useMemo(() => 
-        tasks?.filter((task: Task) => task.priority === priority) || [], 
-        [tasks, priority]
-    );
+    const filteredTasks = useMemo(() => tasks || [], [tasks]);
 
     const addTaskButton = (
         <button 
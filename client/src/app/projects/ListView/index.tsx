@@ -1,7 +1,7 @@
 import Header from '@/components/Header';
 import Loader from '@/components/Loader';
 import TaskCard from '@/components/TaskCard';
-import { Task, useGetTasksQuery } from '@/state/api';
+import { Task, useGetProjectStatsQuery, useGetTasksQuery } from '@/state/api';
 import React from 'react'
 
 type ListProps = {
@@ -16,6 +16,7 @@ const List = ({id, setIsModalNewTaskOpen} : ListProps) => {
         error,
         isLoading
     } = useGetTasksQuery({project_id: Number(id)});
+    const {data: stats} = useGetProjectStatsQuery(Number(id));
 
     if (isLoading) return <Loader/>
     if(error) return <div>An Error occured while fetching Tasks</div>
@@ -109,19 +110,19 @@ const List = ({id, setIsModalNewTaskOpen} : ListProps) => {
                         <div className="flex items-center gap-2 text-sm">
                             <div className="w-2.5 h-2.5 bg-green-500 rounded-full"></div>
                             <span className="text-gray-600 dark:text-gray-300">
-                                {tasks?.filter(task => task.status === 'Completed').length} completed
+                                {stats?.by_status['Completed'] ?? 0} completed
                             </span>
                         </div>
                         <div className="flex items-center gap-2 text-sm">
                             <div className="w-2.5 h-2.5 bg-yellow-500 rounded-full"></div>
                             <span className="text-gray-600 dark:text-gray-300">
-                                {tasks?.filter(task => task.status === 'Work In Progress').length} in progress
+                                {stats?.by_status['Work In Progress'] ?? 0} in progress
                             </span>
                         </div>
                         <div className="flex items-center gap-2 text-sm">
                             <div className="w-2.5 h-2.5 bg-red-500 rounded-full"></div>
                             <span className="text-gray-600 dark:text-gray-300">
-                                {tasks?.filter(task => task.status === 'Under Review').length} under review
+                                {stats?.by_status['Under Review'] ?? 0} under review
                             </span>
                         </div>
                     </div>
@@ -8,6 +8,7 @@ import UserCard from '@/components/UserCard';
 import { useSearchQuery } from '@/state/api';
 import {debounce} from 'lodash';
 import Image from 'next/image';
+import Link from 'next/link';
 import React, { useEffect, useState } from 'react'
 
 const Search = () => {
@@ -46,7 +47,8 @@ const Search = () => {
             {isError && <p>Error occured while fetching results</p>}
             {searchResult?.tasks?.length === 0 &&
             searchResult?.projects?.length === 0 &&
-            searchResult?.users?.length === 0 && (
+            searchResult?.users?.length === 0 &&
+            searchResult?.comments?.length === 0 && (
                 <Image src="Search-rafiki.svg" alt="" height={260} width={260} className='flex justify-center items-center'/>
             )}
             {!isLoading && !isError && searchResult && (
@@ -71,6 +73,18 @@ const Search = () => {
                     {searchResult.users?.map((user) => ( 
                         <UserCard key={user.id} user={user}/>
                     ))}
+
+                    {searchResult.comments && searchResult.comments?.length > 0 && (
+                        <h2 className={HeaderClass}>Comments</h2>
+                    )}
+                    {searchResult.comments?.map((comment) => (
+                        //headline is escaped by the server, only the <mark> highlights are markup
+                        <Link key={comment.id} href={`/projects/${comment.project_id}`}
+                            className='mb-3 block rounded bg-white p-4 shadow dark:bg-dark-secondary dark:text-white'>
+                            <p dangerouslySetInnerHTML={{__html: comment.headline}}/>
+                            <p className='text-sm text-gray-500'>{comment.author.username} on task #{comment.task_id}</p>
+                        </Link>
+                    ))}
                 </div>
             )}
         </div>
@@ -1,5 +1,5 @@
 import Modal from '@/components/Modal';
-import { useAddTeamMembersMutation, useSearchUsersQuery } from '@/state/api';
+import { useAddTeamMembersMutation, useSuggestUsersQuery } from '@/state/api';
 import React, { useState } from 'react'
 import { debounce } from 'lodash';
 import { X } from 'lucide-react';
@@ -14,8 +14,8 @@ const ModalNewMembers = ({isOpen, onClose, team_id}: Props) => {
     const [addTeamMembers, {isLoading}] = useAddTeamMembersMutation();
 
     const [searchQuery, setSearchQuery] = useState("")
-    const {data} = useSearchUsersQuery(searchQuery, {
-        skip: searchQuery.length < 2
+    const {data} = useSuggestUsersQuery(searchQuery, {
+        skip: searchQuery.length < 1
     });
     const userSuggestions = data?.users ?? [];
     const [members, setMembers] = useState<string[]>([]);
@@ -38,7 +38,7 @@ const ModalNewMembers = ({isOpen, onClose, team_id}: Props) => {
 
     const debounceSearch = debounce((value: string) => {
             setSearchQuery(value);
-        }, 300);
+        }, 150);
 
     const handleInputChange = (e: React.ChangeEvent<HTMLInputElement>) => {
         const value = e.target.value;
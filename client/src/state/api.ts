@@ -55,6 +55,7 @@ export interface Task{
     assigned_userid: number;
     author_userid: number;
     project_id: number;
+    updated_at?: string;
 
     author?: User;
     assigned?: User;
@@ -62,16 +63,33 @@ export interface Task{
     attachment?: Attachment[];
 }
 
+export interface CommentSearchHit{
+    id: number;
+    task_id: number;
+    project_id: number;
+    author: Pick<User, "id" | "username">;
+    headline: string;
+    rank: number;
+}
+
 export interface SearchResult{
     tasks?: Task[];
     projects?: Project[];
     users?: User[];
+    comments?: CommentSearchHit[];
+    timed_out?: string[];
 }
 
 export interface SearchUsersResult{
     users?: User[]
 }
 
+export interface UserSuggestion{
+    id: number;
+    username: string;
+    teammate: boolean;
+}
+
 export interface Team{
     id: number;
     domain_name: string;
@@ -90,11 +108,107 @@ export interface Comment{
     username: string;
 }
 
+export interface AssigneeLoad{
+    assigned_userid: number | null;
+    tasks: number;
+    open: number;
+    remaining_points: number;
+}
+
+export interface ProjectStats{
+    project_id: number;
+    tasks: number;
+    by_status: Partial<Record<Status, number>>;
+    by_priority: Partial<Record<Priority, number>>;
+    points: {total: number, remaining: number};
+    overdue: number;
+    assignees: AssigneeLoad[];
+}
+
 export interface TeamProject{
     team_id: number;
     project_id: number;
 }
 
+//compact change events pushed on ws/events/ for the projects the user can access
+export type ProjectEvent = {project_id: number} & (
+    | {type: "task.created", task: Task}
+    | {type: "task.updated", id: number, changes: Partial<Task>}
+    | {type: "task.status", id: number, from: Status, to: Status}
+    | {type: "task.deleted", id: number}
+    | {type: "comment.added", task_id: number, comment: Comment}
+    | {type: "comment.deleted", task_id: number, id: number}
+    | {type: "attachment.added" | "attachment.updated", task_id: number, attachment: Attachment}
+    | {type: "attachment.deleted", task_id: number, id: number}
+);
+
+//sent to the user's own socket when the projects they can access change
+export type AccessEvent = {type: "access.changed"};
+
+const applyProjectEvent = (tasks: Task[], event: ProjectEvent) => {
+    switch (event.type) {
+        case "task.created":
+            if (!tasks.some((task) => task.id === event.task.id)) tasks.push(event.task);
+            break;
+        case "task.updated":
+            Object.assign(tasks.find((task) => task.id === event.id) ?? {}, event.changes);
+            break;
+        case "task.status": {
+            const task = tasks.find((task) => task.id === event.id);
+            if (task) task.status = event.to;
+            break;
+        }
+        case "task.deleted": {
+            const index = tasks.findIndex((task) => task.id === event.id);
+            if (index !== -1) tasks.splice(index, 1);
+            break;
+        }
+        case "comment.added": {
+            const task = tasks.find((task) => task.id === event.task_id);
+            if (task && !task.comment?.some((comment) => comment.id === event.comment.id)) {
+                task.comment = [...(task.comment ?? []), event.comment];
+            }
+            break;
+        }
+        case "comment.deleted": {
+            const task = tasks.find((task) => task.id === event.task_id);
+            if (task) task.comment = task.comment?.filter((comment) => comment.id !== event.id);
+            break;
+        }
+        case "attachment.added":
+        case "attachment.updated": {
+            const task = tasks.find((task) => task.id === event.task_id);
+            if (task) {
+                task.attachment = [
+                    ...(task.attachment ?? []).filter((attachment) => attachment.id !== event.attachment.id),
+                    event.attachment
+                ];
+            }
+            break;
+        }
+        case "attachment.deleted": {
+            const task = tasks.find((task) => task.id === event.task_id);
+            if (task) task.attachment = task.attachment?.filter((attachment) => attachment.id !== event.id);
+            break;
+        }
+    }
+};
+
+//api/tasks?since= - tasks written since the last sync, ids to drop, and the next seq to send;
+//reset when the last sync was too long ago and tasks is the whole list
+export interface TaskDelta{
+    seq: number;
+    tasks: Task[];
+    deleted: number[];
+    reset?: boolean;
+}
+
+//per project: the seq of its last sync and the deletions that sync reported
+const taskSync = new Map<number, {seq: number, deleted: number[], reset: boolean}>();
+
+const eventsSocketUrl = (token: string) =>
+    `${(process.env.NEXT_PUBLIC_API_BASE_URL ?? "").replace(/^http/, "ws").replace(/\/$/, "")}/ws/events/?token=${token}`;
+
 export const api = createApi({
     baseQuery: fetchBaseQuery({
         baseUrl: process.env.NEXT_PUBLIC_API_BASE_URL,
@@ -108,7 +222,7 @@ export const api = createApi({
         }
     }),
     reducerPath: "api",
-    tagTypes: ["Project", "Task", "Users","Teams","TeamProject","Attachments","Comments"],
+    tagTypes: ["Project", "Task", "ProjectStats", "Users","Teams","TeamProject","Attachments","Comments"],
     endpoints: (build) => ({
         getAuthUser: build.query({
             queryFn: async (_, _queryApi, _extraoptions, fetchWithBQ) => {
@@ -149,20 +263,61 @@ export const api = createApi({
             invalidatesTags: ["Project"] //this update the Project value
         }),
         getTasks: build.query<Task[], {project_id: number}>({
-            query: ({ project_id }) => `api/tasks?project_id=${project_id}`,  //short hand notation
+            //full load first, then only what changed since the last sync
+            query: ({ project_id }) => `api/tasks?project_id=${project_id}&since=${taskSync.get(project_id)?.seq ?? 0}`,
+            transformResponse: (delta: TaskDelta, _meta, { project_id }) => {
+                taskSync.set(project_id, {seq: delta.seq, deleted: delta.deleted, reset: delta.reset ?? false});
+                return delta.tasks;
+            },
+            merge: (tasks, changed, { arg }) => {
+                if (taskSync.get(arg.project_id)?.reset) return changed;
+                const replaced = new Set([...(taskSync.get(arg.project_id)?.deleted ?? []), ...changed.map((task) => task.id)]);
+                return [...tasks.filter((task) => !replaced.has(task.id)), ...changed].sort((a, b) => a.id - b.id);
+            },
             providesTags: (result) => result
                 ? [
                     ...result.map(({ id }) => ({ type: "Task" as const, id })),
                     { type: "Task" as const, id: "LIST" }
                 ]
                 : [{ type: "Task" as const, id: "LIST" }],
+            //patch the cached list with other users' changes instead of refetching it
+            async onCacheEntryAdded({ project_id }, { updateCachedData, cacheDataLoaded, cacheEntryRemoved, dispatch }) {
+                const {idToken} = (await fetchAuthSession()).tokens ?? {};
+                if (!idToken) return;
+                const socket = new WebSocket(eventsSocketUrl(idToken.toString()));
+                try {
+                    await cacheDataLoaded;
+                    socket.addEventListener("message", (message: MessageEvent) => {
+                        const event = JSON.parse(message.data) as ProjectEvent | AccessEvent;
+                        if (event.type === "access.changed") {
+                            //the server has already moved the socket; refresh the project lists
+                            dispatch(api.util.invalidateTags(["Project", "TeamProject"]));
+                        } else if (event.project_id === project_id) {
+                            updateCachedData((tasks) => applyProjectEvent(tasks, event));
+                        }
+                    });
+                } catch {
+                    //the entry was removed before the first load finished
+                }
+                await cacheEntryRemoved;
+                socket.close();
+                taskSync.delete(project_id);
+            },
         }),
         deleteProject: build.mutation<Project[], {projectId: number}> ({
             query: ({projectId}) => ({
                 url: `api/projects/${projectId}/delete`,
                 method: "DELETE"
             }),
-            invalidatesTags: ["Project","Task"]
+            invalidatesTags: ["Project","Task","ProjectStats"]
+        }),
+        getProjectStats: build.query<ProjectStats, number>({
+            query: (id) => `api/projects/${id}/stats`,  //aggregated server side
+            providesTags: (result, error, id) => [{type: "ProjectStats", id}]
+        }),
+        getProjectsStats: build.query<ProjectStats[], void>({
+            query: () => 'api/projects/stats',
+            providesTags: ["ProjectStats"]
         }),
         createTasks: build.mutation<Task[], Partial<Task>>({
             query: (task) => ({
@@ -170,7 +325,7 @@ export const api = createApi({
                 method: "POST",
                 body: task
             }),
-            invalidatesTags: ["Task"]
+            invalidatesTags: ["Task","ProjectStats"]
         }),
         updateTaskStatus: build.mutation<Task[], {task_id: number, status: string}>({ //mutation is used to create
             query: ({task_id, status}) => ({
@@ -179,7 +334,8 @@ export const api = createApi({
                 body: {status}
             }),
             invalidatesTags: (result, error, {task_id}) => [
-                {type: "Task", id: task_id} //done cause we are updating specific task as per id not entire Task
+                {type: "Task", id: task_id}, //done cause we are updating specific task as per id not entire Task
+                "ProjectStats"
             ]
         }),
         updateTask: build.mutation<Task[], {task_id: number; data: Partial<Task>; project_id: number}>({
@@ -190,7 +346,8 @@ export const api = createApi({
             }),
             invalidatesTags: (result, error, {task_id}) => [
                 {type: "Task", id: task_id},
-                {type: "Task", id: "LIST"}
+                {type: "Task", id: "LIST"},
+                "ProjectStats"
             ]
         }),
         getTaskByUser: build.query<Task[], number>({
@@ -200,6 +357,13 @@ export const api = createApi({
                 ? result.map(({id}) => ({type: "Task", id}))
                 : [{type: "Task", id: id}] //problem  tag name mismatch Tasks instead of Task written
         }),
+        getTaskByUserPriority: build.query<Task[], {userId: number, priority: Priority}>({
+            query: ({userId, priority}) => `api/tasks/user/${userId}?priority=${encodeURIComponent(priority)}`,  //filtered server side
+            providesTags: (result, error, {userId}) =>
+                result
+                ? result.map(({id}) => ({type: "Task", id}))
+                : [{type: "Task", id: userId}]
+        }),
         deleteTask: build.mutation<Task[], {taskId: number}> ({
             query: ({taskId}) => ({
                 url: `api/tasks/${taskId}/delete`,
@@ -207,7 +371,8 @@ export const api = createApi({
             }),
             invalidatesTags: (result, error, {taskId}) =>[
                 {type: "Task", id: taskId},
-                {type: "Task", id: "LIST"}
+                {type: "Task", id: "LIST"},
+                "ProjectStats"
             ]
         }),
         getUsers: build.query<User[], void>({
@@ -316,6 +481,10 @@ export const api = createApi({
         searchUsers: build.query<SearchUsersResult, string>({
             query: (q) => `api/teams/search/?q=${q}`,
         }),
+        suggestUsers: build.query<{users: UserSuggestion[]}, string>({
+            query: (q) => `api/users/suggest/?q=${encodeURIComponent(q)}&boost=team`,  //ETag + max-age, repeat keystrokes hit the browser cache
+            keepUnusedDataFor: 30,
+        }),
     }),
 });
 
@@ -323,6 +492,8 @@ export const {
     useGetAuthUserQuery,
     useGetProjectsQuery,
     useGetProjectByIdQuery,
+    useGetProjectStatsQuery,
+    useGetProjectsStatsQuery,
     useGetUserOwnedProjectsQuery,
     useCreateProjectsMutation,
     useDeleteProjectMutation,
@@ -343,8 +514,10 @@ export const {
     useCreateAttachmentMutation,
     useGetAttachmentsQuery,
     useGetTaskByUserQuery,
+    useGetTaskByUserPriorityQuery,
     useCreateCommentMutation,
     useGetCommentsQuery,
     useDeleteCommentMutation,
-    useSearchUsersQuery
+    useSearchUsersQuery,
+    useSuggestUsersQuery
 } = api;
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Shared helpers for the database benchmarks: a throwaway PostgreSQL database
+created from the project settings, and generate_series based seeding so that
+hundreds of thousands of rows load in seconds.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projectjuno.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from junoapi import search_fanout
+
+STATUSES = ['To Do', 'Work In Progress', 'Under Review', 'Completed']
+PRIORITIES = ['Urgent', 'High', 'Medium', 'Low', 'Backlog']
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Create (or reuse with keepdb) the bench_juno database and point the default connection at it."""
+    old_name = connection.settings_dict['NAME']
+    connection.settings_dict.setdefault('TEST', {})['NAME'] = 'bench_juno'
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        #the search pool threads keep connections open
+        search_fanout.shutdown()
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+def is_seeded():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM task)')
+        return cursor.fetchone()[0]
+
+def seed(tasks, projects=100, users=1000, comments_per_task=0, attachments_per_task=0):
+    """Seed users, projects and tasks (ids start at 1) and ANALYZE the tables."""
+    statuses = "ARRAY[" + ",".join(f"'{s}'" for s in STATUSES) + "]"
+    priorities = "ARRAY[" + ",".join(f"'{p}'" for p in PRIORITIES) + "]"
+
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO "user" (password, is_superuser, username, first_name, last_name, email,
+                                is_staff, is_active, date_joined, cognito_id, profilepicture_id)
+            SELECT '', false, 'user' || g, '', '', 'user' || g || '@example.com',
+                   false, true, now(), 'cognito-' || g, 'p' || g || '.jpeg'
+            FROM generate_series(1, %s) g
+        ''', [users])
+        cursor.execute('''
+            INSERT INTO project (name, description, start_date, due_date, owner_id_id)
+            SELECT 'Project ' || g, 'Description of project ' || g, now(), now() + interval '90 days', 1 + g %% %s
+            FROM generate_series(1, %s) g
+        ''', [users, projects])
+        cursor.execute(f'''
+            INSERT INTO task (title, description, status, priority, tags, start_date, due_date, points,
+                              project_id_id, author_userid_id, assigned_userid_id)
+            SELECT 'Task ' || g, 'Description for task ' || g,
+                   ({statuses})[1 + g %% 4], ({priorities})[1 + (g * 7) %% 5],
+                   'tag' || (g %% 10), now(), now() + ((g %% 60) - 30) * interval '1 day', g %% 13,
+                   1 + g %% %s, 1 + g %% %s, 1 + (g * 3) %% %s
+            FROM generate_series(1, %s) g
+        ''', [projects, users, users, tasks])
+        if comments_per_task:
+            cursor.execute('''
+                INSERT INTO comment (text, task_id_id, user_id_id)
+                SELECT 'Comment ' || g, 1 + g %% %s, 1 + g %% %s
+                FROM generate_series(1, %s) g
+            ''', [tasks, users, tasks * comments_per_task])
+        if attachments_per_task:
+            cursor.execute('''
+                INSERT INTO attachment (file_url, file_name, task_id_id, uploadedby_id_id)
+                SELECT 'https://files.example.com/' || g || '.pdf', 'file' || g || '.pdf', 1 + g %% %s, 1 + g %% %s
+                FROM generate_series(1, %s) g
+            ''', [tasks, users, tasks * attachments_per_task])
+        cursor.execute('ANALYZE')
+
+def timed(fn, repeat=5):
+    """Best-of-`repeat` wall time of fn() in milliseconds, and fn's last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
@@ -0,0 +1,63 @@
+"""
+Size and client decode time of the bulk list payloads as JSON, msgpack
+(Accept: application/msgpack) and columnar JSON (?format=columnar): a
+project's task list, one user's assigned tasks and the project list.
+Sizes are given raw and gzipped; decode times for the stdlib json module,
+orjson and msgpack.
+
+    python -m benchmarks.bench_bulk_formats --tasks 20000
+"""
+import argparse
+import gzip
+import json
+
+import msgpack
+import orjson
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from junoapi.models import Project
+from junoapi.renderers import ColumnarJSONRenderer, MessagePackRenderer, ORJSONRenderer
+from junoapi.selectors import get_tasks
+from junoapi.serializers import ProjectSerializer, TaskSerializer
+
+
+def payloads():
+    return {
+        'project tasks': TaskSerializer(get_tasks(project_id=1).order_by('id'), many=True).data,
+        'user tasks': TaskSerializer(get_tasks(assigned_userid=1).order_by('id'), many=True).data,
+        'projects': ProjectSerializer(Project.objects.order_by('id'), many=True).data,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--projects', type=int, default=10)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, projects=args.projects, users=args.users, comments_per_task=3, attachments_per_task=1)
+
+        print(f"{'payload':>14} {'format':>9} {'KB':>9} {'gzip KB':>8} {'decode':>8} {'ms':>8}")
+        for name, data in payloads().items():
+            bodies = {
+                'json': ORJSONRenderer().render(data),
+                'msgpack': MessagePackRenderer().render(data),
+                'columnar': ColumnarJSONRenderer().render(data),
+            }
+            decoders = {
+                'json': [('json', json.loads), ('orjson', orjson.loads)],
+                'msgpack': [('msgpack', msgpack.unpackb)],
+                'columnar': [('json', json.loads), ('orjson', orjson.loads)],
+            }
+            for fmt, body in bodies.items():
+                size, compressed = len(body) / 1e3, len(gzip.compress(body, 6)) / 1e3
+                for decoder, decode in decoders[fmt]:
+                    ms, _ = timed(lambda: decode(body), repeat=10)
+                    print(f"{name:>14} {fmt:>9} {size:>9.1f} {compressed:>8.1f} {decoder:>8} {ms:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Moving a batch of board cards: one PATCH api/tasks/<id>/status/ per task
+against a single PATCH api/tasks/bulk/, through the full DRF stack.
+
+    python -m benchmarks.bench_bulk_tasks --tasks 20000 --batch 200
+"""
+import argparse
+
+from benchmarks._db import STATUSES, benchmark_database, is_seeded, seed, timed
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from junoapi import project_access
+from junoapi.models import Project, Task
+from junoapi.views.TaskViews import BulkUpdateTasksView, UpdateTaskStatus
+
+
+def per_task(client, task_ids, status):
+    for task_id in task_ids:
+        response = client.patch(reverse('update-task-status', args=[task_id]), {'status': status}, format='json')
+        assert response.status_code == 200
+
+def bulk(client, task_ids, status):
+    payload = [{'id': task_id, 'status': status} for task_id in task_ids]
+    response = client.patch(reverse('bulk-update-tasks'), payload, format='json')
+    assert response.data['updated'] == len(task_ids)
+
+class QueryCounter:
+    #connection.queries is reset by request_started, so count at the cursor instead
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=200)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    #the per-user daily throttle would cut the per-task runs short
+    UpdateTaskStatus.throttle_classes = BulkUpdateTasksView.throttle_classes = []
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks)
+            project_access.rebuild()
+
+        project = Project.objects.select_related('owner_id').get(id=1)
+        task_ids = list(Task.objects.filter(project_id=project).order_by('id').values_list('id', flat=True)[:args.batch])
+        client = APIClient()
+        client.force_authenticate(user=project.owner_id)
+
+        print(f"moving {len(task_ids)} tasks of project {project.id}")
+        print(f"{'endpoint':>10} {'ms':>10} {'queries':>8}")
+        for name, fn in (('per-task', per_task), ('bulk', bulk)):
+            statuses = iter(STATUSES * 2)
+            queries = QueryCounter()
+            with connection.execute_wrapper(queries):
+                fn(client, task_ids, STATUSES[0])
+            ms, _ = timed(lambda: fn(client, task_ids, next(statuses)), repeat=3)
+            print(f"{name:>10} {ms:>10.1f} {queries.count:>8}")
+
+if __name__ == '__main__':
+    main()
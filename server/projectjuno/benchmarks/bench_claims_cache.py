@@ -0,0 +1,59 @@
+"""
+CPU time per request on the token verification path, with and without the
+verified-claims cache. Simulates an SPA resending a handful of tokens.
+
+    python -m benchmarks.bench_claims_cache --requests 2000 --tokens 20
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projectjuno.settings')
+
+import django
+django.setup()
+
+import jwt
+
+from junoapi.claims_cache import VerifiedClaimsCache
+from junoapi.jwks import JWKSKeyStore
+from tests.test_authentication import CLIENT_ID, make_signing_key, make_token
+
+
+def verify(token, store):
+    kid = jwt.get_unverified_header(token)['kid']
+    return jwt.decode(token, store.get_key(kid), algorithms=['RS256'], audience=CLIENT_ID)
+
+def run(tokens, store, n, cache=None):
+    start = time.process_time()
+    for _ in range(n):
+        token = random.choice(tokens)
+        claims = cache.get(token) if cache else None
+        if claims is None:
+            claims = verify(token, store)
+            if cache:
+                cache.set(token, claims)
+    return (time.process_time() - start) / n * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--tokens', type=int, default=20, help='distinct live tokens')
+    args = parser.parse_args()
+
+    private_key, jwk = make_signing_key('bench-key')
+    store = JWKSKeyStore('http://unused')
+    store.load({'keys': [jwk]})
+    tokens = [make_token(private_key, 'bench-key', f'user-{i}') for i in range(args.tokens)]
+
+    uncached = run(tokens, store, args.requests)
+    cache = VerifiedClaimsCache()
+    cached = run(tokens, store, args.requests, cache)
+
+    print(f"{args.requests} requests over {args.tokens} tokens")
+    print(f"verify every request   {uncached:8.1f} us CPU/request")
+    print(f"verified-claims cache  {cached:8.1f} us CPU/request   {cache.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-request JWT key resolution + verification latency, before and after the
+process-wide JWKS key store.
+
+Runs against a local stand-in JWKS server with a configurable response delay
+that mimics the round trip to Cognito. No database is touched.
+
+    python -m benchmarks.bench_jwks_auth --requests 200 --delay-ms 40
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projectjuno.settings')
+
+import django
+django.setup()
+
+import jwt
+import requests
+
+from junoapi.jwks import JWKSKeyStore
+from tests.test_authentication import CLIENT_ID, JWKSServer, make_signing_key, make_token
+
+
+def legacy_verify(token, jwks_url):
+    #the pre key-store path: fetch and parse the JWKS on every request
+    jwks = requests.get(jwks_url).json()['keys']
+    kid = jwt.get_unverified_header(token)['kid']
+    key = next(k for k in jwks if k['kid'] == kid)
+    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
+    return jwt.decode(token, public_key, algorithms=['RS256'], audience=CLIENT_ID)
+
+def cached_verify(token, store):
+    kid = jwt.get_unverified_header(token)['kid']
+    return jwt.decode(token, store.get_key(kid), algorithms=['RS256'], audience=CLIENT_ID)
+
+def measure(fn, n):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<12} mean {statistics.mean(timings):8.3f} ms   p50 {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay-ms', type=float, default=40, help='simulated JWKS round trip')
+    args = parser.parse_args()
+
+    private_key, jwk = make_signing_key('bench-key')
+    server = JWKSServer({'keys': [jwk]}, delay=args.delay_ms / 1000)
+    token = make_token(private_key, 'bench-key', 'bench-user')
+    store = JWKSKeyStore(server.url)
+
+    try:
+        print(f"{args.requests} requests, simulated JWKS latency {args.delay_ms} ms")
+        report('before', measure(lambda: legacy_verify(token, server.url), args.requests))
+        hits_before = server.hits
+        report('after', measure(lambda: cached_verify(token, store), args.requests))
+        print(f"JWKS fetches: before {hits_before}, after {server.hits - hits_before}")
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
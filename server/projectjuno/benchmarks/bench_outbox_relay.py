@@ -0,0 +1,81 @@
+"""
+Outbox relay throughput: rows drained per second for a range of batch sizes
+and 1, 2 and 4 relays running side by side (SKIP LOCKED), with how many
+events were left to publish after coalescing. Every run reloads the same
+status moves, --burst in a row per task, spread over --entities tasks.
+
+    python -m benchmarks.bench_outbox_relay --rows 50000 --layer redis
+"""
+import argparse
+import threading
+
+from benchmarks._db import benchmark_database, timed
+
+from django.conf import settings
+from django.db import connection
+from junoapi import outbox
+
+LAYERS = {
+    'memory': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+    'redis': {'BACKEND': 'channels_redis.core.RedisChannelLayer', 'CONFIG': {'hosts': ['redis://127.0.0.1:6379/3']}},
+}
+
+
+def load(rows, entities, burst, projects=100):
+    #each task gets `burst` status moves in a row, so a batch can fold them together
+    statuses = "ARRAY['To Do','Work In Progress','Under Review','Completed']"
+    with connection.cursor() as cursor:
+        cursor.execute('TRUNCATE outbox_event')
+        cursor.execute(f'''
+            INSERT INTO outbox_event ("group", entity, entity_id, event, created_at)
+            SELECT 'project-' || (1 + task_id %% %s), 'task', task_id,
+                   jsonb_build_object('type', 'task.status', 'id', task_id,
+                                      'from', ({statuses})[1 + step %% 4],
+                                      'to', ({statuses})[1 + (step + 1) %% 4]),
+                   now()
+            FROM (SELECT 1 + (g / %s) %% %s AS task_id, g %% %s AS step FROM generate_series(0, %s) g) moves
+        ''', [projects, burst, entities, burst, rows - 1])
+
+def drain(relays, batch_size):
+    published = []
+
+    def worker():
+        events = 0
+        try:
+            while True:
+                rows, sent = outbox.relay(batch_size=batch_size)
+                if not rows:
+                    break
+                events += sent
+        finally:
+            connection.close()
+        published.append(events)
+
+    threads = [threading.Thread(target=worker) for _ in range(relays)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(published)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--entities', type=int, default=5000)
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--layer', choices=sorted(LAYERS), default='memory')
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    settings.CHANNEL_LAYERS = {'default': LAYERS[args.layer]}
+    with benchmark_database(keepdb=args.keepdb):
+        print(f"{args.rows} rows over {args.entities} tasks in bursts of {args.burst}, {args.layer} channel layer")
+        print(f"{'batch':>8} {'relays':>8} {'ms':>10} {'rows/s':>12} {'events':>10}")
+        for batch_size in (100, 500, 2000):
+            for relays in (1, 2, 4):
+                load(args.rows, args.entities, args.burst)
+                ms, events = timed(lambda: drain(relays, batch_size), repeat=1)
+                print(f"{batch_size:>8} {relays:>8} {ms:>10.1f} {args.rows / (ms / 1000):>12.0f} {events:>10}")
+
+if __name__ == '__main__':
+    main()
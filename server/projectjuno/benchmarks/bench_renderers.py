@@ -0,0 +1,97 @@
+"""
+DRF's stdlib JSONRenderer/JSONParser against the orjson ones
+(junoapi.renderers, junoapi.parsers) on the payloads each view returns or
+accepts. Serialization is done once up front; only rendering and parsing
+are timed, and both renderers must produce the same bytes.
+
+    python -m benchmarks.bench_renderers --tasks 10000
+"""
+import argparse
+import io
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from django.db.models import F, Value
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from junoapi import project_stats
+from junoapi.models import Comment, Project, Task, Team, User
+from junoapi.parsers import ORJSONParser
+from junoapi.renderers import ORJSONRenderer
+from junoapi.selectors import get_tasks, get_teams
+from junoapi.serializers import (
+    CommentSearchHitSerializer, ProjectSearchHitSerializer, ProjectSerializer, TaskSearchHitSerializer,
+    TaskSerializer, TeamSerializer, UserSearchHitSerializer, UserSerializer
+)
+
+
+def seed_teams(count, members=8):
+    users = list(User.objects.order_by('id')[:count + members])
+    for i in range(count):
+        team = Team.objects.create(domain_name=f"team{i}", productowner_userid=users[i], projectmanager_userid=users[i + 1])
+        team.members.set(users[i:i + members])
+
+def search_response(limit):
+    ranked = Value(0.5)
+    return {
+        'users': UserSearchHitSerializer(User.objects.annotate(rank=ranked)[:limit], many=True).data,
+        'tasks': TaskSearchHitSerializer(
+            Task.objects.select_related('author_userid', 'assigned_userid').annotate(rank=ranked)[:limit], many=True
+        ).data,
+        'projects': ProjectSearchHitSerializer(Project.objects.annotate(rank=ranked)[:limit], many=True).data,
+        'comments': CommentSearchHitSerializer(
+            Comment.objects.select_related('user_id')
+            .annotate(rank=ranked, project_id=F('task_id__project_id'), headline=F('text'))[:limit], many=True
+        ).data,
+    }
+
+def payloads(project_tasks):
+    return {
+        'task list': TaskSerializer(get_tasks(project_id=1).order_by('id')[:project_tasks], many=True).data,
+        'users': UserSerializer(User.objects.order_by('id'), many=True).data,
+        'projects': ProjectSerializer(Project.objects.order_by('id'), many=True).data,
+        'teams': TeamSerializer(get_teams().order_by('id'), many=True).data,
+        'search': search_response(limit=20),
+        'stats': list(project_stats.compute(list(Project.objects.values_list('id', flat=True))).values()),
+    }
+
+def request_bodies(items):
+    return {
+        'bulk update': [{'id': i, 'status': 'Completed', 'points': i % 13} for i in range(1, items + 1)],
+        'task create': {
+            'title': 'New task', 'description': 'x' * 500, 'status': 'To Do', 'priority': 'High',
+            'tags': 'backend,api', 'start_date': '2026-01-02T03:04:05Z', 'project_id': 1,
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--project-tasks', type=int, default=2000)
+    parser.add_argument('--teams', type=int, default=50)
+    parser.add_argument('--bulk-items', type=int, default=500)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, projects=5, comments_per_task=3, attachments_per_task=1)
+            seed_teams(args.teams)
+
+        print(f"{'render':>12} {'KB':>8} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}")
+        for name, data in payloads(args.project_tasks).items():
+            json_ms, expected = timed(lambda: JSONRenderer().render(data), repeat=20)
+            orjson_ms, body = timed(lambda: ORJSONRenderer().render(data), repeat=20)
+            assert body == expected, name
+            print(f"{name:>12} {len(body) / 1e3:>8.1f} {json_ms:>9.2f} {orjson_ms:>10.2f} {json_ms / orjson_ms:>7.1f}x")
+
+        print(f"\n{'parse':>12} {'KB':>8} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}")
+        for name, data in request_bodies(args.bulk_items).items():
+            body = JSONRenderer().render(data)
+            json_ms, expected = timed(lambda: JSONParser().parse(io.BytesIO(body)), repeat=20)
+            orjson_ms, parsed = timed(lambda: ORJSONParser().parse(io.BytesIO(body)), repeat=20)
+            assert parsed == expected, name
+            print(f"{name:>12} {len(body) / 1e3:>8.1f} {json_ms:>9.3f} {orjson_ms:>10.3f} {json_ms / orjson_ms:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
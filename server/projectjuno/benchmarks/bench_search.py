@@ -0,0 +1,60 @@
+"""
+Task search latency on a seeded 1M-task table: the previous TrigramSimilarity
+annotate + icontains filter (sequential scan) against the GIN backed %> and
+full-text conditions from junoapi.search.
+
+    python -m benchmarks.bench_search --tasks 1000000
+"""
+import argparse
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q
+from junoapi.models import Task
+from junoapi.search import search_tasks, word_similarity_threshold
+
+QUERIES = ['Task 4242', 'descripton', 'tag7', 'nothing like this']
+
+
+def legacy_search(q):
+    return Task.objects.annotate(
+        title_similarity=TrigramSimilarity('title', q),
+        description_similarity=TrigramSimilarity('description', q),
+    ).filter(
+        Q(title__icontains=q) | Q(description__icontains=q) |
+        Q(title_similarity__gt=0.2) | Q(description_similarity__gt=0.2)
+    )
+
+def first_page(queryset):
+    return list(queryset.values_list('id', flat=True)[:50])
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks)
+
+        print(f"{args.tasks} tasks, first 50 matches")
+        print(f"{'query':>20} {'legacy ms':>12} {'indexed ms':>12}")
+        for q in QUERIES:
+            legacy_ms, _ = timed(lambda: first_page(legacy_search(q)), repeat=3)
+            with word_similarity_threshold():
+                indexed_ms, _ = timed(lambda: first_page(search_tasks(q)), repeat=3)
+            print(f"{q:>20} {legacy_ms:>12.1f} {indexed_ms:>12.1f}")
+
+        print("\nindexed plan:\n" + explain(search_tasks(QUERIES[0])))
+
+if __name__ == '__main__':
+    main()
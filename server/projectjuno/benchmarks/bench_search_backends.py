@@ -0,0 +1,53 @@
+"""
+Task search through both SearchBackends on a seeded table: index build time
+and size of the in-memory backend, then per-query latency of each backend.
+
+    python -m benchmarks.bench_search_backends --tasks 200000
+"""
+import argparse
+import time
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from junoapi.access import AccessContext
+from junoapi.models import User
+from junoapi import project_access
+from junoapi.search_backends import InMemorySearchBackend, PostgresSearchBackend
+
+QUERIES = ['Task 4242', 'descripton', 'tag7', 'nothing like this']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks)
+            project_access.rebuild()
+
+        backends = {'memory': InMemorySearchBackend(), 'postgres': PostgresSearchBackend()}
+
+        access = AccessContext(User.objects.get(id=1))
+        access.project_ids
+
+        start = time.perf_counter()
+        backends['memory'].search_users('warm up', 1)
+        build_s = time.perf_counter() - start
+        indexes = backends['memory']._current().indexes
+        size = sum(index.nbytes() for fields in indexes.values() for index in fields.values())
+        print(f"{args.tasks} tasks, in-memory index built in {build_s:.1f}s, {size / 2**20:.1f} MiB of posting arrays")
+
+        print(f"{'query':>20}" + "".join(f" {name + ' ms':>12}" for name in backends))
+        for q in QUERIES:
+            row = f"{q:>20}"
+            for backend in backends.values():
+                ms, _ = timed(lambda: list(backend.search_tasks(q, access, args.limit)), repeat=3)
+                row += f" {ms:>12.1f}"
+            print(row)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+api/search/ latency with its three categories run one after another against
+side by side on the search pool, whose threads keep their connections
+between searches, using the Postgres backend.
+
+    python -m benchmarks.bench_search_fanout --tasks 200000
+"""
+import argparse
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from junoapi.access import AccessContext
+from junoapi.models import User
+from junoapi import project_access
+from junoapi.search_backends import PostgresSearchBackend
+from junoapi.search_fanout import run_categories
+from junoapi.serializers import ProjectSearchHitSerializer, TaskSearchHitSerializer, UserSearchHitSerializer
+
+QUERIES = ['Task 4242', 'descripton', 'user12', 'nothing like this']
+
+
+def category_jobs(backend, q, access, limit):
+    return {
+        'users': lambda: UserSearchHitSerializer(backend.search_users(q, limit), many=True).data,
+        'tasks': lambda: TaskSearchHitSerializer(backend.search_tasks(q, access, limit), many=True).data,
+        'projects': lambda: ProjectSearchHitSerializer(backend.search_projects(q, access, limit), many=True).data,
+    }
+
+def serial(jobs):
+    return {category: fn() for category, fn in jobs.items()}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks)
+            project_access.rebuild()
+
+        backend = PostgresSearchBackend()
+
+        access = AccessContext(User.objects.get(id=1))
+
+        print(f"{args.tasks} tasks, {type(backend).__name__}")
+        print(f"{'query':>20} {'serial ms':>12} {'pool ms':>12}")
+        for q in QUERIES:
+            serial_ms, _ = timed(lambda: serial(category_jobs(backend, q, AccessContext(access.user), args.limit)))
+            pool_ms, _ = timed(lambda: run_categories(category_jobs(backend, q, AccessContext(access.user), args.limit)))
+            print(f"{q:>20} {serial_ms:>12.1f} {pool_ms:>12.1f}")
+
+if __name__ == '__main__':
+    main()
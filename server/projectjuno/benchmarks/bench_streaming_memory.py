@@ -0,0 +1,87 @@
+"""
+Peak memory of rendering a task list buffered against streamed in chunks
+(junoapi.streaming), for growing list sizes, through TaskSerializer and
+through the SQL rendered path (junoapi.task_json). Each run happens in a
+fresh forked process and reports how far its peak RSS rose above the RSS it
+started with, which includes libpq's buffered result sets.
+
+    python -m benchmarks.bench_streaming_memory --tasks 100000
+"""
+import argparse
+import multiprocessing
+
+from benchmarks._db import benchmark_database, is_seeded, seed
+
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+from junoapi import task_json
+from junoapi.selectors import get_tasks
+from junoapi.serializers import TaskSerializer
+from junoapi.streaming import json_array, serialized_chunks
+
+CHUNK_SIZE = 500
+
+
+def buffered_serializer(queryset):
+    return len(JSONRenderer().render(TaskSerializer(queryset, many=True).data))
+
+def streamed_serializer(queryset):
+    return sum(len(piece) for piece in json_array(serialized_chunks(queryset, TaskSerializer, CHUNK_SIZE)))
+
+def buffered_sql(queryset):
+    return len(task_json.render(queryset))
+
+def streamed_sql(queryset):
+    return sum(len(piece) for piece in json_array(task_json.render_chunks(queryset, CHUNK_SIZE)))
+
+MODES = {
+    'serializer': buffered_serializer,
+    'serializer stream': streamed_serializer,
+    'sql': buffered_sql,
+    'sql stream': streamed_sql,
+}
+
+def memory_kb(field):
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(field):
+                return int(line.split()[1])
+
+def measure(mode, size, results):
+    #a fresh process, so VmHWM only reflects this run
+    start = memory_kb('VmRSS')
+    queryset = get_tasks().filter(id__lte=size).order_by('id')
+    length = MODES[mode](queryset)
+    results.put((length, memory_kb('VmHWM') - start))
+
+def run(mode, size):
+    connection.close()
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    process = context.Process(target=measure, args=(mode, size, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, comments_per_task=2, attachments_per_task=1)
+
+        sizes = [args.tasks // 8, args.tasks // 4, args.tasks // 2, args.tasks]
+        print(f"peak RSS growth in MB, chunks of {CHUNK_SIZE}")
+        print(f"{'tasks':>8} {'MB of JSON':>11} " + " ".join(f"{mode:>18}" for mode in MODES))
+        for size in sizes:
+            measured = [run(mode, size) for mode in MODES]
+            assert len({length for length, _ in measured}) == 1
+            row = " ".join(f"{peak / 1024:>18.1f}" for _, peak in measured)
+            print(f"{size:>8} {measured[0][0] / 1e6:>11.1f} {row}")
+
+if __name__ == '__main__':
+    main()
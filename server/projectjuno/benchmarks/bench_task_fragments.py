@@ -0,0 +1,101 @@
+"""
+The task list of one project assembled from cached fragments
+(junoapi.task_fragments) while the project is being edited, against the
+uncached TaskSerializer path and the SQL-rendered list (junoapi.task_json).
+
+Between two reads --edit-rate of the tasks are written. Edits are skewed
+the way a board is worked on: --hot-share of them land on the --hot-tasks
+fraction of tasks in progress, the rest anywhere. An edit is a task update,
+a new comment or a new attachment, in equal parts, each in its own
+transaction. The first read starts from an empty cache.
+
+    python -m benchmarks.bench_task_fragments --tasks 10000 --rounds 20
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from django.db import connection
+from junoapi import task_fragments, task_json
+from junoapi.renderers import ORJSONRenderer
+from junoapi.selectors import get_tasks
+from junoapi.serializers import TaskSerializer
+
+
+def queryset():
+    return get_tasks(project_id=1).order_by('id')
+
+def uncached():
+    return ORJSONRenderer().render(TaskSerializer(queryset(), many=True).data)
+
+def cached():
+    tasks = queryset()
+    return ORJSONRenderer().render(task_fragments.serialize(task_fragments.versions(tasks), tasks))
+
+def edit(task_ids, rng):
+    with connection.cursor() as cursor:
+        for task_id in task_ids:
+            kind = rng.randrange(3)
+            if kind == 0:
+                cursor.execute('UPDATE task SET points = (points + 1) %% 13 WHERE id = %s', [task_id])
+            elif kind == 1:
+                cursor.execute('INSERT INTO comment (text, task_id_id, user_id_id) VALUES (%s, %s, 1)', ['Edit', task_id])
+            else:
+                cursor.execute(
+                    'INSERT INTO attachment (file_url, file_name, task_id_id, uploadedby_id_id) VALUES (%s, %s, %s, 1)',
+                    ['https://files.example.com/edit.pdf', 'edit.pdf', task_id]
+                )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--edit-rate', type=float, default=0.01)
+    parser.add_argument('--hot-tasks', type=float, default=0.1)
+    parser.add_argument('--hot-share', type=float, default=0.8)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, projects=1, comments_per_task=3, attachments_per_task=1)
+
+        rng = random.Random(0)
+        task_ids = list(queryset().values_list('id', flat=True))
+        hot = rng.sample(task_ids, max(1, int(len(task_ids) * args.hot_tasks)))
+        edits = max(1, int(len(task_ids) * args.edit_rate))
+
+        uncached_ms, _ = timed(uncached)
+        sql_ms, _ = timed(lambda: task_json.render(queryset()))
+
+        task_fragments.bump_users()
+        task_fragments.reset_stats()
+        rounds = []
+        for read in range(args.rounds):
+            if read:
+                edit([rng.choice(hot) if rng.random() < args.hot_share else rng.choice(task_ids) for _ in range(edits)], rng)
+            before = task_fragments.stats()
+            start = time.perf_counter()
+            body = cached()
+            ms = (time.perf_counter() - start) * 1000
+            after = task_fragments.stats()
+            rounds.append((ms, after['hits'] - before['hits'], after['misses'] - before['misses']))
+        assert body == uncached()
+
+        warm = rounds[1:]
+        hits = sum(hits for _, hits, _ in warm)
+        lookups = sum(hits + misses for _, hits, misses in warm)
+        print(f"{len(task_ids)} tasks, {edits} edits between reads ({args.hot_share:.0%} on {len(hot)} hot tasks)")
+        print(f"{'path':>20} {'ms':>10}")
+        print(f"{'serializer':>20} {uncached_ms:>10.1f}")
+        print(f"{'sql':>20} {sql_ms:>10.1f}")
+        print(f"{'fragments, cold':>20} {rounds[0][0]:>10.1f}")
+        print(f"{'fragments, median':>20} {statistics.median(ms for ms, _, _ in warm):>10.1f}")
+        print(f"{'fragments, worst':>20} {max(ms for ms, _, _ in warm):>10.1f}")
+        print(f"hit ratio after the first read: {hits / lookups:.3f} ({lookups - hits} misses in {len(warm)} reads)")
+
+if __name__ == '__main__':
+    main()
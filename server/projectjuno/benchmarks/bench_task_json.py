@@ -0,0 +1,47 @@
+"""
+The full task list of one project rendered through TaskSerializer and
+JSONRenderer against the same bytes assembled by PostgreSQL
+(junoapi.task_json), with comments and attachments on every task.
+
+    python -m benchmarks.bench_task_json --tasks 10000
+"""
+import argparse
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from rest_framework.renderers import JSONRenderer
+from junoapi import task_json
+from junoapi.selectors import get_tasks
+from junoapi.serializers import TaskSerializer
+
+
+def serializer_path(project_id):
+    return JSONRenderer().render(TaskSerializer(get_tasks(project_id=project_id).order_by('id'), many=True).data)
+
+def sql_path(project_id):
+    return task_json.render(get_tasks(project_id=project_id).order_by('id'))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=3)
+    parser.add_argument('--attachments', type=int, default=1)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, projects=1, comments_per_task=args.comments, attachments_per_task=args.attachments)
+
+        serializer_ms, expected = timed(lambda: serializer_path(1))
+        sql_ms, body = timed(lambda: sql_path(1))
+        assert body == expected
+
+        print(f"{args.tasks} tasks, {args.comments} comments and {args.attachments} attachments each, {len(body) / 1e6:.1f} MB")
+        print(f"{'path':>12} {'ms':>10}")
+        print(f"{'serializer':>12} {serializer_ms:>10.1f}")
+        print(f"{'sql':>12} {sql_ms:>10.1f}")
+        print(f"{'speedup':>12} {serializer_ms / sql_ms:>10.1f}x")
+
+if __name__ == '__main__':
+    main()
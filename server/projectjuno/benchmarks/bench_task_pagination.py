@@ -0,0 +1,56 @@
+"""
+Deep-page latency of the task list: OFFSET pagination against keyset
+pagination on (project_id, id), on a seeded 500k-task table.
+
+    python -m benchmarks.bench_task_pagination --tasks 500000 --page-size 100
+"""
+import argparse
+
+from benchmarks._db import benchmark_database, is_seeded, seed, timed
+
+from django.db import connection
+from junoapi.models import Task
+
+
+def offset_page(project_id, page, page_size):
+    queryset = Task.objects.filter(project_id=project_id).order_by('id')
+    return list(queryset[page * page_size:(page + 1) * page_size].values_list('id', flat=True))
+
+def keyset_page(project_id, after_id, page_size):
+    queryset = Task.objects.filter(project_id=project_id, id__gt=after_id).order_by('id')
+    return list(queryset[:page_size].values_list('id', flat=True))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=500000)
+    parser.add_argument('--projects', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not is_seeded():
+            seed(args.tasks, projects=args.projects)
+
+        project_id = 1
+        total = Task.objects.filter(project_id=project_id).count()
+        pages = total // args.page_size
+        print(f"{args.tasks} tasks, project {project_id} has {total} tasks / {pages} pages of {args.page_size}")
+        print(f"{'page':>8} {'OFFSET ms':>12} {'keyset ms':>12}")
+
+        for page in (0, pages // 10, pages // 2, pages - 1):
+            offset_ms, ids = timed(lambda: offset_page(project_id, page, args.page_size))
+            #the cursor a client would hold: the last id of the previous page
+            after_id = 0
+            if page:
+                after_id = offset_page(project_id, page - 1, args.page_size)[-1]
+            keyset_ms, keyset_ids = timed(lambda: keyset_page(project_id, after_id, args.page_size))
+            assert ids == keyset_ids
+            print(f"{page:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + str(Task.objects.filter(project_id=project_id, id__gt=after_id).order_by('id')[:args.page_size].query))
+            print("\nkeyset plan:\n" + "\n".join(row[0] for row in cursor.fetchall()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# access.py
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from junoapi.models import Team, UserProjectAccess
+
+ADMIN_GROUP = 'Admin'
+
+
+class AccessContext:
+    """
+    What the requesting user may see, computed lazily and at most once per
+    request. Shared by the permission classes and the list querysets.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def is_admin(self):
+        if not self.user.is_authenticated:
+            return False
+        if self.user.is_superuser:
+            return True
+        #users resolved through the user cache already carry their groups
+        group_names = getattr(self.user, '_group_names', None)
+        if group_names is not None:
+            return ADMIN_GROUP in group_names
+        return self.user.groups.filter(name=ADMIN_GROUP).exists()
+
+    @cached_property
+    def team_ids(self):
+        if not self.user.is_authenticated:
+            return frozenset()
+        return frozenset(self._teams().values_list('id', flat=True))
+
+    @cached_property
+    def project_ids(self):
+        if not self.user.is_authenticated:
+            return frozenset()
+        return frozenset(self._project_access().values_list('project_id', flat=True))
+
+    @cached_property
+    def teammate_ids(self):
+        #everyone sharing a team with the user, in any role
+        if not self.user.is_authenticated:
+            return frozenset()
+        teams = self._teams().values('id')
+        members = Team.members.through.objects.filter(team_id__in=teams).values_list('user_id', flat=True)
+        owners = Team.objects.filter(id__in=teams).values_list('productowner_userid', flat=True)
+        managers = Team.objects.filter(id__in=teams, projectmanager_userid__isnull=False).values_list('projectmanager_userid', flat=True)
+        return frozenset(members.union(owners, managers)) - {self.user.id}
+
+    def accessible_projects(self):
+        #ids usable in a project_id__in filter; a subquery unless already loaded
+        if 'project_ids' in self.__dict__ or not self.user.is_authenticated:
+            return self.project_ids
+        return self._project_access().values('project_id')
+
+    def can_access_project(self, project_id):
+        if 'project_ids' in self.__dict__ or not self.user.is_authenticated:
+            return project_id in self.project_ids
+        return self._project_access().filter(project_id=project_id).exists()
+
+    def _project_access(self):
+        return UserProjectAccess.objects.filter(user_id=self.user.id)
+
+    def _teams(self):
+        user_id = self.user.id
+        return Team.objects.filter(
+            Q(productowner_userid=user_id) |
+            Q(projectmanager_userid=user_id) |
+            Q(members=user_id)
+        )
+
+
+def get_access_context(request):
+    context = getattr(request, '_access_context', None)
+    if context is None or context.user is not request.user:
+        context = AccessContext(request.user)
+        request._access_context = context
+    return context
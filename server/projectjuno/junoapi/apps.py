@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JunoapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'junoapi'
+
+    def ready(self):
+        from junoapi import signals  # noqa: F401
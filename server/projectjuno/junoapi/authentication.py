@@ -3,8 +3,14 @@ import requests
 import jwt
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
-from junoapi.models import User
+from junoapi.jwks import get_key_store
+from junoapi.claims_cache import get_claims_cache
+from junoapi.user_cache import get_user_by_cognito_id
 import os
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from django.contrib.auth.models import AnonymousUser
 
 class CognitoJWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -13,24 +19,39 @@ class CognitoJWTAuthentication(BaseAuthentication):
             return None  # no token provided, DRF will try other auth classes
 
         token = auth_header.split(' ')[1]
+        return (self.authenticate_token(token), None)
 
-        try:
-            # Get Cognito public keys (JWKS)
-            jwks_url = os.environ.get('COGNITO_JWKS_URL').strip('"')
-            jwks = requests.get(jwks_url).json()['keys']
+    def authenticate_token(self, token):
+        # The SPA resends the same token many times, skip re-verifying it
+        claims_cache = get_claims_cache()
+        claims = claims_cache.get(token)
+        if claims is None:
+            claims = self.verify_token(token)
+            claims_cache.set(token, claims)
 
+        # Lookup user by cognito_id, served from the user cache when warm
+        user = get_user_by_cognito_id(claims['sub'])
+        if user is None:
+            raise exceptions.AuthenticationFailed("User not found")
+        return user
+
+    def verify_token(self, token):
+        try:
             # Extract the 'kid' from token headers
             headers = jwt.get_unverified_header(token)
-            kid = headers['kid']
+            kid = headers.get('kid')
+            if not kid:
+                raise exceptions.AuthenticationFailed("Invalid token: missing kid")
 
-            # Find the correct key from JWKS
-            key = next((k for k in jwks if k['kid'] == kid), None)
-            if not key:
+            # Find the correct key in the cached Cognito public keys (JWKS)
+            jwks_url = os.environ.get('COGNITO_JWKS_URL').strip('"')
+            try:
+                public_key = get_key_store(jwks_url).get_key(kid)
+            except (requests.RequestException, ValueError):
+                raise exceptions.AuthenticationFailed("Unable to fetch JWKS")
+            if not public_key:
                 raise exceptions.AuthenticationFailed("Public key not found in JWKS")
 
-            # Construct the public key
-            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
-
             # Decode & verify JWT
             claims = jwt.decode(
                 token,
@@ -38,16 +59,34 @@ class CognitoJWTAuthentication(BaseAuthentication):
                 algorithms=['RS256'],
                 audience=os.environ.get('COGNITO_APP_CLIENT_ID')
             )
-
-            # Lookup user by cognito_id
-            try:
-                user = User.objects.get(cognito_id=claims['sub'])
-            except User.DoesNotExist:
-                raise exceptions.AuthenticationFailed("User not found")
-
-            return (user, None)
-
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed("Token has expired")
         except jwt.InvalidTokenError as e:
-            raise exceptions.AuthenticationFailed(f"Invalid token: {str(e)}")
\ No newline at end of file
+            raise exceptions.AuthenticationFailed(f"Invalid token: {str(e)}")
+
+        if 'sub' not in claims:
+            raise exceptions.AuthenticationFailed("Invalid token: missing sub")
+        return claims
+
+
+class CognitoTokenAuthMiddleware:
+    """
+    Sets scope['user'] for websocket connections from a Cognito token passed
+    as ?token= (browsers cannot set an Authorization header on a websocket).
+    Missing or invalid tokens leave an AnonymousUser for the consumer to reject.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+        scope = dict(scope, user=await self.get_user(token) if token else AnonymousUser())
+        return await self.app(scope, receive, send)
+
+    @database_sync_to_async
+    def get_user(self, token):
+        try:
+            return CognitoJWTAuthentication().authenticate_token(token)
+        except exceptions.AuthenticationFailed:
+            return AnonymousUser()
@@ -0,0 +1,109 @@
+# claims_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class VerifiedClaimsCache:
+    """
+    Bounded LRU of verified JWT claims keyed by the SHA-256 of the token,
+    with an optional shared tier in a Django cache (Redis).
+
+    Entries expire at the token's `exp`; an expired token is never served.
+    """
+
+    key_prefix = 'jwt-claims'
+
+    def __init__(self, max_size=10000, cache_alias=None):
+        self.max_size = max_size
+        self.cache_alias = cache_alias
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token):
+        digest = self.digest(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                exp, claims = entry
+                if exp > now:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return claims
+                del self._entries[digest]
+
+        if self.cache_alias:
+            claims = caches[self.cache_alias].get(f"{self.key_prefix}:{digest}")
+            if claims is not None and claims.get('exp', 0) > now:
+                self._store(digest, claims)
+                with self._lock:
+                    self.shared_hits += 1
+                return claims
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, token, claims):
+        exp = claims.get('exp')
+        if not isinstance(exp, (int, float)):
+            return #tokens without an expiry are always verified
+
+        timeout = int(exp - time.time())
+        if timeout <= 0:
+            return
+
+        digest = self.digest(token)
+        self._store(digest, claims)
+        if self.cache_alias:
+            caches[self.cache_alias].set(f"{self.key_prefix}:{digest}", claims, timeout=timeout)
+
+    def _store(self, digest, claims):
+        with self._lock:
+            self._entries[digest] = (claims['exp'], claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+            }
+
+
+_claims_cache = None
+_claims_cache_lock = threading.Lock()
+
+def get_claims_cache():
+    global _claims_cache
+    if _claims_cache is None:
+        with _claims_cache_lock:
+            if _claims_cache is None:
+                _claims_cache = VerifiedClaimsCache(
+                    max_size=getattr(settings, 'COGNITO_CLAIMS_CACHE_SIZE', 10000),
+                    cache_alias=getattr(settings, 'COGNITO_CLAIMS_CACHE_ALIAS', None),
+                )
+    return _claims_cache
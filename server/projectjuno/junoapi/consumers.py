@@ -0,0 +1,53 @@
+# consumers.py
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from junoapi.access import AccessContext
+from junoapi.realtime import project_group, user_group
+
+UNAUTHORIZED = 4401
+
+
+class ProjectEventsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ws/events/ - pushes the change events relayed from the outbox
+    (junoapi.outbox) for every project the user can access. An access.changed
+    event moves the socket onto the user's current projects before it is
+    passed on.
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=UNAUTHORIZED)
+            return
+
+        #self.groups are left again by the base class on disconnect
+        self.groups = [user_group(user.id)] + await self.project_groups(user)
+        for group in self.groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def receive_json(self, content, **kwargs):
+        #server push only
+        pass
+
+    async def change_event(self, message):
+        event = message['event']
+        if event['type'] == 'access.changed':
+            await self.resubscribe()
+        await self.send_json(event)
+
+    async def resubscribe(self):
+        user = self.scope['user']
+        current = set(self.groups)
+        wanted = {user_group(user.id), *await self.project_groups(user)}
+        for group in wanted - current:
+            await self.channel_layer.group_add(group, self.channel_name)
+        for group in current - wanted:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        self.groups = sorted(wanted)
+
+    @database_sync_to_async
+    def project_groups(self, user):
+        return [project_group(project_id) for project_id in sorted(AccessContext(user).project_ids)]
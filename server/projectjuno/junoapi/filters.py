@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from junoapi.serializers import split_param
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Server-side task filters:
+    ?status=To Do,Completed  ?priority=High  ?assigned_userid=3
+    ?due_after=2025-01-01  ?due_before=2025-02-01T12:00:00Z  ?tag=backend
+    Comma separated values are OR-ed, different parameters are AND-ed.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        status = split_param(params.get('status'))
+        if status:
+            queryset = queryset.filter(status__in=status)
+
+        priority = split_param(params.get('priority'))
+        if priority:
+            queryset = queryset.filter(priority__in=priority)
+
+        assigned = params.get('assigned_userid')
+        if assigned:
+            if not assigned.isdigit():
+                raise ValidationError({"error": "assigned_userid must be a user id"})
+            queryset = queryset.filter(assigned_userid=assigned)
+
+        for name, lookup in (('due_after', 'gte'), ('due_before', 'lte')):
+            due = self.parse_due(params, name)
+            if isinstance(due, datetime):
+                queryset = queryset.filter(**{f'due_date__{lookup}': due})
+            elif due:
+                #a plain date covers the whole day
+                queryset = queryset.filter(**{f'due_date__date__{lookup}': due})
+
+        tag = params.get('tag')
+        if tag:
+            queryset = queryset.filter(tags__icontains=tag)
+
+        return queryset
+
+    def parse_due(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value) or parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({"error": f"{name} must be an ISO 8601 date or datetime"})
+        if isinstance(parsed, datetime) and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+
+class TaskOrderingFilter(OrderingFilter):
+    #?ordering=-due_date,priority - id breaks ties so pages stay stable
+    ordering_fields = ['id', 'title', 'status', 'priority', 'start_date', 'due_date', 'points']
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'id', '-id'} & set(ordering):
+            ordering = list(ordering) + ['id']
+        return ordering
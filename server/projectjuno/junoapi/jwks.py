@@ -0,0 +1,123 @@
+# jwks.py
+import logging
+import re
+import threading
+import time
+
+import jwt
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class JWKSKeyStore:
+    """
+    Process-wide store of the RSA public keys published at a JWKS url.
+
+    Keys are parsed once and indexed by `kid`. The key set is refreshed in the
+    background shortly before it expires, and refetched at most once per
+    `min_refetch_interval` when a token arrives with an unknown `kid`.
+    Concurrent refreshes collapse into a single HTTP request.
+    """
+
+    def __init__(self, url, ttl=3600, min_refetch_interval=60, refresh_margin=300, timeout=5):
+        self.url = url
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._generation = 0
+        self._refresh_lock = threading.Lock()
+        self._background = None
+
+    def get_key(self, kid):
+        now = time.monotonic()
+
+        if now >= self._expires_at:
+            self._refresh_or_keep_stale()
+        elif (now >= self._expires_at - self.refresh_margin and
+                now - self._last_fetch >= self.min_refetch_interval):
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_fetch >= self.min_refetch_interval:
+            #unknown kid - Cognito may have rotated its keys
+            self._refresh_or_keep_stale()
+            key = self._keys.get(kid)
+        return key
+
+    def load(self, jwks, ttl=None):
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            if jwk.get('kty') != 'RSA' or 'kid' not in jwk:
+                continue
+            keys[jwk['kid']] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+
+        now = time.monotonic()
+        self._keys = keys
+        self._last_fetch = now
+        self._expires_at = now + (self.ttl if ttl is None else ttl)
+        self._generation += 1
+
+    def refresh(self):
+        #single-flight: callers that queued behind an in-flight fetch reuse its result
+        generation = self._generation
+        with self._refresh_lock:
+            if self._generation != generation:
+                return
+            response = requests.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            self.load(response.json(), ttl=self._ttl_from_headers(response.headers))
+
+    def _refresh_or_keep_stale(self):
+        try:
+            self.refresh()
+        except (requests.RequestException, ValueError) as e:
+            if not self._keys:
+                raise
+            #keep serving the stale keys, retry after the refetch interval
+            logger.warning("JWKS refresh failed, serving stale keys: %s", e)
+            self._last_fetch = time.monotonic()
+            self._expires_at = self._last_fetch + self.min_refetch_interval
+
+    def _refresh_in_background(self):
+        if self._background is not None and self._background.is_alive():
+            return
+        self._background = threading.Thread(target=self._refresh_or_keep_stale, daemon=True)
+        self._background.start()
+
+    def _ttl_from_headers(self, headers):
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control or 'no-cache' in cache_control:
+            return self.min_refetch_interval
+
+        match = MAX_AGE_RE.search(cache_control)
+        if match:
+            return max(int(match.group(1)), self.min_refetch_interval)
+        return self.ttl
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_key_store(url):
+    store = _stores.get(url)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(url)
+            if store is None:
+                store = JWKSKeyStore(
+                    url,
+                    ttl=getattr(settings, 'COGNITO_JWKS_TTL', 3600),
+                    min_refetch_interval=getattr(settings, 'COGNITO_JWKS_MIN_REFETCH_INTERVAL', 60),
+                    refresh_margin=getattr(settings, 'COGNITO_JWKS_REFRESH_MARGIN', 300),
+                )
+                _stores[url] = store
+    return store
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from junoapi.services import prune_task_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete task_tombstone rows older than TASK_TOMBSTONE_RETENTION. Run it periodically, e.g. daily from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention',
+            type=int,
+            default=settings.TASK_TOMBSTONE_RETENTION,
+            help="Seconds of tombstones to keep.",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help="Rows deleted per statement, so no transaction holds many row locks.",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(seconds=options['retention'])
+        batch_size = options['batch_size']
+        total = 0
+        while True:
+            pruned = prune_task_tombstones(before, batch_size=batch_size)
+            total += pruned
+            if pruned < batch_size:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Pruned {total} tombstones older than {before:%Y-%m-%d %H:%M}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from junoapi import project_access
+
+
+class Command(BaseCommand):
+    help = "Rebuild the user_project_access table from teams, project links and owners, or verify it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Only report rows that are missing or stale, exit with an error if any are found.",
+        )
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            missing, stale = project_access.verify()
+            for user_id, project_id, role in sorted(missing):
+                self.stdout.write(f"missing: user {user_id} -> project {project_id} ({role})")
+            for user_id, project_id, role in sorted(stale):
+                self.stdout.write(f"stale: user {user_id} -> project {project_id} ({role})")
+            if missing or stale:
+                raise CommandError(f"user_project_access is out of date: {len(missing)} missing, {len(stale)} stale")
+            self.stdout.write(self.style.SUCCESS("user_project_access is up to date"))
+            return
+
+        with transaction.atomic():
+            missing, stale = project_access.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt user_project_access: {len(missing)} added, {len(stale)} removed"))
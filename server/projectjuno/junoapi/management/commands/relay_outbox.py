@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from junoapi import outbox
+
+
+class Command(BaseCommand):
+    help = "Publish outbox_event rows to the channel layer and delete them. Several relays can run side by side."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Rows claimed, coalesced and published per transaction.",
+        )
+        parser.add_argument(
+            '--window',
+            type=float,
+            default=0.2,
+            help="Seconds to wait after a partial batch, so bursts of edits coalesce.",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Drain the outbox and exit instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_rows = total_events = 0
+        while True:
+            rows, events = outbox.relay(batch_size=batch_size)
+            total_rows += rows
+            total_events += events
+            if rows:
+                self.stdout.write(f"relayed {rows} rows as {events} events")
+            if rows < batch_size:
+                if options['once']:
+                    break
+                time.sleep(options['window'])
+        self.stdout.write(self.style.SUCCESS(f"Relayed {total_rows} rows as {total_events} events"))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 18:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_project_access(apps, schema_editor):
+    Project = apps.get_model('junoapi', 'Project')
+    ProjectTeam = apps.get_model('junoapi', 'ProjectTeam')
+    Team = apps.get_model('junoapi', 'Team')
+    UserProjectAccess = apps.get_model('junoapi', 'UserProjectAccess')
+
+    rows = {(owner_id, project_id, 'owner') for project_id, owner_id in Project.objects.values_list('id', 'owner_id')}
+    links = list(ProjectTeam.objects.values_list('project_id', 'team_id'))
+    #every linked team and its members in two queries
+    teams = Team.objects.prefetch_related('members').in_bulk({team_id for _, team_id in links})
+    for project_id, team_id in links:
+        team = teams[team_id]
+        rows.add((team.productowner_userid_id, project_id, 'product_owner'))
+        if team.projectmanager_userid_id:
+            rows.add((team.projectmanager_userid_id, project_id, 'project_manager'))
+        rows.update((member.id, project_id, 'member') for member in team.members.all())
+
+    UserProjectAccess.objects.bulk_create([
+        UserProjectAccess(user_id_id=user_id, project_id_id=project_id, role=role)
+        for user_id, project_id, role in rows
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0015_alter_project_owner_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('product_owner', 'Product Owner'), ('project_manager', 'Project Manager'), ('member', 'Member')], max_length=20)),
+                ('project_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_access', to='junoapi.project')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_project_access',
+                'constraints': [models.UniqueConstraint(fields=('user_id', 'project_id', 'role'), name='user_project_access_unique')],
+            },
+        ),
+        migrations.RunPython(populate_project_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0016_user_project_access'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project_id', 'id'], name='task_project_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_userid', 'id'], name='task_assigned_keyset_idx'),
+        ),
+    ]
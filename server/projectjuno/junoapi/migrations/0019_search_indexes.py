@@ -0,0 +1,88 @@
+# Generated by Django 5.2 on 2026-10-18 20:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+#table -> (column, weight) pairs folded into its search_vector
+SEARCH_VECTORS = {
+    'task': (('title', 'A'), ('description', 'B')),
+    'project': (('name', 'A'), ('description', 'B')),
+}
+
+#GIN trigram indexes backing the %> (word similarity) operator: (model, field, index name)
+TRIGRAM_INDEXES = (
+    ('user', 'username', 'user_username_trgm_idx'),
+    ('task', 'title', 'task_title_trgm_idx'),
+    ('task', 'description', 'task_description_trgm_idx'),
+    ('project', 'name', 'project_name_trgm_idx'),
+    ('project', 'description', 'project_description_trgm_idx'),
+)
+
+
+def vector_sql(row, columns):
+    return ' || '.join(
+        f"setweight(to_tsvector('pg_catalog.english', coalesce({row}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    execute = schema_editor.execute
+
+    for table, columns in SEARCH_VECTORS.items():
+        execute(f'''
+            CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql('NEW.', columns)};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        ''')
+        execute(f'''
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {', '.join(column for column, _ in columns)} ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        ''')
+        execute(f'UPDATE "{table}" SET search_vector = {vector_sql("", columns)}')
+        execute(f'CREATE INDEX {table}_search_vector_idx ON "{table}" USING gin (search_vector)')
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_VECTORS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON "{table}"')
+        schema_editor.execute(f'DROP FUNCTION IF EXISTS {table}_search_vector_update()')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0018_task_filter_indexes'),
+    ]
+
+    operations = [
+        #pg_trgm ships with postgresql-contrib, which the search needs
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        *(
+            migrations.AddIndex(
+                model_name=model,
+                index=django.contrib.postgres.indexes.GinIndex(fields=[field], name=name, opclasses=['gin_trgm_ops']),
+            )
+            for model, field, name in TRIGRAM_INDEXES
+        ),
+    ]
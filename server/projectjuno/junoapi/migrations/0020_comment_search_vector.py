@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 21:40
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+VECTOR_SQL = "to_tsvector('pg_catalog.english', coalesce({row}text, ''))"
+
+
+def create_comment_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    execute = schema_editor.execute
+    execute(f'''
+        CREATE FUNCTION comment_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {VECTOR_SQL.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    execute('''
+        CREATE TRIGGER comment_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF text ON "comment"
+        FOR EACH ROW EXECUTE FUNCTION comment_search_vector_update()
+    ''')
+    execute(f'UPDATE "comment" SET search_vector = {VECTOR_SQL.format(row="")}')
+    execute('CREATE INDEX comment_search_vector_idx ON "comment" USING gin (search_vector)')
+
+def drop_comment_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER IF EXISTS comment_search_vector_trigger ON "comment"')
+    schema_editor.execute('DROP FUNCTION IF EXISTS comment_search_vector_update()')
+    schema_editor.execute('DROP INDEX IF EXISTS comment_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0019_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_comment_search_index, drop_comment_search_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0020_comment_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('group', models.CharField(max_length=100)),
+                ('entity', models.CharField(max_length=30)),
+                ('entity_id', models.BigIntegerField()),
+                ('event', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'outbox_event',
+            },
+        ),
+    ]
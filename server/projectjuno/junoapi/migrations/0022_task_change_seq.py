@@ -0,0 +1,130 @@
+# Generated by Django 5.2 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+#the writing transaction's id: it only grows, and a reader's snapshot xmin
+#tells which of them may still commit
+CURRENT_SEQ = 'pg_current_xact_id()::text::bigint'
+
+#child tables whose writes also count as a change of their task
+TASK_CHILDREN = ('comment', 'attachment')
+
+
+def create_change_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    execute = schema_editor.execute
+
+    execute(f'''
+        CREATE FUNCTION task_change_seq_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := {CURRENT_SEQ};
+            IF NEW.updated_at IS NULL
+               OR (TG_OP = 'UPDATE' AND NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at) THEN
+                --raw inserts, and queryset and bulk updates, leave auto_now alone
+                NEW.updated_at := now();
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    execute('''
+        CREATE TRIGGER task_change_seq_trigger
+        BEFORE INSERT OR UPDATE ON "task"
+        FOR EACH ROW EXECUTE FUNCTION task_change_seq_update()
+    ''')
+
+    execute(f'''
+        CREATE FUNCTION task_tombstone_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstone (task_id, project_id, change_seq, deleted_at)
+            VALUES (OLD.id, OLD.project_id_id, {CURRENT_SEQ}, now());
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    execute('''
+        CREATE TRIGGER task_tombstone_delete_trigger
+        AFTER DELETE ON "task"
+        FOR EACH ROW EXECUTE FUNCTION task_tombstone_insert()
+    ''')
+    execute('''
+        CREATE TRIGGER task_tombstone_move_trigger
+        AFTER UPDATE OF project_id_id ON "task"
+        FOR EACH ROW WHEN (OLD.project_id_id IS DISTINCT FROM NEW.project_id_id)
+        EXECUTE FUNCTION task_tombstone_insert()
+    ''')
+
+    execute('''
+        CREATE FUNCTION task_child_touch() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'DELETE' THEN
+                UPDATE "task" SET updated_at = now() WHERE id = NEW.task_id_id;
+            END IF;
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.task_id_id IS DISTINCT FROM NEW.task_id_id) THEN
+                UPDATE "task" SET updated_at = now() WHERE id = OLD.task_id_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    for table in TASK_CHILDREN:
+        execute(f'''
+            CREATE TRIGGER {table}_task_touch_trigger
+            AFTER INSERT OR UPDATE OR DELETE ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION task_child_touch()
+        ''')
+
+    execute('UPDATE "task" SET change_seq = change_seq')
+
+def drop_change_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TASK_CHILDREN:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_task_touch_trigger ON "{table}"')
+    for trigger in ('task_change_seq_trigger', 'task_tombstone_delete_trigger', 'task_tombstone_move_trigger'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger} ON "task"')
+    for function in ('task_change_seq_update', 'task_tombstone_insert', 'task_child_touch'):
+        schema_editor.execute(f'DROP FUNCTION IF EXISTS {function}()')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0021_outbox_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('project_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'task_tombstone',
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project_id', 'change_seq'], name='task_project_change_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['project_id', 'change_seq'], name='tombstone_project_change_idx'),
+        ),
+        migrations.RunPython(create_change_triggers, drop_change_triggers),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('junoapi', '0022_task_change_seq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstoneHorizon',
+            fields=[
+                ('project_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('change_seq', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'task_tombstone_horizon',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 # Create your models here.
 class Team(models.Model):
@@ -31,6 +33,10 @@ class User(AbstractUser):
 
     class Meta:
         db_table = 'user'
+        indexes = [
+            #search - username %> q (pg_trgm, migration 0019)
+            GinIndex(fields=['username'], opclasses=['gin_trgm_ops'], name='user_username_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.username
@@ -41,9 +47,16 @@ class Project(models.Model):
     start_date = models.DateTimeField()
     due_date = models.DateTimeField()
     owner_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='project_owner')
+    #weighted name/description lexemes, maintained by a database trigger (migration 0019)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = 'project'
+        indexes = [
+            #search - name/description %> q (pg_trgm, migration 0019)
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='project_name_trgm_idx'),
+            GinIndex(fields=['description'], opclasses=['gin_trgm_ops'], name='project_description_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -70,13 +83,62 @@ class Task(models.Model):
     project_id = models.ForeignKey(Project, on_delete=models.CASCADE)
     author_userid = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_author')
     assigned_userid = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='task_assigned')
+    #weighted title/description lexemes, maintained by a database trigger (migration 0019)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    #id of the last transaction that wrote the task, its comments or attachments (trigger, migration 0022)
+    change_seq = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'task'
+        indexes = [
+            #delta sync - WHERE project_id = %s AND change_seq >= %s
+            models.Index(fields=['project_id', 'change_seq'], name='task_project_change_idx'),
+            #keyset pagination - WHERE project_id = %s AND id > %s ORDER BY id
+            models.Index(fields=['project_id', 'id'], name='task_project_keyset_idx'),
+            models.Index(fields=['assigned_userid', 'id'], name='task_assigned_keyset_idx'),
+            #server-side filters - priority pages and board columns
+            models.Index(fields=['assigned_userid', 'priority'], name='task_assigned_priority_idx'),
+            models.Index(fields=['assigned_userid', 'status'], name='task_assigned_status_idx'),
+            models.Index(fields=['project_id', 'status'], name='task_project_status_idx'),
+            models.Index(fields=['project_id', 'priority'], name='task_project_priority_idx'),
+            #search - title/description %> q (pg_trgm, migration 0019)
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='task_title_trgm_idx'),
+            GinIndex(fields=['description'], opclasses=['gin_trgm_ops'], name='task_description_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+class TaskTombstone(models.Model):
+    """
+    A task deleted from, or moved out of, a project - written by a database
+    trigger (migration 0022) so ?since= syncs can drop it from cached lists.
+    """
+    task_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'task_tombstone'
+        indexes = [
+            models.Index(fields=['project_id', 'change_seq'], name='tombstone_project_change_idx'),
+            #pruning - WHERE deleted_at < %s
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+
+class TaskTombstoneHorizon(models.Model):
+    """
+    The newest change_seq of a project's pruned tombstones (prune_task_tombstones).
+    A ?since= sync at or below it may have missed deletions and must reload.
+    """
+    project_id = models.BigIntegerField(primary_key=True)
+    change_seq = models.BigIntegerField()
+
+    class Meta:
+        db_table = 'task_tombstone_horizon'
+
 class TaskAssignment(models.Model):
     user_id = models.ForeignKey(User, on_delete=models.CASCADE)
     task_id = models.ForeignKey(Task, on_delete=models.CASCADE)
@@ -100,9 +162,53 @@ class Comment(models.Model):
     text = models.CharField(max_length=150)
     task_id = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comment')
     user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_comments')
+    #text lexemes, maintained by a database trigger (migration 0020)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = 'comment'
 
     def __str__(self):
-        return self.text
\ No newline at end of file
+        return self.text
+
+#Denormalized project visibility, maintained by junoapi.signals - see junoapi/project_access.py
+class UserProjectAccess(models.Model):
+    OWNER = 'owner'
+    PRODUCT_OWNER = 'product_owner'
+    PROJECT_MANAGER = 'project_manager'
+    MEMBER = 'member'
+    ROLE_CHOICES = [
+        (OWNER, 'Owner'),
+        (PRODUCT_OWNER, 'Product Owner'),
+        (PROJECT_MANAGER, 'Project Manager'),
+        (MEMBER, 'Member'),
+    ]
+
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='project_access')
+    project_id = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='user_access')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+
+    class Meta:
+        db_table = 'user_project_access'
+        constraints = [
+            models.UniqueConstraint(fields=['user_id', 'project_id', 'role'], name='user_project_access_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id_id} -> {self.project_id_id} ({self.role})"
+
+#Change events written in the same transaction as the change and published by
+#manage.py relay_outbox - see junoapi/outbox.py
+class OutboxEvent(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    group = models.CharField(max_length=100)
+    entity = models.CharField(max_length=30)
+    entity_id = models.BigIntegerField()
+    event = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'outbox_event'
+
+    def __str__(self):
+        return f"{self.group} {self.event.get('type')}"
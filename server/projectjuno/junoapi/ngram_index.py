@@ -0,0 +1,103 @@
+# ngram_index.py
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+WORD = re.compile(r'\w+')
+
+
+def trigrams(text):
+    """pg_trgm style trigrams: each lower-cased word padded with two spaces before and one after."""
+    grams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NgramIndex:
+    """
+    Trigram inverted index over one text field. Trigrams are interned to ints
+    and every posting list is a sorted array('Q') of document ids - bigint
+    primary keys - so the index costs eight bytes per (document, trigram)
+    pair. Each document keeps its own array('I') of trigram ids so that an
+    update only touches the lists whose trigrams changed.
+    """
+
+    def __init__(self):
+        self._gram_ids = {}
+        self._postings = []
+        self._docs = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def copy(self):
+        index = NgramIndex()
+        index._gram_ids = dict(self._gram_ids)
+        #posting lists change in place, per-document arrays are only ever replaced
+        index._postings = [array(posting.typecode, posting) for posting in self._postings]
+        index._docs = dict(self._docs)
+        return index
+
+    def nbytes(self):
+        #payload of the posting and per-document arrays
+        arrays = [*self._postings, *self._docs.values()]
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    @classmethod
+    def build(cls, rows):
+        """Index (doc_id, text) rows in one pass, sorting each posting list once at the end."""
+        index = cls()
+        for doc_id, text in rows:
+            gram_ids = array('I', sorted({index._intern(gram) for gram in trigrams(text or '')}))
+            index._docs[doc_id] = gram_ids
+            for gram_id in gram_ids:
+                index._postings[gram_id].append(doc_id)
+        index._postings = [array('Q', sorted(posting)) for posting in index._postings]
+        return index
+
+    def add(self, doc_id, text):
+        new = array('I', sorted(self._intern(gram) for gram in trigrams(text or '')))
+        old = self._docs.get(doc_id, array('I'))
+        old_set, new_set = set(old), set(new)
+        for gram_id in old_set - new_set:
+            self._discard(gram_id, doc_id)
+        for gram_id in new_set - old_set:
+            insort(self._postings[gram_id], doc_id)
+        self._docs[doc_id] = new
+
+    def remove(self, doc_id):
+        for gram_id in self._docs.pop(doc_id, ()):
+            self._discard(gram_id, doc_id)
+
+    def similarities(self, q, threshold):
+        """
+        {doc_id: share of the query's trigrams found in the document}, the
+        in-memory counterpart of pg_trgm word_similarity, for documents at or
+        above `threshold`.
+        """
+        grams = trigrams(q)
+        if not grams:
+            return {}
+        counts = Counter()
+        for gram in grams:
+            gram_id = self._gram_ids.get(gram)
+            if gram_id is not None:
+                counts.update(self._postings[gram_id])
+        needed = threshold * len(grams)
+        return {doc_id: count / len(grams) for doc_id, count in counts.items() if count >= needed}
+
+    def _intern(self, gram):
+        gram_id = self._gram_ids.get(gram)
+        if gram_id is None:
+            gram_id = self._gram_ids[gram] = len(self._postings)
+            self._postings.append(array('Q'))
+        return gram_id
+
+    def _discard(self, gram_id, doc_id):
+        posting = self._postings[gram_id]
+        position = bisect_left(posting, doc_id)
+        if position < len(posting) and posting[position] == doc_id:
+            del posting[position]
@@ -0,0 +1,80 @@
+# outbox.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from django.db import transaction
+
+from junoapi.models import OutboxEvent
+
+#channel layer message type, handled by ProjectEventsConsumer.change_event
+MESSAGE_TYPE = 'change.event'
+
+
+def record(events):
+    """
+    Queue (group, entity, entity_id, event) tuples for the relay. Called inside
+    the transaction making the change, so the events commit or roll back with it.
+    """
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(group=group, entity=entity, entity_id=entity_id, event=event)
+        for group, entity, entity_id, event in events
+    ])
+
+def coalesce(rows):
+    """
+    One event per (group, entity, entity_id), in order of first appearance.
+    Updates and status moves fold into a pending create or into each other,
+    a delete replaces them, and a task both created and deleted in the batch
+    is dropped. Other events keep only the latest.
+    """
+    merged = {}
+    for row in rows:
+        key = (row.group, row.entity, row.entity_id)
+        merged[key] = _merge(merged.get(key), row.event)
+    return [(group, event) for (group, _, _), event in merged.items() if event is not None]
+
+def _changes(event):
+    if event['type'] == 'task.updated':
+        return event['changes']
+    if event['type'] == 'task.status':
+        return {'status': event['to']}
+    return None
+
+def _merge(pending, event):
+    if pending is None:
+        return event
+    if event['type'] == 'task.deleted':
+        return None if pending['type'] == 'task.created' else event
+
+    changes = _changes(event)
+    if changes is None or pending['type'] == 'task.deleted':
+        return event
+    if pending['type'] == 'task.created':
+        return {**pending, 'task': {**pending['task'], **changes}}
+    if pending['type'] == event['type'] == 'task.status':
+        #moved back to where it started - nothing to tell
+        return None if pending['from'] == event['to'] else {**event, 'from': pending['from']}
+
+    base = {key: value for key, value in pending.items() if key not in ('from', 'to', 'changes')}
+    return {**base, 'type': 'task.updated', 'changes': {**_changes(pending), **changes}}
+
+def relay(batch_size=500):
+    """
+    Publish and delete up to `batch_size` of the oldest outbox rows, returning
+    (rows relayed, events published). Rows locked by another relay are
+    skipped, so several relays can drain the table side by side (events for
+    one entity may then arrive out of order across batches).
+    """
+    with transaction.atomic():
+        rows = list(OutboxEvent.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size])
+        if not rows:
+            return 0, 0
+        messages = coalesce(rows)
+        #sent before the delete commits: a crash in between publishes twice, never loses an event
+        async_to_sync(_send_all)(get_channel_layer(), messages)
+        OutboxEvent.objects.filter(id__in=[row.id for row in rows]).delete()
+    return len(rows), len(messages)
+
+async def _send_all(layer, messages):
+    for group, event in messages:
+        await layer.group_send(group, {'type': MESSAGE_TYPE, 'event': event})
@@ -0,0 +1,121 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Keyset pagination over task lists with an opaque cursor.
+
+    Opt-in: requests without `cursor` or `page_size` get the plain, unpaginated
+    list the current client expects.
+
+    DRF's CursorPagination positions on the first ordering field alone, which
+    skips or repeats rows when that field has duplicates or NULLs (?ordering=points,
+    ?ordering=-due_date). Here the cursor holds the whole (field, ..., id) tuple
+    of the row it points at, and pages continue strictly after that tuple, with
+    NULLs last in ascending order and first in descending order.
+    """
+    ordering = 'id'
+    page_size = getattr(settings, 'TASK_PAGE_SIZE', 100)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'TASK_MAX_PAGE_SIZE', 500)
+
+    def paginates(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.paginates(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        if not {'id', '-id'} & set(self.ordering):
+            self.ordering += ('id',)
+        self.model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        ordering = _reversed(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*(_order_by(field) for field in ordering))
+        if self.cursor is not None:
+            queryset = queryset.filter(_after(ordering, self.decode_position(self.cursor.position)))
+
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        #a cursor was followed to get here, so there is a page on the side it came from
+        self.has_next = has_following if not reverse else True
+        self.has_previous = has_following if reverse else self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.encode_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.encode_position(self.page[0])))
+
+    def encode_position(self, instance):
+        values = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        return json.dumps([None if value is None else str(value) for value in values])
+
+    def decode_position(self, position):
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                None if value is None else self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, FieldDoesNotExist, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+def _order_by(field):
+    if field.startswith('-'):
+        return F(field[1:]).desc(nulls_first=True)
+    return F(field).asc(nulls_last=True)
+
+def _reversed(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+def _after(ordering, values):
+    """Rows strictly after `values` in `ordering`: (a, b, id) > (x, y, z) with NULLs where _order_by puts them."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        if value is None:
+            #NULLs come first descending, so every value is after them; last ascending, so nothing is
+            beyond = Q(**{f'{name}__isnull': False}) if descending else Q(pk__in=[])
+            same = Q(**{f'{name}__isnull': True})
+        else:
+            beyond = Q(**{f'{name}__lt': value}) if descending else Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+            same = Q(**{name: value})
+        condition |= equal & beyond
+        equal &= same
+    return condition
+
+
+class SearchPagination(PageNumberPagination):
+    """Pages through every ranked search hit, best first."""
+    page_size = settings.SEARCH_RESULTS_PER_TYPE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.SEARCH_MAX_RESULTS_PER_TYPE
@@ -1,63 +1,57 @@
-from junoapi.models import ProjectTeam, Team, Task
+from junoapi.access import get_access_context
 
 from rest_framework.permissions import BasePermission
-from django.db.models import Q
+
+#Permissions - Admin group members and superusers
+class IsAdmin(BasePermission):
+
+    def has_permission(self, request, view):
+        return get_access_context(request).is_admin
 
 #Permissions - Project
 class isOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser or request.user.groups.filter(name='Admin').exists():
+        if get_access_context(request).is_admin:
             return True
-        return obj.owner_id == request.user
-    
+        return obj.owner_id_id == request.user.id
+
 class canAcessProject(BasePermission):
     def has_object_permission(self, request, view, obj):
-        user = request.user
-
-        if obj.owner_id == user or obj.owner_id_id == user.id:
+        if obj.owner_id_id == request.user.id:
             return True
-        
-        print("Owner:", obj.owner_id, obj.owner_id_id)
-        print("Request user:", user, user.id)
-
-        project_team = ProjectTeam.objects.filter(project_id=obj).values_list("team_id", flat=True)
-        user_teams = Team.objects.filter(
-            Q(id__in=project_team) & 
-            (Q(productowner_userid=user) | Q(projectmanager_userid=user) | Q(members=user))
-        )
-        return user_teams.exists()
-    
+        return get_access_context(request).can_access_project(obj.id)
+
 #Permissions - Teams
 class IsProductOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser or request.user.groups.filter(name="Admin").exists():
+        if get_access_context(request).is_admin:
             return True
-        return obj.productowner_userid == request.user
+        return obj.productowner_userid_id == request.user.id
 
 class IsOwnerOrManager(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser or request.user.groups.filter(name="Admin").exists():
+        if get_access_context(request).is_admin:
             return True
         return(
-            obj.productowner_userid == request.user or
-            obj.projectmanager_userid == request.user
+            obj.productowner_userid_id == request.user.id or
+            obj.projectmanager_userid_id == request.user.id
         )
-    
+
 #Permissions - Comment
 class IsAdminOrCommentOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser or request.user.groups.filter(name="Admin").exists():
+        if get_access_context(request).is_admin:
             return True
-        return obj.user_id.id == request.user.id
+        return obj.user_id_id == request.user.id
 
 #Permissions - Task
 class isAdminOrTaskAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        if request.user.is_superuser or request.user.groups.filter(name="Admin").exists():
+        if get_access_context(request).is_admin:
             return True
-        
-        return(obj.author_userid == request.user)
\ No newline at end of file
+
+        return(obj.author_userid_id == request.user.id)
@@ -0,0 +1,103 @@
+# project_access.py
+# Keeps the user_project_access table in step with Project.owner_id, ProjectTeam
+# links and the product owner / project manager / members of the linked teams.
+from collections import defaultdict
+
+from django.db.models import Q
+
+from junoapi import realtime
+from junoapi.models import Project, ProjectTeam, Team, UserProjectAccess
+
+
+def expected_rows(project_ids=None):
+    """(user_id, project_id, role) rows derived from the source tables."""
+    projects = Project.objects.all()
+    links = ProjectTeam.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(id__in=project_ids)
+        links = links.filter(project_id__in=project_ids)
+
+    rows = {
+        (owner_id, project_id, UserProjectAccess.OWNER)
+        for project_id, owner_id in projects.values_list('id', 'owner_id')
+    }
+
+    team_projects = defaultdict(set)
+    for project_id, team_id in links.values_list('project_id', 'team_id'):
+        team_projects[team_id].add(project_id)
+    if not team_projects:
+        return rows
+
+    team_users = defaultdict(set)
+    for team_id, owner_id, manager_id in Team.objects.filter(id__in=team_projects).values_list(
+        'id', 'productowner_userid', 'projectmanager_userid'
+    ):
+        team_users[team_id].add((owner_id, UserProjectAccess.PRODUCT_OWNER))
+        if manager_id:
+            team_users[team_id].add((manager_id, UserProjectAccess.PROJECT_MANAGER))
+    for team_id, user_id in Team.members.through.objects.filter(team_id__in=team_projects).values_list(
+        'team_id', 'user_id'
+    ):
+        team_users[team_id].add((user_id, UserProjectAccess.MEMBER))
+
+    for team_id, users in team_users.items():
+        for project_id in team_projects[team_id]:
+            rows.update((user_id, project_id, role) for user_id, role in users)
+    return rows
+
+def stored_rows(project_ids=None):
+    queryset = UserProjectAccess.objects.all()
+    if project_ids is not None:
+        queryset = queryset.filter(project_id__in=project_ids)
+    return set(queryset.values_list('user_id', 'project_id', 'role'))
+
+def sync_projects(project_ids, prune_only=False):
+    """
+    Bring the access rows of the given projects up to date. With prune_only the
+    sync only removes rows, which is all a delete can ever require and keeps it
+    safe to run while a project is itself being cascade-deleted.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+    expected = expected_rows(project_ids)
+    stored = stored_rows(project_ids)
+    _apply(expected, stored, prune_only)
+
+def sync_teams(team_ids, prune_only=False):
+    sync_projects(
+        ProjectTeam.objects.filter(team_id__in=team_ids).values_list('project_id', flat=True),
+        prune_only=prune_only
+    )
+
+def rebuild():
+    expected = expected_rows()
+    stored = stored_rows()
+    return _apply(expected, stored)
+
+def verify():
+    """Rows that are (missing, stale) compared to a full rebuild."""
+    expected = expected_rows()
+    stored = stored_rows()
+    return expected - stored, stored - expected
+
+def _apply(expected, stored, prune_only=False):
+    missing = set() if prune_only else expected - stored
+    stale = stored - expected
+
+    if stale:
+        condition = Q()
+        for user_id, project_id, role in stale:
+            condition |= Q(user_id=user_id, project_id=project_id, role=role)
+        UserProjectAccess.objects.filter(condition).delete()
+    if missing:
+        UserProjectAccess.objects.bulk_create([
+            UserProjectAccess(user_id_id=user_id, project_id_id=project_id, role=role)
+            for user_id, project_id, role in missing
+        ], ignore_conflicts=True)
+
+    changed_users = {user_id for user_id, _, _ in missing | stale}
+    if changed_users:
+        #recorded with the change itself; the users' open sockets resubscribe
+        realtime.access_changed(changed_users)
+    return missing, stale
@@ -0,0 +1,123 @@
+# project_stats.py
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from junoapi.models import Task
+
+DONE_STATUS = 'Completed'
+
+GENERATION_PREFIX = 'project-stats-gen'
+STATS_PREFIX = 'project-stats'
+
+
+def _cache():
+    return caches[getattr(settings, 'PROJECT_STATS_CACHE_ALIAS', 'default')]
+
+def _generation_key(project_id):
+    return f"{GENERATION_PREFIX}:{project_id}"
+
+def _stats_key(project_id, generation):
+    return f"{STATS_PREFIX}:{project_id}:{generation}"
+
+def _empty(project_id):
+    return {
+        'project_id': project_id,
+        'tasks': 0,
+        'by_status': {},
+        'by_priority': {},
+        'points': {'total': 0, 'remaining': 0},
+        'overdue': 0,
+        'assignees': [],
+    }
+
+def compute(project_ids):
+    """Stats for each project from a single GROUP BY over its tasks."""
+    open_tasks = ~Q(status=DONE_STATUS)
+    rows = Task.objects.filter(project_id__in=project_ids).values(
+        'project_id', 'status', 'priority', 'assigned_userid'
+    ).annotate(
+        tasks=Count('id'),
+        open=Count('id', filter=open_tasks),
+        total_points=Sum('points', default=0),
+        remaining_points=Sum('points', filter=open_tasks, default=0),
+        overdue=Count('id', filter=open_tasks & Q(due_date__lt=timezone.now())),
+    ).order_by()
+
+    stats = {project_id: _empty(project_id) for project_id in project_ids}
+    assignees = {project_id: {} for project_id in project_ids}
+    for row in rows:
+        project = stats[row['project_id']]
+        project['tasks'] += row['tasks']
+        project['by_status'][row['status']] = project['by_status'].get(row['status'], 0) + row['tasks']
+        project['by_priority'][row['priority']] = project['by_priority'].get(row['priority'], 0) + row['tasks']
+        project['points']['total'] += row['total_points']
+        project['points']['remaining'] += row['remaining_points']
+        project['overdue'] += row['overdue']
+
+        load = assignees[row['project_id']].setdefault(row['assigned_userid'], {
+            'assigned_userid': row['assigned_userid'], 'tasks': 0, 'open': 0, 'remaining_points': 0
+        })
+        load['tasks'] += row['tasks']
+        load['open'] += row['open']
+        load['remaining_points'] += row['remaining_points']
+
+    for project_id, loads in assignees.items():
+        #busiest first, unassigned work last
+        stats[project_id]['assignees'] = sorted(
+            loads.values(),
+            key=lambda load: (load['assigned_userid'] is None, -load['open'], -load['remaining_points'], load['assigned_userid'] or 0)
+        )
+    return stats
+
+def get_project_stats(project_ids):
+    """
+    {project_id: stats}, served from the shared cache where the project's
+    generation still matches and computed in one query for the rest.
+    """
+    project_ids = sorted(set(project_ids))
+    if not project_ids:
+        return {}
+    cache = _cache()
+
+    generations = cache.get_many([_generation_key(project_id) for project_id in project_ids])
+    missing_generations = {}
+    for project_id in project_ids:
+        if _generation_key(project_id) not in generations:
+            missing_generations[_generation_key(project_id)] = uuid.uuid4().hex
+    if missing_generations:
+        #add() so a concurrent bump is never overwritten
+        for key, generation in missing_generations.items():
+            if not cache.add(key, generation, timeout=None):
+                generation = cache.get(key)
+            generations[key] = generation
+
+    keys = {project_id: _stats_key(project_id, generations[_generation_key(project_id)]) for project_id in project_ids}
+    cached = cache.get_many(list(keys.values()))
+
+    result = {project_id: cached[key] for project_id, key in keys.items() if key in cached}
+    stale = [project_id for project_id in project_ids if project_id not in result]
+    if stale:
+        fresh = compute(stale)
+        #the TTL keeps overdue counts moving with the clock
+        cache.set_many({keys[project_id]: fresh[project_id] for project_id in stale}, timeout=settings.PROJECT_STATS_TTL)
+        result.update(fresh)
+    return result
+
+def bump(project_ids):
+    """Start a new generation for the projects; their cached stats are no longer read."""
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+    _cache().set_many({_generation_key(project_id): uuid.uuid4().hex for project_id in project_ids}, timeout=None)
+
+def bump_on_commit(project_ids):
+    #bump now for readers inside this transaction, and again after commit so a
+    #read racing the transaction cannot cache pre-commit totals under the new generation
+    project_ids = set(project_ids)
+    bump(project_ids)
+    transaction.on_commit(lambda: bump(project_ids))
@@ -0,0 +1,109 @@
+# realtime.py
+from django.core.serializers.json import DjangoJSONEncoder
+
+from junoapi import outbox
+from junoapi.models import Task
+
+#the task columns sent in change events - no nested users, comments or attachments
+TASK_EVENT_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'tags', 'start_date', 'due_date',
+    'points', 'project_id', 'author_userid', 'assigned_userid',
+)
+
+_encoder = DjangoJSONEncoder()
+
+
+def project_group(project_id):
+    return f"project-{project_id}"
+
+def user_group(user_id):
+    return f"user-{user_id}"
+
+def _plain(value):
+    #events travel as JSON and msgpack, so dates go out as the ISO strings the API uses
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return _encoder.default(value)
+
+def task_snapshot(task, fields=TASK_EVENT_FIELDS):
+    return {name: _plain(getattr(task, Task._meta.get_field(name).attname)) for name in fields}
+
+def _project_event(project_id, entity, entity_id, event):
+    return (project_group(project_id), entity, entity_id, {**event, 'project_id': project_id})
+
+#Change events - called from the write paths, inside their transaction
+def task_created(task):
+    outbox.record([_task_created(task)])
+
+def _task_created(task):
+    return _project_event(task.project_id_id, 'task', task.id, {'type': 'task.created', 'task': task_snapshot(task)})
+
+def task_changed(before, task):
+    """Record what changed between the `before` snapshot and the saved task."""
+    task_changes([(before, task)])
+
+def task_changes(pairs):
+    events = []
+    for before, task in pairs:
+        after = task_snapshot(task, fields=before.keys())
+        changes = {name: value for name, value in after.items() if before[name] != value}
+        if not changes:
+            continue
+        if 'project_id' in changes:
+            #moved, so it leaves one project's lists and joins the other's
+            events.append(_project_event(before['project_id'], 'task', task.id, {'type': 'task.deleted', 'id': task.id}))
+            events.append(_task_created(task))
+        elif set(changes) == {'status'}:
+            events.append(_project_event(task.project_id_id, 'task', task.id, {
+                'type': 'task.status', 'id': task.id, 'from': before['status'], 'to': changes['status']
+            }))
+        else:
+            events.append(_project_event(task.project_id_id, 'task', task.id, {
+                'type': 'task.updated', 'id': task.id, 'changes': changes
+            }))
+    if events:
+        outbox.record(events)
+
+def task_deleted(task_id, project_id):
+    outbox.record([_project_event(project_id, 'task', task_id, {'type': 'task.deleted', 'id': task_id})])
+
+def comment_added(comment, project_id):
+    outbox.record([_project_event(project_id, 'comment', comment.id, {
+        'type': 'comment.added',
+        'task_id': comment.task_id_id,
+        'comment': {
+            'id': comment.id,
+            'text': comment.text,
+            'user_id': comment.user_id_id,
+            'username': comment.user_id.username,
+        },
+    })])
+
+def comment_deleted(comment, project_id):
+    outbox.record([_project_event(project_id, 'comment', comment.id, {
+        'type': 'comment.deleted', 'id': comment.id, 'task_id': comment.task_id_id
+    })])
+
+def attachment_saved(attachment, project_id, created):
+    outbox.record([_project_event(project_id, 'attachment', attachment.id, {
+        'type': 'attachment.added' if created else 'attachment.updated',
+        'task_id': attachment.task_id_id,
+        'attachment': {
+            'id': attachment.id,
+            'file_name': attachment.file_name,
+            'file_url': attachment.file_url,
+            'uploadedby_id': attachment.uploadedby_id_id,
+        },
+    })])
+
+def attachment_deleted(attachment, project_id):
+    outbox.record([_project_event(project_id, 'attachment', attachment.id, {
+        'type': 'attachment.deleted', 'id': attachment.id, 'task_id': attachment.task_id_id
+    })])
+
+def access_changed(user_ids):
+    #the users' visible projects changed; their sockets resubscribe
+    outbox.record([
+        (user_group(user_id), 'user', user_id, {'type': 'access.changed'})
+        for user_id in sorted(set(user_ids))
+    ])
@@ -0,0 +1,85 @@
+# renderers.py
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+#JSONRenderer's escaping for JavaScript, which orjson and Postgres' to_json leave out
+_JS_ESCAPES = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+
+def escape_js(body):
+    """Encoded JSON with U+2028/U+2029 escaped the way JSONRenderer writes them."""
+    for character, escaped in _JS_ESCAPES:
+        if character in body:
+            body = body.replace(character, escaped)
+    return body
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer output, produced by orjson. Types orjson has no native
+    encoding for (decimals, lazy translation strings, timedeltas, querysets)
+    go through DRF's JSONEncoder, so they come out exactly as before.
+    Indented output - ?format=json; indent=4 and the browsable API - and the
+    non-default UNICODE_JSON/COMPACT_JSON settings fall back to the stdlib.
+    """
+    encoder = JSONRenderer.encoder_class()
+    #datetimes as DRF writes them (UTC as Z); non-string keys as json.dumps writes them
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return escape_js(orjson.dumps(data, default=self.encoder.default, option=self.options))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Accept: application/msgpack (or ?format=msgpack) - the same data as the
+    JSON response, packed with msgpack. Values without a msgpack type go
+    through DRF's JSONEncoder, as in the JSON renderers.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder = JSONRenderer.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder.default)
+
+
+class ColumnarJSONRenderer(BaseRenderer):
+    """
+    ?format=columnar - a list as one array per field, {"id": [1, 2], "title": ["a", "b"]},
+    rather than one object per item. A page keeps next/previous and has its
+    results in columns. Nested values (a task's comments) are left as they are;
+    anything that is not a list of objects, such as an error, is rendered unchanged.
+    """
+    media_type = 'application/json'
+    format = 'columnar'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = {**data, 'results': columns(data['results'])}
+        elif isinstance(data, list):
+            data = columns(data)
+        return ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+
+
+def columns(rows):
+    if not rows:
+        return {}
+    if not isinstance(rows[0], dict):
+        return rows
+    #the rows come from one serializer, so the first one's fields are everyone's
+    return {field: [row[field] for row in rows] for field in rows[0]}
+
+#the extra formats offered by the bulk list endpoints
+BULK_RENDERER_CLASSES = [MessagePackRenderer, ColumnarJSONRenderer]
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from junoapi.consumers import ProjectEventsConsumer
+
+websocket_urlpatterns = [
+    path('ws/events/', ProjectEventsConsumer.as_asgi(), name='project-events'),
+]
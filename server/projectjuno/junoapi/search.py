@@ -0,0 +1,112 @@
+# search.py
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from junoapi.models import Comment, Project, Task, User
+
+SEARCH_CONFIG = 'english'
+#ts_headline match delimiters - control characters that cannot clash with comment text,
+#swapped for <mark> tags once the rest of the snippet is HTML escaped
+HIGHLIGHT_START, HIGHLIGHT_STOP = '\x02', '\x03'
+
+#Every condition below is served by a GIN index from migration 0019:
+#  col %> q            trigram word similarity (pg_trgm.word_similarity_threshold, see below)
+#  search_vector @@ q  full-text match on the trigger maintained tsvector
+#so postgres can BitmapOr the index scans instead of scanning the tables.
+#Comments are matched by full text only (migration 0020).
+
+@contextmanager
+def word_similarity_threshold():
+    """
+    Evaluate %> matches in this block against SEARCH_WORD_SIMILARITY_THRESHOLD.
+    The operator reads it from a setting, SET LOCAL here in a transaction (a
+    savepoint inside an open one) so it holds for these queries whatever
+    connection, or PgBouncer server connection, they run on.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(settings.SEARCH_WORD_SIMILARITY_THRESHOLD)]
+            )
+        yield
+
+def _full_text(q):
+    return SearchQuery(q, config=SEARCH_CONFIG, search_type='websearch')
+
+def _similar(*fields, q):
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__trigram_word_similar': q})
+    return condition
+
+def _similarity(*fields, q):
+    similarities = [TrigramWordSimilarity(q, field) for field in fields]
+    return Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+def search_users(q):
+    if not q:
+        return User.objects.none()
+    return User.objects.filter(_similar('username', q=q))
+
+def search_tasks(q, project_ids=None):
+    if not q:
+        return Task.objects.none()
+    queryset = Task.objects.filter(_similar('title', 'description', q=q) | Q(search_vector=_full_text(q)))
+    if project_ids is not None:
+        queryset = queryset.filter(project_id__in=project_ids)
+    return queryset
+
+def search_projects(q, project_ids=None):
+    if not q:
+        return Project.objects.none()
+    queryset = Project.objects.filter(_similar('name', 'description', q=q) | Q(search_vector=_full_text(q)))
+    if project_ids is not None:
+        queryset = queryset.filter(id__in=project_ids)
+    return queryset
+
+def search_comments(q, project_ids=None):
+    if not q:
+        return Comment.objects.none()
+    queryset = Comment.objects.filter(search_vector=_full_text(q))
+    if project_ids is not None:
+        queryset = queryset.filter(task_id__project_id__in=project_ids)
+    return queryset
+
+#Ranking - best word similarity plus the weighted full-text rank
+def user_rank(q):
+    return _similarity('username', q=q)
+
+def task_rank(q):
+    return _similarity('title', 'description', q=q) + SearchRank(F('search_vector'), _full_text(q))
+
+def project_rank(q):
+    return _similarity('name', 'description', q=q) + SearchRank(F('search_vector'), _full_text(q))
+
+def comment_rank(q):
+    return SearchRank(F('search_vector'), _full_text(q))
+
+def comment_headline(q):
+    #ts_headline is costly, postgres evaluates it only for the rows left after ORDER BY/LIMIT
+    return SearchHeadline(
+        'text', _full_text(q), config=SEARCH_CONFIG,
+        start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+    )
+
+def ranked(matches, rank):
+    """
+    Every index match, best ranked first and unsliced, for callers that page
+    through them. Nothing is dropped before ranking: the work for a very
+    common term is bounded by the category's statement timeout instead (see
+    search_fanout), and a LIMIT keeps the sort a top-N heap.
+    """
+    return matches.annotate(rank=rank).order_by('-rank', 'pk')
+
+def top_hits(matches, rank, limit):
+    """The `limit` best ranked rows of `matches`."""
+    return ranked(matches, rank)[:limit]
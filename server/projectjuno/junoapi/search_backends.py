@@ -0,0 +1,284 @@
+# search_backends.py
+import heapq
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.module_loading import import_string
+
+from junoapi import search
+from junoapi.models import Project, Task, User
+from junoapi.ngram_index import NgramIndex, trigrams
+
+#slim columns for the task hit cards
+TASK_HIT_COLUMNS = (
+    'id', 'title', 'description', 'status', 'priority', 'tags', 'start_date', 'due_date', 'project_id',
+    'author_userid__id', 'author_userid__username', 'assigned_userid__id', 'assigned_userid__username',
+)
+
+
+class SearchBackend:
+    """
+    What SearchView and UserSearchView need from a search implementation.
+    Each method returns at most `limit` model instances, best first, each
+    carrying a `rank` attribute. Tasks and projects are limited to what the
+    AccessContext `access` allows.
+    """
+
+    def search_users(self, q, limit):
+        raise NotImplementedError
+
+    def search_tasks(self, q, access, limit):
+        raise NotImplementedError
+
+    def search_projects(self, q, access, limit):
+        raise NotImplementedError
+
+    def search_comments(self, q, access):
+        """
+        Accessible comments matching `q`, best first, unsliced for pagination.
+        Every backend uses the Postgres full-text index here, the ts_headline
+        snippets need it anyway.
+        """
+        matches = search.search_comments(q, project_ids=access.accessible_projects())
+        return search.ranked(matches, search.comment_rank(q)).annotate(
+            project_id=F('task_id__project_id'), headline=search.comment_headline(q)
+        ).select_related('user_id').only('id', 'task_id', 'user_id__id', 'user_id__username')
+
+    #model write hooks, called from signals once the transaction commits
+    def update(self, instance):
+        pass
+
+    def remove(self, model, pk):
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    pg_trgm word similarity and full-text matching, see junoapi.search. Hits
+    are loaded within search.word_similarity_threshold().
+    """
+
+    def search_users(self, q, limit):
+        with search.word_similarity_threshold():
+            return list(search.top_hits(search.search_users(q), search.user_rank(q), limit))
+
+    def search_tasks(self, q, access, limit):
+        matches = search.search_tasks(q, project_ids=access.accessible_projects())
+        with search.word_similarity_threshold():
+            return list(search.top_hits(matches, search.task_rank(q), limit).select_related(
+                'author_userid', 'assigned_userid'
+            ).only(*TASK_HIT_COLUMNS))
+
+    def search_projects(self, q, access, limit):
+        matches = search.search_projects(q, project_ids=access.accessible_projects())
+        with search.word_similarity_threshold():
+            return list(search.top_hits(matches, search.project_rank(q), limit))
+
+
+class _Snapshot(NamedTuple):
+    """
+    What InMemorySearchBackend searches. Never changed once published: writes
+    and rebuilds swap in a new snapshot, so readers take no lock.
+    """
+    #{model: {field: NgramIndex}} and {model: {pk: owner id}} as of the build, None before the first
+    indexes: dict = None
+    owners: dict = None
+    #{model: {pk: _Change}} written since the build
+    changes: dict = {}
+    built_at: float = None
+
+
+class _Change(NamedTuple):
+    at: float
+    #(trigrams per field in SOURCES order, owner id), None for a deleted row
+    document: tuple = None
+
+
+class InMemorySearchBackend(SearchBackend):
+    """
+    Per-process trigram indexes over usernames, task titles/descriptions and
+    project names/descriptions. Built from the database on first use, kept up
+    to date by this process's model signals and rebuilt every
+    SEARCH_MEMORY_INDEX_TTL seconds to pick up writes made by other processes.
+    Matching is trigram only (no stemming); only the final hits are loaded
+    from the database.
+
+    Searches read an immutable _Snapshot. Signal writes are kept beside the
+    indexes (matched row by row) rather than applied to them, and a stale
+    snapshot is rebuilt on a background thread while searches go on using
+    it; only the very first build is waited for.
+    """
+
+    #(model, fields with their weight, extra column kept per document)
+    SOURCES = {
+        User: ((('username', 1.0),), None),
+        Task: ((('title', 1.0), ('description', 0.9)), 'project_id'),
+        Project: ((('name', 1.0), ('description', 0.9)), None),
+    }
+
+    def __init__(self):
+        self._snapshot = _Snapshot()
+        #serializes writers swapping in a new snapshot
+        self._write_lock = threading.Lock()
+        #held by the one build in progress
+        self._build_lock = threading.Lock()
+
+    #----queries----
+    def search_users(self, q, limit):
+        return self._hits(User, q, limit, User.objects.all())
+
+    def search_tasks(self, q, access, limit):
+        project_ids = access.project_ids
+        queryset = Task.objects.select_related('author_userid', 'assigned_userid').only(*TASK_HIT_COLUMNS)
+        return self._hits(Task, q, limit, queryset, lambda doc_id, owner: owner in project_ids)
+
+    def search_projects(self, q, access, limit):
+        project_ids = access.project_ids
+        return self._hits(Project, q, limit, Project.objects.all(), lambda doc_id, owner: doc_id in project_ids)
+
+    def _hits(self, model, q, limit, queryset, allowed=None):
+        if not q:
+            return []
+        fields, _ = self.SOURCES[model]
+        threshold = settings.SEARCH_WORD_SIMILARITY_THRESHOLD
+        snapshot = self._current()
+        changes = snapshot.changes.get(model, {})
+        owners = snapshot.owners[model]
+        grams = trigrams(q)
+
+        scores = {}
+        for position, (name, weight) in enumerate(fields):
+            for doc_id, similarity in snapshot.indexes[model][name].similarities(q, threshold).items():
+                score = similarity * weight
+                if doc_id not in changes and score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+            #rows written since the build, matched the way NgramIndex.similarities() does
+            for doc_id, change in changes.items():
+                if change.document is None or not grams:
+                    continue
+                count = len(grams & change.document[0][position])
+                score = count / len(grams) * weight
+                if count >= threshold * len(grams) and score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+        if allowed is not None:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if allowed(doc_id, changes[doc_id].document[1] if doc_id in changes else owners.get(doc_id))
+            }
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        if not best:
+            return []
+        #rows deleted by another process since the last rebuild are simply skipped
+        instances = queryset.in_bulk([doc_id for doc_id, _ in best])
+        hits = []
+        for doc_id, score in best:
+            if doc_id in instances:
+                instances[doc_id].rank = score
+                hits.append(instances[doc_id])
+        return hits
+
+    #----maintenance----
+    def update(self, instance):
+        model = type(instance)
+        if model not in self.SOURCES:
+            return
+        fields, owner = self.SOURCES[model]
+        document = (
+            tuple(trigrams(getattr(instance, name) or '') for name, _ in fields),
+            getattr(instance, f'{owner}_id') if owner else None,
+        )
+        self._record(model, instance.pk, document)
+
+    def remove(self, model, pk):
+        if model in self.SOURCES:
+            self._record(model, pk, None)
+
+    def _record(self, model, pk, document):
+        with self._write_lock:
+            snapshot = self._snapshot
+            changes = {**snapshot.changes, model: {**snapshot.changes.get(model, {}), pk: _Change(time.monotonic(), document)}}
+            self._snapshot = snapshot._replace(changes=changes)
+        #every search matches the changes one by one, so many of them call for a rebuild
+        if sum(map(len, changes.values())) > settings.SEARCH_MEMORY_INDEX_MAX_CHANGES:
+            self._rebuild_in_background()
+
+    def reset(self):
+        with self._write_lock:
+            self._snapshot = _Snapshot()
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot.indexes is None:
+            #nothing to search yet, wait for the first build
+            with self._build_lock:
+                if self._snapshot.indexes is None:
+                    self.rebuild()
+            return self._snapshot
+        ttl = settings.SEARCH_MEMORY_INDEX_TTL
+        if ttl is not None and time.monotonic() - snapshot.built_at > ttl:
+            self._rebuild_in_background()
+        return snapshot
+
+    def _rebuild_in_background(self):
+        #at most one build at a time; a search that finds one running goes on with the current snapshot
+        if not self._build_lock.acquire(blocking=False):
+            return
+        def run():
+            try:
+                self.rebuild()
+            finally:
+                #this thread's own connection
+                connection.close()
+                self._build_lock.release()
+        threading.Thread(target=run, name='search-index-build', daemon=True).start()
+
+    def rebuild(self):
+        """Read the indexed tables into a new snapshot and swap it in."""
+        started = time.monotonic()
+        indexes, owners = {}, {}
+        for model, (fields, owner) in self.SOURCES.items():
+            names = [name for name, _ in fields]
+            columns = ['pk', *names] + ([f'{owner}_id'] if owner else [])
+            rows = list(model.objects.values_list(*columns).iterator(chunk_size=5000))
+            indexes[model] = {
+                name: NgramIndex.build((row[0], row[position]) for row in rows)
+                for position, name in enumerate(names, start=1)
+            }
+            owners[model] = {row[0]: row[-1] for row in rows} if owner else {}
+        with self._write_lock:
+            #writes recorded once the build began may have committed after it read their table
+            changes = {
+                model: {pk: change for pk, change in model_changes.items() if change.at >= started}
+                for model, model_changes in self._snapshot.changes.items()
+            }
+            self._snapshot = _Snapshot(indexes, owners, changes, started)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.SEARCH_BACKEND)()
+    return _backend
+
+def reset_search_backend():
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+#signal entry points - applied after commit so rolled back writes never reach an index
+def index_instance(instance):
+    transaction.on_commit(lambda: get_search_backend().update(instance))
+
+def unindex_instance(instance):
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: get_search_backend().remove(model, pk))
@@ -0,0 +1,157 @@
+# search_cache.py
+import hashlib
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from junoapi.search_fanout import CategoryTimeout
+
+GENERATION_PREFIX = 'search-gen'
+RESULT_PREFIX = 'search-result'
+LOCK_PREFIX = 'search-lock'
+METRIC_PREFIX = 'search-cache'
+METRICS = ('hits', 'misses', 'coalesced')
+
+#the models whose rows show up in each category's hits; a write to any of them
+#starts a new generation and retires the category's cached results
+CATEGORY_MODELS = {
+    'users': ('user',),
+    'tasks': ('task', 'user'),
+    'projects': ('project',),
+    'comments': ('comment', 'task', 'user'),
+}
+#categories whose hits depend on the projects the user can access
+SCOPED = {'tasks', 'projects', 'comments'}
+
+
+def _cache():
+    return caches[getattr(settings, 'SEARCH_CACHE_ALIAS', 'default')]
+
+def _generation_key(model):
+    return f"{GENERATION_PREFIX}:{model}"
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def normalize(q):
+    """Fold the differences search ignores anyway - case, Unicode forms and runs of whitespace."""
+    return ' '.join(unicodedata.normalize('NFKC', q).casefold().split())
+
+def scope(access):
+    #users who can see the same projects share cached results
+    return _digest(','.join(map(str, sorted(access.project_ids))))
+
+def _generations(models):
+    cache = _cache()
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = uuid.uuid4().hex
+            #add() so a concurrent bump is never overwritten
+            if not cache.add(key, generation, timeout=None):
+                generation = cache.get(key)
+            generations[key] = generation
+    return generations
+
+def result_keys(q, access, categories, limit):
+    """{category: cache key} for the current generations of the models each category reads."""
+    models = {model for category in categories for model in CATEGORY_MODELS[category]}
+    generations = _generations(sorted(models))
+    query = _digest(normalize(q))
+    access_scope = scope(access) if SCOPED & set(categories) else ''
+    keys = {}
+    for category in categories:
+        generation = ':'.join(generations[_generation_key(model)] for model in CATEGORY_MODELS[category])
+        category_scope = access_scope if category in SCOPED else ''
+        keys[category] = f"{RESULT_PREFIX}:{category}:{_digest(generation)}:{category_scope}:{limit}:{query}"
+    return keys
+
+def get_many(keys):
+    """{category: cached hits} for the keys found in the cache."""
+    cached = _cache().get_many(list(keys.values()))
+    found = {category: cached[key] for category, key in keys.items() if key in cached}
+    _count('hits', len(found))
+    return found
+
+def compute(key, fn, wait=None):
+    """
+    fn()'s result, cached under `key`. Concurrent misses on the same key are
+    single-flighted: one caller runs fn() while the others poll for its
+    result for up to `wait` seconds (the category's budget, at most
+    SEARCH_CACHE_LOCK_TIMEOUT) and then give up with CategoryTimeout rather
+    than run fn() as well.
+    """
+    cache = _cache()
+    lock_key = f"{LOCK_PREFIX}:{key}"
+    lock_timeout = settings.SEARCH_CACHE_LOCK_TIMEOUT
+    #an int, which django_redis stores as is, so _unlock can compare it in Redis
+    token = uuid.uuid4().int >> 65
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        deadline = time.monotonic() + (lock_timeout if wait is None else min(wait, lock_timeout))
+        while time.monotonic() < deadline:
+            time.sleep(settings.SEARCH_CACHE_POLL_INTERVAL)
+            result = cache.get(key)
+            if result is not None:
+                _count('coalesced')
+                return result
+        _count('misses')
+        raise CategoryTimeout(key)
+
+    _count('misses')
+    try:
+        result = fn()
+        cache.set(key, result, timeout=settings.SEARCH_CACHE_TTL)
+    finally:
+        _unlock(cache, lock_key, token)
+    return result
+
+_UNLOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+def _unlock(cache, lock_key, token):
+    #only our own lock - one that expired meanwhile may belong to another caller by now
+    client = getattr(cache, 'client', None)
+    if hasattr(client, 'get_client'):
+        client.get_client(write=True).eval(_UNLOCK_SCRIPT, 1, str(client.make_key(lock_key)), token)
+    elif cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+#Invalidation
+def bump(models):
+    """Start new generations for the models; results that read them are no longer served."""
+    _cache().set_many({_generation_key(model): uuid.uuid4().hex for model in set(models)}, timeout=None)
+
+def bump_on_commit(models):
+    #bump now for readers inside this transaction, and again after commit so a
+    #search racing the transaction cannot cache pre-commit hits under the new generation
+    models = set(models)
+    bump(models)
+    transaction.on_commit(lambda: bump(models))
+
+#Metrics - shared counters, so every worker reports the same totals
+def _count(metric, amount=1):
+    if not amount:
+        return
+    cache = _cache()
+    key = f"{METRIC_PREFIX}:{metric}"
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        #first count since the cache was flushed
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+def stats():
+    cache = _cache()
+    counts = cache.get_many([f"{METRIC_PREFIX}:{metric}" for metric in METRICS])
+    result = {metric: counts.get(f"{METRIC_PREFIX}:{metric}", 0) for metric in METRICS}
+    lookups = sum(result.values())
+    result['hit_rate'] = (result['hits'] + result['coalesced']) / lookups if lookups else None
+    return result
+
+def reset_stats():
+    _cache().delete_many([f"{METRIC_PREFIX}:{metric}" for metric in METRICS])
@@ -0,0 +1,187 @@
+# search_fanout.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, close_old_connections, connection, connections, transaction
+
+QUERY_CANCELED = '57014'
+
+
+class CategoryTimeout(Exception):
+    """A category's query was cancelled by its statement_timeout."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+#pool threads taken by categories that have not finished, see _reserve()
+_busy = 0
+#the pool threads' own connections, for shutdown()
+_pool_connections = set()
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.SEARCH_WORKERS, thread_name_prefix='search')
+    return _executor
+
+def shutdown():
+    """Stop the pool and close its threads' connections, e.g. before the test database is dropped."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    while _pool_connections:
+        wrapper = _pool_connections.pop()
+        #the thread that opened it has exited
+        wrapper.inc_thread_sharing()
+        try:
+            wrapper.close()
+        finally:
+            wrapper.dec_thread_sharing()
+
+def _reserve(count, force=False):
+    #a request only fans out when a thread is free for each of its categories, so no
+    #category waits in the pool's queue behind another request's
+    global _busy
+    with _executor_lock:
+        if _busy + count > settings.SEARCH_WORKERS and not force:
+            return False
+        _busy += count
+        return True
+
+def _release(future):
+    global _busy
+    with _executor_lock:
+        _busy -= 1
+
+
+class _Started(threading.Event):
+    """Set by the pool thread as a category starts; its budget runs from then."""
+
+    def mark(self):
+        self.at = time.monotonic()
+        self.set()
+
+
+def run_categories(jobs):
+    """
+    Run {category: callable} side by side and return ({category: result},
+    [categories that ran out of time]). Each category gets its own
+    SEARCH_TIMEOUTS budget; one that overruns comes back as [] instead of
+    holding up the others. When the pool has no free thread for every
+    category, they run one after another on the calling thread instead.
+    """
+    if len(jobs) < 2 or connection.in_atomic_block or not _reserve(len(jobs)):
+        #nothing to overlap, writes in this transaction that pool connections couldn't see, or a busy pool
+        return run_serially(jobs)
+    return wait_categories(jobs, reserved=True)
+
+def run_serially(jobs):
+    results, timed_out = {}, []
+    for category, fn in jobs.items():
+        try:
+            with local_budget(category):
+                results[category] = fn()
+        except CategoryTimeout:
+            results[category] = []
+            timed_out.append(category)
+    return results, timed_out
+
+def wait_categories(jobs, reserved=False):
+    if not reserved:
+        _reserve(len(jobs), force=True)
+    executor = get_executor()
+    started = {category: _Started() for category in jobs}
+    futures = {}
+    for category, fn in jobs.items():
+        futures[category] = executor.submit(_in_worker, category, fn, started[category])
+        futures[category].add_done_callback(_release)
+
+    results, timed_out = {}, []
+    for category, future in futures.items():
+        budget = settings.SEARCH_TIMEOUTS.get(category)
+        try:
+            if budget is None:
+                results[category] = future.result()
+                continue
+            #the thread was reserved, so the category starts right away
+            started[category].wait()
+            results[category] = future.result(timeout=max(0, started[category].at + budget - time.monotonic()))
+        except (TimeoutError, CategoryTimeout):
+            results[category] = []
+            timed_out.append(category)
+    return results, timed_out
+
+
+def _in_worker(category, fn, started=None):
+    if started is not None:
+        started.mark()
+    #pool threads keep their connections between searches; this only replaces
+    #one past CONN_MAX_AGE or broken by an earlier error
+    close_old_connections()
+    _pool_connections.add(connections[DEFAULT_DB_ALIAS])
+    try:
+        statement_timeout(settings.SEARCH_TIMEOUTS.get(category))
+        return fn()
+    except OperationalError as exc:
+        if _canceled(exc):
+            raise CategoryTimeout(category) from exc
+        raise
+
+def _canceled(exc):
+    #pgcode with psycopg2, sqlstate with psycopg 3
+    cause = exc.__cause__
+    return QUERY_CANCELED in (getattr(cause, 'pgcode', None), getattr(cause, 'sqlstate', None))
+
+def statement_timeout(seconds):
+    """
+    Have Postgres cancel this connection's queries after `seconds`, so a timed
+    out category stops using the database. Pool connections only run searches,
+    so the setting stays on the session and is only sent when it changes.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    value = '0' if seconds is None else f'{int(seconds * 1000)}ms'
+    connection.ensure_connection()
+    if getattr(connection, '_search_statement_timeout', None) == (connection.connection, value):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('statement_timeout', %s, false)", [value])
+    connection._search_statement_timeout = (connection.connection, value)
+
+
+@contextmanager
+def local_budget(category):
+    """
+    Cancel the calling thread's queries in this block after the category's
+    SEARCH_TIMEOUTS budget, raising CategoryTimeout. For searches on request
+    connections: the timeout is SET LOCAL in a transaction of its own (a
+    savepoint inside an open one, where the previous value is put back), so
+    it never outlives the block.
+    """
+    seconds = settings.SEARCH_TIMEOUTS.get(category)
+    if seconds is None or connection.vendor != 'postgresql':
+        yield
+        return
+    nested = connection.in_atomic_block
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if nested:
+                    cursor.execute("SELECT current_setting('statement_timeout')")
+                    previous = cursor.fetchone()[0]
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [f'{int(seconds * 1000)}ms'])
+            yield
+            if nested:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+    except OperationalError as exc:
+        if _canceled(exc):
+            raise CategoryTimeout(category) from exc
+        raise
@@ -1,26 +1,83 @@
-from .models import Task
-from .serializers import Team
-
-#Task selector
-def get_tasks(*, project_id=None):
-    queryset = Task.objects.select_related(
-        'author_userid',
-        'assigned_userid'
-    ).prefetch_related(
-        'comment',
-        'attachment'
-    )
+from django.db import connection
+from django.db.models import Prefetch
+
+from .models import Attachment, Comment, Task, TaskTombstone, TaskTombstoneHorizon
+from .serializers import Team, UserSerializer
+
+TASK_USER_RELATIONS = {'author': 'author_userid', 'assigned': 'assigned_userid'}
+TASK_PREFETCHES = {
+    'comment': Prefetch('comment', queryset=Comment.objects.select_related('user_id').defer('search_vector').order_by('id')),
+    'attachment': Prefetch('attachment', queryset=Attachment.objects.order_by('id')),
+}
+
+#Task selector - `fields` is a sparse fieldset from TaskSerializer.requested_fields()
+def get_tasks(*, project_id=None, assigned_userid=None, fields=None):
+    if fields is None:
+        queryset = Task.objects.select_related(
+            *TASK_USER_RELATIONS.values()
+        ).prefetch_related(
+            *TASK_PREFETCHES.values()
+        ).defer('search_vector')
+    else:
+        relations = [TASK_USER_RELATIONS[name] for name in TASK_USER_RELATIONS if name in fields]
+        prefetches = [TASK_PREFETCHES[name] for name in TASK_PREFETCHES if name in fields]
+
+        columns = {name for name in fields if name not in TASK_USER_RELATIONS and name not in TASK_PREFETCHES}
+        for relation in relations:
+            columns.update(f"{relation}__{field}" for field in UserSerializer.Meta.fields)
+
+        queryset = Task.objects.select_related(*relations).prefetch_related(*prefetches).only(*columns)
 
     if project_id:
         queryset= queryset.filter(project_id=project_id)
-    
+    if assigned_userid:
+        queryset = queryset.filter(assigned_userid=assigned_userid)
+
     return queryset
 
-#Team selector -- will add the teams by id functionality later (only shows teams in which the user is in)
-def get_teams(self):
+#Delta sync selector - change_seq and tombstones are maintained by triggers (migration 0022)
+def get_task_changes(*, project_id, since, fields=None):
+    """
+    (seq, tasks, deleted ids, reset) for a project's tasks written at or after
+    `since`, where `seq` is what the client sends as `since` next time. It is
+    the oldest transaction still running when the sync started, so a write
+    that commits afterwards is picked up by the next sync even if its
+    change_seq is lower than rows already returned; tasks near the boundary
+    may come twice.
+    since=0 is a full load without tombstones. So is a `since` old enough that
+    tombstones it needs have been pruned, with reset=True: the client must
+    replace its list rather than merge into it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+        seq = cursor.fetchone()[0]
+
+    deleted = []
+    if since:
+        #a task that left and came back is sent as a change, not a deletion
+        deleted = list(
+            TaskTombstone.objects.filter(project_id=project_id, change_seq__gte=since)
+            .exclude(task_id__in=Task.objects.filter(project_id=project_id).values('id'))
+            .order_by('task_id').values_list('task_id', flat=True).distinct()
+        )
+    #read after the tombstones, so a prune running in between is seen
+    reset = bool(since) and TaskTombstoneHorizon.objects.filter(project_id=project_id, change_seq__gte=since).exists()
+    if reset:
+        since, deleted = 0, []
+
+    tasks = get_tasks(project_id=project_id, fields=fields).filter(change_seq__gte=since).order_by('id')
+    return seq, tasks, deleted, reset
+
+#Team selector
+def get_teams(*, team_ids=None):
     queryset = Team.objects.select_related(
         'productowner_userid',
         'projectmanager_userid'
+    ).prefetch_related(
+        'members'
     )
-    
-    return queryset
\ No newline at end of file
+
+    if team_ids is not None:
+        queryset = queryset.filter(id__in=team_ids)
+
+    return queryset
@@ -1,5 +1,7 @@
+from django.utils.html import escape
 from rest_framework import serializers
 from .models import User, Team, Task, TaskAssignment, Project, ProjectTeam, Attachment, Comment
+from .search import HIGHLIGHT_START, HIGHLIGHT_STOP
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -62,6 +64,9 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id','text','task_id','user_id','username']
         read_only_fields = ['task_id','user_id']
 
+def split_param(value):
+    return {item.strip() for item in value.split(',') if item.strip()} if value else set()
+
 #----Task serializers----
 class TaskSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True, source='author_userid')
@@ -69,13 +74,102 @@ class TaskSerializer(serializers.ModelSerializer):
     comment = CommentSerializer(many=True, read_only=True)
     attachment = AttachmentSerializer(many=True, read_only=True)
 
+    #nested relations, only returned with ?expand= once a sparse fieldset is requested
+    expandable_fields = ('author', 'assigned', 'comment', 'attachment')
+
     class Meta:
         model = Task
         fields = ['id', 'title','description', 'status', 'priority', 'tags', 'start_date',
-                'due_date', 'points', 'project_id', 'author_userid','assigned_userid',
+                'due_date', 'points', 'project_id', 'author_userid','assigned_userid', 'updated_at',
                 'author', 'assigned','comment', 'attachment']
-        
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = self.requested_fields(request.query_params)
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, params):
+        """
+        Field names selected by ?fields= and ?expand=, or None for the full
+        representation. `expand` alone keeps every flat field.
+        """
+        fields = split_param(params.get('fields'))
+        expand = split_param(params.get('expand'))
+        if not fields and not expand:
+            return None
+
+        unknown = (fields - set(cls.Meta.fields)) | (expand - set(cls.expandable_fields))
+        if unknown:
+            raise serializers.ValidationError({"error": f"Unknown field(s): {', '.join(sorted(unknown))}"})
+
+        if fields:
+            return fields | expand
+        return (set(cls.Meta.fields) - set(cls.expandable_fields)) | expand
+
 class TaskStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        fields = ['status']
\ No newline at end of file
+        fields = ['status']
+
+class TaskBulkChangeSerializer(serializers.Serializer):
+    #one item of PATCH api/tasks/bulk/ - the task id plus the fields to change
+    id = serializers.IntegerField()
+    status = serializers.CharField(max_length=25, required=False)
+    priority = serializers.CharField(max_length=25, required=False)
+    assigned_userid = serializers.IntegerField(required=False, allow_null=True)
+    points = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if len(attrs) == 1:
+            raise serializers.ValidationError("No changes given")
+        return attrs
+#----Search hit serializers - the fields the result cards show, plus the rank----
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+class UserSearchHitSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'profilepicture_id', 'rank']
+
+class TaskSearchHitSerializer(serializers.ModelSerializer):
+    author = UserSummarySerializer(read_only=True, source='author_userid')
+    assigned = UserSummarySerializer(read_only=True, source='assigned_userid')
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'description', 'status', 'priority', 'tags', 'start_date',
+                'due_date', 'project_id', 'author', 'assigned', 'rank']
+
+class ProjectSearchHitSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'description', 'start_date', 'due_date', 'rank']
+
+class CommentSearchHitSerializer(serializers.ModelSerializer):
+    author = UserSummarySerializer(read_only=True, source='user_id')
+    project_id = serializers.IntegerField(read_only=True)
+    headline = serializers.SerializerMethodField()
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'task_id', 'project_id', 'author', 'headline', 'rank']
+
+    def get_headline(self, comment):
+        #the comment text is escaped, only the match highlights are markup
+        return escape(comment.headline).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
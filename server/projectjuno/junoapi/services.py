@@ -0,0 +1,88 @@
+from django.db import connection, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+from . import project_stats, realtime, search_cache
+from .models import Task, User
+
+#fields PATCH api/tasks/bulk/ may change, in column order
+BULK_TASK_FIELDS = ('status', 'priority', 'points', 'assigned_userid')
+
+
+def bulk_update_tasks(access, changes, batch_size=500):
+    """
+    Apply validated TaskBulkChangeSerializer items in one transaction.
+    The tasks are loaded and permission checked in a single query and written
+    with one bulk_update per batch, restricted to the fields that changed.
+    Returns a result per item, in request order.
+    """
+    fields = [name for name in BULK_TASK_FIELDS if any(name in change for change in changes)]
+
+    assignees = {change['assigned_userid'] for change in changes if change.get('assigned_userid') is not None}
+    known_users = set(User.objects.filter(id__in=assignees).values_list('id', flat=True)) if assignees else set()
+
+    results = []
+    updated = []
+    with transaction.atomic():
+        queryset = Task.objects.filter(id__in={change['id'] for change in changes})
+        if not access.is_admin:
+            queryset = queryset.annotate(allowed=ExpressionWrapper(
+                Q(project_id__in=access.accessible_projects()), output_field=BooleanField()
+            ))
+        tasks = {task.id: task for task in queryset.select_for_update(of=('self',)).only('id', 'project_id', *fields)}
+
+        seen = set()
+        for change in changes:
+            task_id = change['id']
+            task = tasks.get(task_id)
+            if task_id in seen:
+                results.append({'id': task_id, 'error': "Duplicate task id"})
+                continue
+            seen.add(task_id)
+
+            if task is None:
+                results.append({'id': task_id, 'error': "Task not found"})
+            elif not getattr(task, 'allowed', True):
+                results.append({'id': task_id, 'error': "You do not have permission to edit this task"})
+            elif change.get('assigned_userid') is not None and change['assigned_userid'] not in known_users:
+                results.append({'id': task_id, 'error': "Assigned user not found"})
+            else:
+                changed = [name for name in fields if name in change]
+                before = realtime.task_snapshot(task, fields=('project_id', *changed))
+                for name in changed:
+                    setattr(task, Task._meta.get_field(name).attname, change[name])
+                updated.append((task, before))
+                results.append({'id': task_id, 'updated': changed})
+
+        if updated:
+            Task.objects.bulk_update([task for task, _ in updated], fields, batch_size=batch_size)
+            #bulk_update sends no post_save
+            project_stats.bump_on_commit(task.project_id_id for task, _ in updated)
+            search_cache.bump_on_commit(['task'])
+            realtime.task_changes([(before, task) for task, before in updated])
+
+    return results
+
+
+def prune_task_tombstones(before, batch_size=5000):
+    """
+    Delete up to `batch_size` tombstones written before the datetime `before`,
+    returning how many went. Each project's TaskTombstoneHorizon is raised to
+    the newest change_seq pruned in the same statement, so ?since= syncs that
+    could have needed them are told to reload (see get_task_changes).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            WITH pruned AS (
+                DELETE FROM task_tombstone WHERE id IN (
+                    SELECT id FROM task_tombstone WHERE deleted_at < %s ORDER BY deleted_at LIMIT %s
+                )
+                RETURNING project_id, change_seq
+            ), horizons AS (
+                INSERT INTO task_tombstone_horizon (project_id, change_seq)
+                SELECT project_id, max(change_seq) FROM pruned GROUP BY project_id
+                ON CONFLICT (project_id) DO UPDATE
+                SET change_seq = GREATEST(task_tombstone_horizon.change_seq, EXCLUDED.change_seq)
+            )
+            SELECT count(*) FROM pruned
+        ''', [before, batch_size])
+        return cursor.fetchone()[0]
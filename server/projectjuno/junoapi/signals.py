@@ -0,0 +1,129 @@
+# signals.py
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from junoapi.models import Comment, User, Project, ProjectTeam, Task, Team
+from junoapi import user_cache, project_access, project_stats, search_backends, search_cache, task_fragments, username_index
+
+#User cache invalidation
+@receiver(post_init, sender=User)
+def remember_cognito_id(sender, instance, **kwargs):
+    #the cognito_id the user was loaded with (unless deferred), so a change also drops the old entry
+    instance._saved_cognito_id = instance.__dict__.get('cognito_id')
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate_on_commit(*{instance.cognito_id, instance._saved_cognito_id})
+    instance._saved_cognito_id = instance.cognito_id
+
+@receiver(post_save, sender=User)
+def index_username(sender, instance, **kwargs):
+    username_index.index_user(instance)
+
+@receiver(post_delete, sender=User)
+def unindex_username(sender, instance, **kwargs):
+    username_index.unindex_user(instance)
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_group_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        user_cache.invalidate_on_commit(instance.cognito_id)
+    elif action == 'pre_clear':
+        user_cache.invalidate_user_ids(list(instance.user_set.values_list('id', flat=True)))
+    else:
+        user_cache.invalidate_user_ids(pk_set)
+
+@receiver(pre_delete, sender=Group)
+def invalidate_deleted_group_members(sender, instance, **kwargs):
+    user_cache.invalidate_user_ids(list(instance.user_set.values_list('id', flat=True)))
+
+#user_project_access maintenance
+@receiver(post_save, sender=Project)
+def sync_project_owner_access(sender, instance, **kwargs):
+    project_access.sync_projects([instance.id])
+
+@receiver(post_save, sender=Team)
+def sync_team_role_access(sender, instance, created, **kwargs):
+    if not created:
+        project_access.sync_teams([instance.id])
+
+@receiver(post_save, sender=ProjectTeam)
+def sync_linked_project_access(sender, instance, **kwargs):
+    project_access.sync_projects([instance.project_id_id])
+
+@receiver(post_delete, sender=ProjectTeam)
+def prune_unlinked_project_access(sender, instance, **kwargs):
+    project_access.sync_projects([instance.project_id_id], prune_only=True)
+
+@receiver(m2m_changed, sender=Team.members.through)
+def sync_team_member_access(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        instance._cleared_team_ids = list(instance.team_members.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        team_ids = [instance.id]
+    elif action == 'post_clear':
+        team_ids = getattr(instance, '_cleared_team_ids', [])
+    else:
+        team_ids = pk_set
+    project_access.sync_teams(team_ids, prune_only=action != 'post_add')
+
+
+#project stats generations
+@receiver(post_save, sender=Project)
+def start_project_stats(sender, instance, created, **kwargs):
+    if created:
+        project_stats.bump([instance.id])
+
+@receiver(post_init, sender=Task)
+def remember_task_project(sender, instance, **kwargs):
+    #the project the task was loaded with (unless deferred), so a move also bumps the one it left
+    instance._saved_project_id = instance.__dict__.get('project_id_id')
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_project_stats(sender, instance, **kwargs):
+    project_stats.bump_on_commit({instance.project_id_id, instance._saved_project_id} - {None})
+    instance._saved_project_id = instance.project_id_id
+
+#search backend indexes
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+def index_searchable(sender, instance, **kwargs):
+    search_backends.index_instance(instance)
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+def unindex_searchable(sender, instance, **kwargs):
+    search_backends.unindex_instance(instance)
+
+#search result cache generations
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Comment)
+def bump_search_cache(sender, instance, **kwargs):
+    search_cache.bump_on_commit([sender._meta.model_name])
+
+#task fragment cache - task, comment and attachment writes move change_seq themselves
+@receiver(post_save, sender=User)
+def bump_task_fragment_users(sender, instance, created, update_fields=None, **kwargs):
+    if not created and task_fragments.user_changed(update_fields):
+        task_fragments.bump_users_on_commit()
+
+@receiver(post_delete, sender=User)
+def bump_task_fragment_deleted_user(sender, instance, **kwargs):
+    task_fragments.bump_users_on_commit()
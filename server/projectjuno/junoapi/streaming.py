@@ -0,0 +1,82 @@
+# streaming.py
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingListMixin:
+    """
+    Opt-in: ?stream=true on a list view sends the unpaginated JSON array while
+    it is produced. A request the view's paginator pages is served as usual.
+    The queryset is walked with .iterator(chunk_size) - its
+    prefetches run per chunk - and each chunk is serialized, rendered and sent
+    before the next is read, so a worker holds one chunk whatever the list
+    size. The bytes are the same as the buffered response.
+    """
+    stream_chunk_size = None
+
+    def list(self, request, *args, **kwargs):
+        if not self.streams(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_response(self.stream_chunks(queryset), request)
+
+    def streams(self, request):
+        #the browsable API renders the whole page anyway
+        return (
+            request.query_params.get('stream') in ('1', 'true')
+            and isinstance(request.accepted_renderer, JSONRenderer)
+            and not self.paginates(request)
+        )
+
+    def paginates(self, request):
+        #opt-in paginators say whether they page this request, the others always do
+        paginator = self.paginator
+        if paginator is None:
+            return False
+        paginates = getattr(paginator, 'paginates', None)
+        return paginates(request) if paginates else True
+
+    def get_stream_chunk_size(self):
+        return self.stream_chunk_size or settings.LIST_STREAM_CHUNK_SIZE
+
+    def stream_chunks(self, queryset):
+        return serialized_chunks(
+            queryset, self.get_serializer_class(), self.get_stream_chunk_size(),
+            self.get_serializer_context(), self.request.accepted_renderer
+        )
+
+
+def serialized_chunks(queryset, serializer_class, chunk_size, context=None, renderer=None):
+    """The queryset as rendered JSON arrays of up to chunk_size items each."""
+    renderer = renderer or JSONRenderer()
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield renderer.render(serializer_class(chunk, many=True, context=context or {}).data)
+
+def json_array(chunks):
+    """Join rendered JSON arrays into one array, yielded piece by piece."""
+    yield b'['
+    separator = b''
+    for chunk in chunks:
+        if chunk != b'[]':
+            yield separator + chunk[1:-1]
+            separator = b','
+    yield b']'
+
+def streaming_response(chunks, request):
+    body = json_array(chunks)
+    if isinstance(request._request, ASGIRequest):
+        #Django buffers a synchronous iterator in full before serving it over ASGI
+        body = _iterate_async(body)
+    return StreamingHttpResponse(body, content_type=JSONRenderer.media_type)
+
+async def _iterate_async(iterator):
+    #thread sensitive: the chunks read from the request thread's database connection
+    next_piece = sync_to_async(next, thread_sensitive=True)
+    while (piece := await next_piece(iterator, None)) is not None:
+        yield piece
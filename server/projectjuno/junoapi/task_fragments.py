@@ -0,0 +1,122 @@
+# task_fragments.py
+"""
+TaskSerializer output cached per task, so a list only serializes the tasks
+that changed since it was last read.
+
+A fragment is keyed by the task's id and change_seq - the id of the last
+transaction that wrote the task, its comments or its attachments, kept by
+the triggers of migration 0022 - so any of those writes moves the task to a
+new key and old fragments are simply never read again (they expire after
+TASK_FRAGMENT_TTL). Fragments also embed user fields (author, assigned,
+comment usernames); an edit to those starts a new users generation, which
+is part of every key.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from junoapi.serializers import TaskSerializer, UserSerializer
+
+FRAGMENT_PREFIX = 'task-fragment'
+USERS_GENERATION_KEY = 'task-fragment-users-gen'
+METRIC_PREFIX = 'task-fragment-cache'
+METRICS = ('hits', 'misses')
+
+#the user fields copied into fragments - see TaskSerializer and CommentSerializer
+USER_FIELDS = set(UserSerializer.Meta.fields)
+
+
+def _cache():
+    return caches[getattr(settings, 'TASK_FRAGMENT_CACHE_ALIAS', 'default')]
+
+def _key(users_generation, task_id, change_seq):
+    return f"{FRAGMENT_PREFIX}:{users_generation}:{task_id}:{change_seq}"
+
+def enabled():
+    #change_seq is only maintained on PostgreSQL
+    return getattr(settings, 'TASK_FRAGMENT_CACHE', False) and connection.vendor == 'postgresql'
+
+def versions(queryset):
+    """
+    The tasks of a TaskSerializer queryset with only id, change_seq and the
+    columns it is ordered by (which cursor pagination reads) loaded.
+    """
+    ordering = [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+    return queryset.select_related(None).prefetch_related(None).only('id', 'change_seq', *ordering)
+
+def serialize(tasks, queryset, context=None):
+    """
+    TaskSerializer(many=True).data for `tasks` from versions(): cached
+    fragments where there are any, the rest read through `queryset` with its
+    prefetches, serialized and cached. A task deleted in between is left out.
+    """
+    cache = _cache()
+    users_generation = _users_generation()
+    keys = {task.id: _key(users_generation, task.id, task.change_seq) for task in tasks}
+    cached = cache.get_many(list(keys.values()))
+    fragments = {task_id: cached[key] for task_id, key in keys.items() if key in cached}
+
+    missing = [task_id for task_id in keys if task_id not in fragments]
+    if missing:
+        rows = list(queryset.filter(id__in=missing).order_by())
+        data = TaskSerializer(rows, many=True, context=context or {}).data
+        #under the version that was serialized, which may be newer than the one in `tasks`
+        cache.set_many(
+            {_key(users_generation, row.id, row.change_seq): fragment for row, fragment in zip(rows, data)},
+            timeout=settings.TASK_FRAGMENT_TTL
+        )
+        fragments.update((row.id, fragment) for row, fragment in zip(rows, data))
+
+    _count('hits', len(keys) - len(missing))
+    _count('misses', len(missing))
+    return [fragments[task.id] for task in tasks if task.id in fragments]
+
+#Invalidation - task, comment and attachment writes need none, they change change_seq
+def _users_generation():
+    cache = _cache()
+    generation = cache.get(USERS_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        #add() so a concurrent bump is never overwritten
+        if not cache.add(USERS_GENERATION_KEY, generation, timeout=None):
+            generation = cache.get(USERS_GENERATION_KEY)
+    return generation
+
+def bump_users():
+    _cache().set(USERS_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+def bump_users_on_commit():
+    #bump now for readers inside this transaction, and again after commit so a
+    #list racing the transaction cannot cache the old user fields under the new generation
+    bump_users()
+    transaction.on_commit(bump_users)
+
+def user_changed(update_fields=None):
+    """Whether a User save can change what fragments show."""
+    return update_fields is None or bool(USER_FIELDS & set(update_fields))
+
+#Metrics - shared counters, so every worker reports the same totals
+def _count(metric, amount=1):
+    if not amount:
+        return
+    cache = _cache()
+    key = f"{METRIC_PREFIX}:{metric}"
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        #first count since the cache was flushed
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+def stats():
+    cache = _cache()
+    counts = cache.get_many([f"{METRIC_PREFIX}:{metric}" for metric in METRICS])
+    result = {metric: counts.get(f"{METRIC_PREFIX}:{metric}", 0) for metric in METRICS}
+    lookups = sum(result.values())
+    result['hit_rate'] = result['hits'] / lookups if lookups else None
+    return result
+
+def reset_stats():
+    _cache().delete_many([f"{METRIC_PREFIX}:{metric}" for metric in METRICS])
@@ -1,9 +1,11 @@
 from django.urls import path
-from junoapi.views.ProjectViews import ProjectView, ProjectDetailView, GetUserOwnedProjects, DeleteProject
+from junoapi.views.ProjectViews import ProjectView, ProjectDetailView, GetUserOwnedProjects, DeleteProject, ProjectStatsView, MultiProjectStatsView
 
 urlpatterns = [
     path('', ProjectView.as_view(), name="project-list"),
     path('<int:pk>', ProjectDetailView.as_view(), name="project-detail"),
     path('user/',GetUserOwnedProjects.as_view(), name='user-projects'),
     path('<int:pk>/delete', DeleteProject.as_view(), name='delete-project'),
+    path('<int:pk>/stats', ProjectStatsView.as_view(), name='project-stats'),
+    path('stats', MultiProjectStatsView.as_view(), name='multi-project-stats'),
 ]
\ No newline at end of file
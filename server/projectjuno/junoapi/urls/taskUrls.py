@@ -1,11 +1,14 @@
 from django.urls import path
-from junoapi.views.TaskViews import TaskView, UpdateTaskStatus, GetUserTasksView, UpdateTaskView, DeleteTaskView
-from junoapi.views.SearchView import SearchView
+from junoapi.views.TaskViews import TaskView, UpdateTaskStatus, GetUserTasksView, UpdateTaskView, DeleteTaskView, BulkUpdateTasksView
+from junoapi.views.SearchView import SearchView, CommentSearchView, SearchCacheStatsView
 
 urlpatterns = [
     path('search/', SearchView.as_view()),
+    path('search/comments/', CommentSearchView.as_view(), name='search-comments'),
+    path('search/cache-stats/', SearchCacheStatsView.as_view(), name='search-cache-stats'),
     #Task URLS
     path('tasks/', TaskView.as_view(), name='create-list-tasks'),
+    path('tasks/bulk/', BulkUpdateTasksView.as_view(), name='bulk-update-tasks'),
     path('tasks/<int:pk>/', UpdateTaskView.as_view(), name='update-task'),
     path('tasks/<int:pk>/status/', UpdateTaskStatus.as_view(), name='update-task-status'),
     path('tasks/user/<int:pk>', GetUserTasksView.as_view(), name='get-user-tasks'),
@@ -1,9 +1,10 @@
 from django.urls import path
 
-from junoapi.views.UserViews import GetUserView, CreateUserView, GetUserById
+from junoapi.views.UserViews import GetUserView, CreateUserView, GetUserById, UserSuggestView
 
 urlpatterns = [
     path('', GetUserView.as_view()),
     path('create-user', CreateUserView.as_view()),
+    path('suggest/', UserSuggestView.as_view(), name='user-suggest'),
     path('<str:user_sub>', GetUserById.as_view())
 ]
\ No newline at end of file
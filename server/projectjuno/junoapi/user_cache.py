@@ -0,0 +1,106 @@
+# user_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from junoapi.models import User
+
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'cognito_id',
+    'profilepicture_id', 'is_active', 'is_staff', 'is_superuser',
+)
+
+KEY_PREFIX = 'user-snapshot'
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+def _shared_cache():
+    return caches[_setting('USER_CACHE_ALIAS', 'default')]
+
+def _key(cognito_id):
+    return f"{KEY_PREFIX}:{cognito_id}"
+
+def _load_snapshot(cognito_id):
+    row = User.objects.filter(cognito_id=cognito_id).values(*SNAPSHOT_FIELDS).first()
+    if row is None:
+        return None
+    row['group_names'] = sorted(
+        User.groups.through.objects.filter(user_id=row['id']).values_list('group__name', flat=True)
+    )
+    return row
+
+def _from_snapshot(snapshot):
+    #fields missing from the snapshot (password, last_login...) stay deferred,
+    #so they load on access and save() only writes the fields we hold
+    field_names = [f.attname for f in User._meta.concrete_fields if f.attname in SNAPSHOT_FIELDS]
+    user = User.from_db(DEFAULT_DB_ALIAS, field_names, [snapshot[f] for f in field_names])
+    user._group_names = frozenset(snapshot['group_names'])
+    return user
+
+def _local_get(cognito_id):
+    with _local_lock:
+        entry = _local.get(cognito_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            del _local[cognito_id]
+            return None
+        _local.move_to_end(cognito_id)
+        return snapshot
+
+def _local_set(cognito_id, snapshot):
+    with _local_lock:
+        _local[cognito_id] = (time.monotonic() + _setting('USER_CACHE_LOCAL_TTL', 30), snapshot)
+        _local.move_to_end(cognito_id)
+        while len(_local) > _setting('USER_CACHE_LOCAL_SIZE', 10000):
+            _local.popitem(last=False)
+
+def get_user_by_cognito_id(cognito_id):
+    """
+    Resolve a Cognito `sub` to a User through a per-process LRU and the shared
+    Redis cache before falling back to the database. Returns None if no user
+    has that cognito_id.
+    """
+    snapshot = _local_get(cognito_id)
+    if snapshot is None:
+        snapshot = _shared_cache().get(_key(cognito_id))
+        if snapshot is None:
+            snapshot = _load_snapshot(cognito_id)
+            if snapshot is None:
+                return None
+            _shared_cache().set(_key(cognito_id), snapshot, timeout=_setting('USER_CACHE_TTL', 300))
+        _local_set(cognito_id, snapshot)
+    return _from_snapshot(snapshot)
+
+def invalidate(*cognito_ids):
+    cognito_ids = [c for c in cognito_ids if c]
+    if not cognito_ids:
+        return
+    with _local_lock:
+        for cognito_id in cognito_ids:
+            _local.pop(cognito_id, None)
+    _shared_cache().delete_many([_key(c) for c in cognito_ids])
+
+def invalidate_on_commit(*cognito_ids):
+    #now for readers inside this transaction, and again after commit so a lookup
+    #racing the transaction cannot cache the old row for USER_CACHE_TTL
+    invalidate(*cognito_ids)
+    transaction.on_commit(lambda: invalidate(*cognito_ids))
+
+def invalidate_user_ids(user_ids):
+    if user_ids:
+        invalidate_on_commit(*User.objects.filter(id__in=user_ids).values_list('cognito_id', flat=True))
+
+def clear_local():
+    with _local_lock:
+        _local.clear()
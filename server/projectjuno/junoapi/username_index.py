@@ -0,0 +1,181 @@
+# username_index.py
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from junoapi.models import User
+from junoapi.ngram_index import NgramIndex
+
+
+class UsernameIndex:
+    """
+    Lower-cased usernames in one sorted list (with the user ids alongside) for
+    prefix lookups by bisection, plus a trigram index for fuzzy fallback.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._ids = []
+        self._names = {}
+        self._fuzzy = NgramIndex()
+
+    @classmethod
+    def build(cls, rows):
+        index = cls()
+        rows = sorted(((username.lower(), user_id, username) for user_id, username in rows))
+        index._keys = [key for key, _, _ in rows]
+        index._ids = [user_id for _, user_id, _ in rows]
+        index._names = {user_id: username for _, user_id, username in rows}
+        index._fuzzy = NgramIndex.build((user_id, username) for _, user_id, username in rows)
+        return index
+
+    def __len__(self):
+        return len(self._keys)
+
+    def copy(self):
+        index = UsernameIndex()
+        index._keys = list(self._keys)
+        index._ids = list(self._ids)
+        index._names = dict(self._names)
+        index._fuzzy = self._fuzzy.copy()
+        return index
+
+    def add(self, user_id, username):
+        self.remove(user_id)
+        key = username.lower()
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position] == key and self._ids[position] < user_id:
+            position += 1
+        self._keys.insert(position, key)
+        self._ids.insert(position, user_id)
+        self._names[user_id] = username
+        self._fuzzy.add(user_id, username)
+
+    def remove(self, user_id):
+        username = self._names.pop(user_id, None)
+        if username is None:
+            return
+        position = bisect_left(self._keys, username.lower())
+        while self._ids[position] != user_id:
+            position += 1
+        del self._keys[position]
+        del self._ids[position]
+        self._fuzzy.remove(user_id)
+
+    def suggest(self, q, limit, boost_ids=frozenset()):
+        """
+        Up to `limit` (user_id, username) pairs: usernames starting with `q`
+        in alphabetical order, then fuzzy matches by similarity. Within each
+        group users in `boost_ids` come first.
+        """
+        key = q.strip().lower()
+        if not key:
+            return []
+
+        boosted = sorted(
+            (self._names[user_id].lower(), user_id) for user_id in boost_ids
+            if user_id in self._names and self._names[user_id].lower().startswith(key)
+        )
+        ids = [user_id for _, user_id in boosted[:limit]]
+        position = bisect_left(self._keys, key)
+        while len(ids) < limit and position < len(self._keys) and self._keys[position].startswith(key):
+            if self._ids[position] not in boost_ids:
+                ids.append(self._ids[position])
+            position += 1
+
+        if len(ids) < limit:
+            seen = set(ids)
+            similar = self._fuzzy.similarities(key, settings.SEARCH_WORD_SIMILARITY_THRESHOLD)
+            ranked = sorted(
+                (user_id for user_id in similar if user_id not in seen),
+                key=lambda user_id: (user_id not in boost_ids, -similar[user_id], self._names[user_id].lower())
+            )
+            ids.extend(ranked[:limit - len(ids)])
+
+        return [(user_id, self._names[user_id]) for user_id in ids]
+
+
+#the index suggestions read, never changed once published: writes and rebuilds swap in a
+#new one, so lookups take no lock
+_index = None
+_built_at = None
+#serializes writers swapping in a new index
+_lock = threading.Lock()
+#held by the one build in progress
+_build_lock = threading.Lock()
+#writes applied while a build reads the table, replayed onto its result
+_pending = None
+
+def suggest(q, limit, boost_ids=frozenset()):
+    return _current().suggest(q, limit, boost_ids)
+
+def _current():
+    index = _index
+    if index is None:
+        #nothing to suggest from yet, wait for the first build
+        with _build_lock:
+            if _index is None:
+                _rebuild()
+        return _index
+    ttl = settings.USERNAME_INDEX_TTL
+    if ttl is not None and time.monotonic() - _built_at > ttl:
+        #rebuilt now and then to pick up users written by other processes
+        _rebuild_in_background()
+    return index
+
+def _rebuild_in_background():
+    #at most one build at a time; lookups go on with the current index meanwhile
+    if not _build_lock.acquire(blocking=False):
+        return
+    def run():
+        try:
+            _rebuild()
+        finally:
+            #this thread's own connection
+            connection.close()
+            _build_lock.release()
+    threading.Thread(target=run, name='username-index-build', daemon=True).start()
+
+def _rebuild():
+    """Read every username into a new index and swap it in."""
+    global _index, _built_at, _pending
+    with _lock:
+        _pending = []
+    try:
+        started = time.monotonic()
+        index = UsernameIndex.build(User.objects.values_list('id', 'username').iterator(chunk_size=5000))
+        with _lock:
+            for method, args in _pending:
+                getattr(index, method)(*args)
+            _index, _built_at = index, started
+    finally:
+        with _lock:
+            _pending = None
+
+def reset():
+    global _index, _built_at
+    with _lock:
+        _index = _built_at = None
+
+def _apply(method, *args):
+    global _index
+    with _lock:
+        if _pending is not None:
+            _pending.append((method, args))
+        if _index is not None:
+            #copy on write - lookups may be reading the current index
+            index = _index.copy()
+            getattr(index, method)(*args)
+            _index = index
+
+#signal entry points, applied after commit
+def index_user(user):
+    user_id, username = user.id, user.username
+    transaction.on_commit(lambda: _apply('add', user_id, username))
+
+def unindex_user(user):
+    user_id = user.id
+    transaction.on_commit(lambda: _apply('remove', user_id))
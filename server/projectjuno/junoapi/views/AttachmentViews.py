@@ -1,8 +1,10 @@
 from rest_framework import generics
+from django.db import transaction
 
 from junoapi.models import Attachment
 from junoapi.serializers import AttachmentSerializer
 from junoapi.models import Task, User
+from junoapi import realtime
 
 class CreateAttachView(generics.ListCreateAPIView):
     serializer_class = AttachmentSerializer
@@ -19,12 +21,24 @@ class CreateAttachView(generics.ListCreateAPIView):
         task = Task.objects.get(id=task_id)
         user = User.objects.get(id=user_id)
 
-        serializer.save(
-            task_id = task,
-            #requires logged in user to be picked up - NEEDS UPDATE
-            uploadedby_id = user
-        )
+        with transaction.atomic():
+            serializer.save(
+                task_id = task,
+                #requires logged in user to be picked up - NEEDS UPDATE
+                uploadedby_id = user
+            )
+            realtime.attachment_saved(serializer.instance, task.project_id_id, created=True)
 
 class UpdateAttachView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Attachment.objects.all()
-    serializer_class = AttachmentSerializer
\ No newline at end of file
+    serializer_class = AttachmentSerializer
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            realtime.attachment_saved(serializer.instance, serializer.instance.task_id.project_id_id, created=False)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            realtime.attachment_deleted(instance, instance.task_id.project_id_id)
+            instance.delete()
@@ -1,10 +1,12 @@
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from rest_framework.exceptions import ValidationError
+from django.db import transaction
 
 from junoapi.models import Comment, Task, User
 from junoapi.serializers import CommentSerializer
 from junoapi.permissions import IsAdminOrCommentOwner
+from junoapi import realtime
 
 class ListCreateCommentView(generics.ListCreateAPIView):
     serializer_class = CommentSerializer
@@ -24,12 +26,19 @@ class ListCreateCommentView(generics.ListCreateAPIView):
         
         user = self.request.user
 
-        serializer.save(
-            task_id = task,
-            user_id = user
-        )
+        with transaction.atomic():
+            serializer.save(
+                task_id = task,
+                user_id = user
+            )
+            realtime.comment_added(serializer.instance, task.project_id_id)
 
 class DeleteCommentView(generics.DestroyAPIView):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrCommentOwner]
\ No newline at end of file
+    permission_classes = [IsAuthenticated, IsAdminOrCommentOwner]
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            realtime.comment_deleted(instance, instance.task_id.project_id_id)
+            instance.delete()
\ No newline at end of file
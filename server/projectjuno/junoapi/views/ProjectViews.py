@@ -1,18 +1,25 @@
 from django.shortcuts import render
-from django.db.models import Q
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
-from junoapi.models import Project, Team, ProjectTeam
+from junoapi.models import Project
 from junoapi.serializers import ProjectSerializer
 from junoapi.permissions import isOwner, canAcessProject
+from junoapi.access import get_access_context
+from junoapi.project_stats import get_project_stats
+from junoapi.serializers import split_param
+from junoapi.renderers import BULK_RENDERER_CLASSES
 
 class ProjectView(generics.ListCreateAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, canAcessProject]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *BULK_RENDERER_CLASSES]
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -20,22 +27,13 @@ class ProjectView(generics.ListCreateAPIView):
         return [IsAuthenticated(), canAcessProject()]
 
     def get_queryset(self):
-        user = self.request.user
-
-        user_team = Team.objects.filter(
-            Q(productowner_userid=user.id) |
-            Q(projectmanager_userid=user.id) |
-            Q(members=user) 
-        )
+        access = get_access_context(self.request)
+        return Project.objects.filter(id__in=access.accessible_projects())
 
-        team_project = ProjectTeam.objects.filter(
-            team_id__in = user_team
-        ).values_list('project_id', flat=True)
-
-        return Project.objects.filter(
-            Q(owner_id=user) |
-            Q(id__in=team_project)
-        ).distinct()
+    #the owner's access row and its outbox event commit with the project
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save()
     
 #API mainly used to handle faulty urls arriving from the frontend
 class ProjectDetailView(generics.RetrieveAPIView):
@@ -65,4 +63,30 @@ class DeleteProject(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated, isOwner]
 
     def get_queryset(self):
-        return self.queryset.filter(owner_id=self.request.user.id)
\ No newline at end of file
+        return self.queryset.filter(owner_id=self.request.user.id)
+
+#Dashboard aggregates - task counts by status/priority, points, overdue and assignee load
+class ProjectStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        if not get_access_context(request).can_access_project(pk):
+            if not Project.objects.filter(pk=pk).exists():
+                raise NotFound(detail="Project not Found")
+            raise PermissionDenied()
+        return Response(get_project_stats([pk])[pk])
+
+class MultiProjectStatsView(APIView):
+    """?ids=1,2,3 - defaults to every project the user can access."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        accessible = get_access_context(request).project_ids
+        ids = split_param(request.query_params.get('ids'))
+        if ids:
+            if not all(project_id.isdigit() for project_id in ids):
+                raise ValidationError({"error": "ids must be a comma separated list of project ids"})
+            project_ids = {int(project_id) for project_id in ids} & accessible
+        else:
+            project_ids = accessible
+        return Response(list(get_project_stats(project_ids).values()))
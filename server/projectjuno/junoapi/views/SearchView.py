@@ -1,57 +1,127 @@
-from junoapi.models import User, Task, Project
-from junoapi.serializers import TaskSerializer, ProjectSerializer, UserSerializer
+from django.conf import settings
+from junoapi.serializers import (
+    UserSearchHitSerializer, TaskSearchHitSerializer, ProjectSearchHitSerializer, CommentSearchHitSerializer,
+    split_param
+)
+from junoapi.pagination import SearchPagination
+from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
-from django.db.models import Q
-from django.contrib.postgres.search import TrigramSimilarity
+from functools import partial
+
+from junoapi import search_cache
+from junoapi.access import get_access_context
+from junoapi.permissions import IsAdmin
+from junoapi.search_backends import get_search_backend
+from junoapi.search_fanout import CategoryTimeout, local_budget, run_categories
+
+SEARCH_TYPES = ('tasks', 'projects', 'users', 'comments')
 
 class SearchView(APIView):
+    """
+    ?q=  the search text
+    ?type=tasks,projects  categories to search, all by default
+    ?limit=  hits per category, ranked best first
+    Tasks, projects and comments are limited to the projects the user can access.
+    Comment hits carry a highlighted snippet; api/search/comments/ pages through the rest.
+    The categories are searched concurrently; any that run past their
+    SEARCH_TIMEOUTS budget come back empty and are listed under "timed_out".
+    The query is normalized (case, Unicode forms, whitespace) before it is
+    searched, and hits are cached per category for it and the user's project
+    access, see junoapi.search_cache.
+    """
+    permission_classes = [IsAuthenticated]
+
     def get(self, request):
-        q = request.query_params.get('q', '')
+        #searched as it is cached - queries sharing a cache key must get the same hits
+        q = search_cache.normalize(request.query_params.get('q', ''))
+        types = self.get_types(request)
+        limit = self.get_limit(request)
+        access = get_access_context(request)
+        backend = get_search_backend()
+
+        searches = {
+            'users': lambda: UserSearchHitSerializer(backend.search_users(q, limit), many=True).data,
+            'tasks': lambda: TaskSearchHitSerializer(backend.search_tasks(q, access, limit), many=True).data,
+            'projects': lambda: ProjectSearchHitSerializer(backend.search_projects(q, access, limit), many=True).data,
+            'comments': lambda: CommentSearchHitSerializer(backend.search_comments(q, access)[:limit], many=True).data,
+        }
+        jobs = {category: search for category, search in searches.items() if category in types}
+
+        cached = {}
+        if q:
+            keys = search_cache.result_keys(q, access, list(jobs), limit)
+            cached = search_cache.get_many(keys)
+            jobs = {
+                category: partial(search_cache.compute, keys[category], search, settings.SEARCH_TIMEOUTS.get(category))
+                for category, search in jobs.items() if category not in cached
+            }
+        found, timed_out = run_categories(jobs)
+
+        results = {category: cached[category] if category in cached else found[category]
+                   for category in searches if category in types}
+        if timed_out:
+            results['timed_out'] = timed_out
+
+        return Response(results)
+
+    def get_types(self, request):
+        types = split_param(request.query_params.get('type'))
+        unknown = types - set(SEARCH_TYPES)
+        if unknown:
+            raise ValidationError({"error": f"Unknown search type(s): {', '.join(sorted(unknown))}"})
+        return types or set(SEARCH_TYPES)
+
+    def get_limit(self, request):
+        limit = request.query_params.get('limit')
+        if limit is None:
+            return settings.SEARCH_RESULTS_PER_TYPE
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValidationError({"error": "limit must be a positive integer"})
+        return min(int(limit), settings.SEARCH_MAX_RESULTS_PER_TYPE)
+
+class CommentSearchView(generics.ListAPIView):
+    """
+    ?q= accessible comments matching the text, best first, a page at a time (?page=, ?page_size=).
+    Every match is ranked and counted; a query too common to do that within the
+    comments SEARCH_TIMEOUTS budget gets a 503 asking for a narrower one.
+    """
+    serializer_class = CommentSearchHitSerializer
+    pagination_class = SearchPagination
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        try:
+            with local_budget('comments'):
+                return super().list(request, *args, **kwargs)
+        except CategoryTimeout:
+            return Response(
+                {"error": "Search took too long, try a more specific query"}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+    def get_queryset(self):
+        q = self.request.query_params.get('q', '').strip()
+        return get_search_backend().search_comments(q, get_access_context(self.request))
+
+class SearchCacheStatsView(APIView):
+    """Search result cache counters, shared by every worker."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(search_cache.stats())
 
-        users = User.objects.annotate(
-            similarity = TrigramSimilarity('username',q)
-        ).filter(
-            Q(username__icontains=q) |
-            Q(similarity__gt=0.2) #the similarity threshold
-        )
-
-        task = Task.objects.annotate(
-            title_similarity = TrigramSimilarity('title',q),
-            description_similarity = TrigramSimilarity('description',q),
-        ).filter(
-            Q(title__icontains=q) | Q(description__icontains=q) |
-            Q(title_similarity__gt = 0.2) | Q(description_similarity__gt = 0.2)
-        )
-
-        project = Project.objects.annotate(
-            name_similarity = TrigramSimilarity('name',q),
-            description_similarity = TrigramSimilarity('description',q)
-        ).filter(
-            Q(name__icontains=q) | Q(description__icontains=q) |
-            Q(name_similarity__gt = 0.2) | Q(description_similarity__gt = 0.2)
-        )   
-
-        user_data = UserSerializer(users, many=True).data
-        task_data = TaskSerializer(task, many=True).data
-        project_data = ProjectSerializer(project, many=True).data
-
-        return Response({
-            'users': user_data,
-            'tasks': task_data,
-            'projects': project_data
-        })
-    
 class UserSearchView(APIView):
     def get(self, request):
         q = request.query_params.get('q', '')
 
-        users = User.objects.annotate(
-            similarity = TrigramSimilarity('username',q)
-        ).filter(
-            Q(username__icontains=q) |
-            Q(similarity__gt=0.2)
-        ).values('id','username')
+        try:
+            with local_budget('users'):
+                users = list(get_search_backend().search_users(q, settings.SEARCH_MAX_RESULTS_PER_TYPE))
+        except CategoryTimeout:
+            users = []
 
-        return Response({"users": users})
\ No newline at end of file
+        return Response({"users": [{'id': user.id, 'username': user.username} for user in users]})
@@ -1,23 +1,130 @@
 from django.shortcuts import render
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.http import HttpResponse
+from django.db import transaction
 from django.db.models import Q  
 
 from junoapi.models import Task, User
-from junoapi.serializers import TaskSerializer, TaskStatusSerializer
-from junoapi.selectors import get_tasks
+from junoapi.serializers import TaskSerializer, TaskStatusSerializer, TaskBulkChangeSerializer
+from junoapi.selectors import get_tasks, get_task_changes
 from junoapi.permissions import isAdminOrTaskAuthor
+from junoapi.pagination import TaskCursorPagination
+from junoapi.filters import TaskFilterBackend, TaskOrderingFilter
+from junoapi.services import bulk_update_tasks
+from junoapi.access import get_access_context
+from junoapi.streaming import StreamingListMixin, streaming_response
+from junoapi.renderers import BULK_RENDERER_CLASSES
+from junoapi import realtime, task_fragments, task_json
 
-class TaskView(generics.ListCreateAPIView):
+class TaskFragmentListMixin:
+    """
+    Task lists built from cached per-task fragments (junoapi.task_fragments):
+    the page is read as ids and change_seqs only, and just the tasks missing
+    from the cache go through TaskSerializer. Sparse fieldsets are serialized as usual.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not self.uses_fragments(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        tasks = task_fragments.versions(queryset)
+        page = self.paginate_queryset(tasks)
+        data = task_fragments.serialize(tasks if page is None else page, queryset, self.get_serializer_context())
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def uses_fragments(self, request):
+        return task_fragments.enabled() and TaskSerializer.requested_fields(request.query_params) is None
+
+class TaskView(StreamingListMixin, TaskFragmentListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *BULK_RENDERER_CLASSES]
 
     def get_queryset(self):
-        project_id = self.request.query_params.get('project_id')    
-        return get_tasks(project_id=project_id)
+        project_id = self.request.query_params.get('project_id')
+        fields = TaskSerializer.requested_fields(self.request.query_params)
+        return get_tasks(project_id=project_id, fields=fields)
+
+    def list(self, request, *args, **kwargs):
+        if 'since' in request.query_params:
+            return self.list_changes(request)
+        if self.renders_in_sql(request):
+            queryset = self.filter_queryset(self.get_queryset())
+            if self.streams(request):
+                return streaming_response(task_json.render_chunks(queryset, self.get_stream_chunk_size()), request)
+            return HttpResponse(task_json.render(queryset), content_type=JSONRenderer.media_type)
+        return super().list(request, *args, **kwargs)
+
+    def renders_in_sql(self, request):
+        #the plain list only - pages, sparse fieldsets and the browsable API go through TaskSerializer
+        params = request.query_params
+        return (
+            getattr(settings, 'TASK_LIST_SQL_JSON', False)
+            and settings.TIME_ZONE == 'UTC'
+            and isinstance(request.accepted_renderer, JSONRenderer)
+            and not self.paginator.paginates(request)
+            and TaskSerializer.requested_fields(params) is None
+        )
+
+    def list_changes(self, request):
+        #?since=<seq> - the project's tasks changed or deleted since an earlier sync, unfiltered and unpaginated
+        params = request.query_params
+        try:
+            project_id = int(params.get('project_id', ''))
+            since = int(params['since'])
+        except ValueError:
+            raise ValidationError({"error": "since and project_id must be integers"})
+        if since < 0:
+            raise ValidationError({"error": "since must not be negative"})
+        if not get_access_context(request).can_access_project(project_id):
+            raise PermissionDenied("You do not have access to this project.")
+
+        seq, tasks, deleted, reset = get_task_changes(
+            project_id=project_id, since=since, fields=TaskSerializer.requested_fields(params)
+        )
+        if (not since or reset) and self.renders_in_sql(request):
+            #a full load, with nothing deleted to report: the tasks are rendered by Postgres
+            body = b'{"seq":%d,"tasks":%s,"deleted":[]%s}' % (seq, task_json.render(tasks), b',"reset":true' if reset else b'')
+            return HttpResponse(body, content_type=JSONRenderer.media_type)
+        if self.uses_fragments(request):
+            tasks = task_fragments.serialize(task_fragments.versions(tasks), tasks, self.get_serializer_context())
+        else:
+            tasks = self.get_serializer(tasks, many=True).data
+        data = {
+            "seq": seq,
+            "tasks": tasks,
+            "deleted": deleted,
+        }
+        if reset:
+            #since is past TASK_TOMBSTONE_RETENTION - this is a full load to replace the cached list with
+            data["reset"] = True
+        return Response(data)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            realtime.task_created(serializer.instance)
+
+class PublishTaskChangesMixin:
+    #records the saved difference for the project's websocket subscribers
+    def perform_update(self, serializer):
+        before = realtime.task_snapshot(serializer.instance)
+        with transaction.atomic():
+            serializer.save()
+            realtime.task_changed(before, serializer.instance)
     
-class UpdateTaskStatus(generics.UpdateAPIView):
+class UpdateTaskStatus(PublishTaskChangesMixin, generics.UpdateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskStatusSerializer
     permission_classes = [IsAuthenticated]
@@ -26,19 +133,57 @@ class UpdateTaskStatus(generics.UpdateAPIView):
 
     def patch(self, request, *args, **kwargs):
         return self.partial_update(request, *args, **kwargs)
+
+class BulkUpdateTasksView(APIView):
+    """
+    PATCH a list of {id, status|priority|assigned_userid|points} changes.
+    Invalid, missing or forbidden items are reported per item and do not
+    stop the others from being applied.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"error": "Expected a non-empty list of task changes"})
+        if len(items) > settings.TASK_BULK_MAX_ITEMS:
+            raise ValidationError({"error": f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request"})
+
+        results = [None] * len(items)
+        changes, positions = [], []
+        for position, item in enumerate(items):
+            serializer = TaskBulkChangeSerializer(data=item)
+            if serializer.is_valid():
+                changes.append(serializer.validated_data)
+                positions.append(position)
+            else:
+                results[position] = {'id': item.get('id') if isinstance(item, dict) else None, 'error': serializer.errors}
+
+        if changes:
+            for position, result in zip(positions, bulk_update_tasks(get_access_context(request), changes)):
+                results[position] = result
+
+        return Response({
+            'updated': sum('updated' in result for result in results),
+            'results': results
+        })
     
-class GetUserTasksView(generics.ListAPIView):
+class GetUserTasksView(TaskFragmentListMixin, generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes=[IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *BULK_RENDERER_CLASSES]
 
     def get_queryset(self):
         pk = self.kwargs.get('pk')
 
         if not User.objects.filter(pk=pk).exists():
             raise NotFound(detail="User not found")
-        return Task.objects.filter(assigned_userid=pk)
+        fields = TaskSerializer.requested_fields(self.request.query_params)
+        return get_tasks(assigned_userid=pk, fields=fields)
     
-class UpdateTaskView(generics.RetrieveUpdateAPIView):
+class UpdateTaskView(PublishTaskChangesMixin, generics.RetrieveUpdateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, isAdminOrTaskAuthor]
@@ -51,4 +196,10 @@ class UpdateTaskView(generics.RetrieveUpdateAPIView):
 class DeleteTaskView(generics.DestroyAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated,isAdminOrTaskAuthor]
\ No newline at end of file
+    permission_classes = [IsAuthenticated,isAdminOrTaskAuthor]
+
+    def perform_destroy(self, instance):
+        task_id, project_id = instance.id, instance.project_id_id
+        with transaction.atomic():
+            instance.delete()
+            realtime.task_deleted(task_id, project_id)
@@ -4,8 +4,9 @@ from junoapi.serializers import TeamSerializer, ProjectTeamSerializer
 from junoapi.models import Team, User, Project, ProjectTeam
 from junoapi.selectors import get_teams
 from junoapi.permissions import IsProductOwner, IsOwnerOrManager
+from junoapi.access import get_access_context
+from junoapi.streaming import StreamingListMixin
 
-from django.db.models import Q
 from django.db import transaction
 
 from rest_framework.response import Response
@@ -19,12 +20,8 @@ class ListCreateTeamView(generics.ListCreateAPIView):
     permission_classes=[IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        return Team.objects.filter(
-            Q(productowner_userid=user) |
-            Q(projectmanager_userid=user) |
-            Q(members=user)
-            ).distinct()
+        access = get_access_context(self.request)
+        return get_teams(team_ids=access.team_ids)
 
     def create(self, request, *args, **kwargs):
         member_usernames = request.data.get('members', [])
@@ -61,6 +58,8 @@ class AddTeamMemberView(generics.UpdateAPIView):
     serializer_class = TeamSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrManager]
 
+    #membership, access rows and their outbox events commit together
+    @transaction.atomic
     def update(self, request, *args, **kwargs):
         team = self.get_object()
         usernames = request.data.get('members', [])
@@ -89,9 +88,14 @@ class deleteTeam(generics.DestroyAPIView):
     serializer_class = TeamSerializer
     permission_classes = [IsAuthenticated, IsProductOwner]
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
 class AttachProjectToTeamView(APIView):
     permission_classes = [IsAuthenticated, IsProductOwner]
 
+    @transaction.atomic
     def post(self, request, team_id, project_id):
         try:
             team = Team.objects.get(id=team_id)
@@ -111,7 +115,7 @@ class AttachProjectToTeamView(APIView):
         }
         return Response(reponse_data, status=status.HTTP_201_CREATED)
     
-class GetTeamProject(generics.ListAPIView):
+class GetTeamProject(StreamingListMixin, generics.ListAPIView):
     queryset = ProjectTeam.objects.all()
     serializer_class = ProjectTeamSerializer
     permission_classes = [IsAuthenticated]
@@ -133,4 +137,8 @@ class RemoveTeamProject(generics.DestroyAPIView):
         if(team.productowner_userid != user):
             raise PermissionDenied("Only the Product Owner can remove this project from the team.")
 
-        return project_team
\ No newline at end of file
+        return project_team
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
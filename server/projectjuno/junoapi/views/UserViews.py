@@ -11,8 +11,17 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from junoapi.authentication import CognitoJWTAuthentication
+from junoapi.user_cache import get_user_by_cognito_id
+from junoapi.access import get_access_context
+from junoapi import username_index
+from junoapi.streaming import StreamingListMixin
 
-class GetUserView(generics.ListCreateAPIView):
+import hashlib
+import json
+from django.conf import settings
+from django.utils.http import parse_etags, quote_etag
+
+class GetUserView(StreamingListMixin, generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
@@ -67,10 +76,48 @@ class GetUserById(APIView):
     
     def get(self, request, user_sub):
         try:
-            user = User.objects.get(cognito_id=user_sub)
+            user = get_user_by_cognito_id(user_sub)
+            if user is None:
+                return Response({"error": "User not found"}, status=404)
             serializer = UserSerializer(user)
             return Response(serializer.data)
-        except User.DoesNotExist:
-            return Response({"error": "User not found"}, status=404)
         except Exception as e:
-            return Response({"error": str(e)}, status=500)
\ No newline at end of file
+            return Response({"error": str(e)}, status=500)
+
+#Typeahead for the member picker - answered from the in-process username index
+class UserSuggestView(APIView):
+    """
+    ?q=  username prefix (fuzzy matches fill any remaining slots)
+    ?limit=  number of suggestions, default USER_SUGGEST_LIMIT
+    ?boost=team  list users sharing a team with the caller first
+    Responses carry an ETag and a short private max-age so repeated
+    keystrokes are answered by the browser cache.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        q = request.query_params.get('q', '')
+        limit = request.query_params.get('limit', str(settings.USER_SUGGEST_LIMIT))
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValidationError({"error": "limit must be a positive integer"})
+        limit = min(int(limit), settings.SEARCH_MAX_RESULTS_PER_TYPE)
+
+        boost_ids = frozenset()
+        if request.query_params.get('boost') == 'team':
+            boost_ids = get_access_context(request).teammate_ids
+
+        users = [
+            {'id': user_id, 'username': username, 'teammate': user_id in boost_ids}
+            for user_id, username in username_index.suggest(q, limit, boost_ids)
+        ]
+
+        body = json.dumps(users, separators=(',', ':')).encode()
+        etag = quote_etag(hashlib.sha1(body).hexdigest())
+        headers = {
+            'ETag': etag,
+            'Cache-Control': f'private, max-age={settings.USER_SUGGEST_MAX_AGE}',
+            'Vary': 'Authorization',
+        }
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response({'users': users}, headers=headers)
@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projectjuno.settings')
 
-application = get_asgi_application()
\ No newline at end of file
+#set up Django before importing anything that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+
+from junoapi.authentication import CognitoTokenAuthMiddleware
+from junoapi.routing import websocket_urlpatterns
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    #authenticated by token rather than cookies, so any origin may connect, as with CORS
+    'websocket': CognitoTokenAuthMiddleware(URLRouter(websocket_urlpatterns)),
+})
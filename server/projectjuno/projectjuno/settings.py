@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'junoapi',
     'rest_framework',
     'corsheaders',
@@ -65,11 +66,36 @@ COGNITO_USER_POOL_ID = os.environ.get("COGNITO_USER_POOL_ID")
 COGNITO_APP_CLIENT_ID = os.environ.get("COGNITO_APP_CLIENT_ID")
 COGNITO_JWKS_URL = os.environ.get("COGNITO_JWKS_URL")
 
+#JWKS key cache - seconds; Cache-Control max-age from Cognito takes precedence over the TTL
+COGNITO_JWKS_TTL = 3600
+COGNITO_JWKS_REFRESH_MARGIN = 300
+COGNITO_JWKS_MIN_REFETCH_INTERVAL = 60
+
+#verified token claims cache - set the alias to share verified tokens between workers through Redis
+COGNITO_CLAIMS_CACHE_SIZE = 10000
+COGNITO_CLAIMS_CACHE_ALIAS = None
+
+#cognito_id -> user snapshot cache, the local tier is not invalidated across workers so keep its TTL short
+USER_CACHE_ALIAS = 'default'
+USER_CACHE_TTL = 300
+USER_CACHE_LOCAL_TTL = 30
+USER_CACHE_LOCAL_SIZE = 10000
+
 # from junoapi.authentication import CognitoJWTAuthentication
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'junoapi.authentication.CognitoJWTAuthentication',
     ),
+    #orjson for JSON bodies; the browsable API stays available through content negotiation
+    'DEFAULT_RENDERER_CLASSES': [
+        'junoapi.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'junoapi.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle'
@@ -80,6 +106,28 @@ REST_FRAMEWORK = {
     }
 }
 
+#task list keyset pagination, opt-in with ?page_size= or ?cursor=
+TASK_PAGE_SIZE = 100
+TASK_MAX_PAGE_SIZE = 500
+#unpaginated, full task lists rendered to JSON by PostgreSQL (junoapi.task_json); the
+#SQL renders datetimes in UTC, so other TIME_ZONEs keep to TaskSerializer
+TASK_LIST_SQL_JSON = True
+#per-task TaskSerializer output cached under (id, change_seq) for the other task lists (junoapi.task_fragments)
+TASK_FRAGMENT_CACHE = True
+TASK_FRAGMENT_CACHE_ALIAS = 'default'
+TASK_FRAGMENT_TTL = 3600
+#?stream=true list responses - rows read, serialized and sent per chunk (junoapi.streaming)
+LIST_STREAM_CHUNK_SIZE = 500
+#PATCH api/tasks/bulk/ request size limit
+TASK_BULK_MAX_ITEMS = 500
+#seconds task_tombstone rows are kept for ?since= syncs (manage.py prune_task_tombstones);
+#a client that last synced before that gets a full load marked "reset"
+TASK_TOMBSTONE_RETENTION = 30 * 24 * 3600
+
+#api/projects/<pk>/stats - entries also expire so overdue counts follow the clock
+PROJECT_STATS_CACHE_ALIAS = 'default'
+PROJECT_STATS_TTL = 300
+
 CACHES = {
     'default': {
         'BACKEND': 'django_redis.cache.RedisCache',
@@ -116,6 +164,32 @@ WSGI_APPLICATION = 'projectjuno.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+#minimum word similarity for the search %> operator, SET LOCAL around each search (junoapi.search)
+SEARCH_WORD_SIMILARITY_THRESHOLD = 0.3
+#api/search/ - hits per category (?limit=, capped)
+SEARCH_RESULTS_PER_TYPE = 10
+SEARCH_MAX_RESULTS_PER_TYPE = 50
+#junoapi.search_backends.PostgresSearchBackend or InMemorySearchBackend (per-process trigram
+#index, rebuilt in the background every SEARCH_MEMORY_INDEX_TTL seconds to pick up other
+#processes' writes, or sooner once this process has made SEARCH_MEMORY_INDEX_MAX_CHANGES)
+SEARCH_BACKEND = 'junoapi.search_backends.PostgresSearchBackend'
+SEARCH_MEMORY_INDEX_TTL = 300
+SEARCH_MEMORY_INDEX_MAX_CHANGES = 1000
+#api/search/ categories run side by side on SEARCH_WORKERS pool threads, each within its own
+#budget in seconds from when it starts (also its Postgres statement_timeout); a late category
+#is returned empty. A request that finds too few free threads runs its categories in turn.
+SEARCH_WORKERS = 8
+SEARCH_TIMEOUTS = {'users': 0.5, 'tasks': 1.0, 'projects': 0.5, 'comments': 1.0}
+#api/search/ result cache - seconds a category's hits are kept (writes to the models it
+#reads retire them sooner), and how long concurrent identical misses wait for the first
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_LOCK_TIMEOUT = 2
+SEARCH_CACHE_POLL_INTERVAL = 0.02
+#api/users/suggest/ - in-process username index rebuild interval, default size and browser max-age
+USERNAME_INDEX_TTL = 300
+USER_SUGGEST_LIMIT = 8
+USER_SUGGEST_MAX_AGE = 30
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -123,7 +197,10 @@ DATABASES = {
         'USER': 'postgres',
         'PASSWORD': 'r@ch1234',
         'HOST': 'localhost',
-        'PORT': '5432'
+        'PORT': '5432',
+        #persistent connections, for requests and the search pool threads alike
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -171,13 +248,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'junoapi.user'
 
-#Channels
-# ASGI_APPLICATION = 'junoapi.asgi.application'
-# CHANNEL_LAYERS = {
-#     'default': {
-#         'BACKEND': 'channels_redis.core.RedisChannelLayer',
-#         'CONFIG': {
-#             "hosts": [("127.0.0.1", 6379)],
-#         },
-#     },
-# }
\ No newline at end of file
+#Channels - ws/events/ change events are fanned out through Redis between workers;
+#tests swap in channels.layers.InMemoryChannelLayer
+ASGI_APPLICATION = 'projectjuno.asgi.application'
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            "hosts": ["redis://127.0.0.1:6379/2"],
+        },
+    },
+}
@@ -0,0 +1,35 @@
+import pytest
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from junoapi import search_fanout
+from junoapi.models import Project
+
+User = get_user_model()
+
+@pytest.fixture(scope='session', autouse=True)
+def search_pool(django_db_setup):
+    #search pool threads keep their connections open; close them before the test database is dropped
+    yield
+    search_fanout.shutdown()
+
+@pytest.fixture
+def make_user():
+    def make(username):
+        return User.objects.create_user(username=username, cognito_id=str(uuid.uuid4()), password="test123")
+    return make
+
+@pytest.fixture
+def make_project():
+    def make(owner, name="Project", description="desc"):
+        return Project.objects.create(
+            name=name,
+            description=description,
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=owner
+        )
+    return make
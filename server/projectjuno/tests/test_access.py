@@ -0,0 +1,119 @@
+import pytest
+
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from junoapi.access import AccessContext, get_access_context
+from junoapi.models import ProjectTeam, Team
+
+@pytest.mark.django_db
+class TestAccessContext:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("member")
+        self.owner = make_user("owner")
+
+        self.owned = make_project(self.user, "Owned")
+        self.shared = make_project(self.owner, "Shared")
+        self.hidden = make_project(self.owner, "Hidden")
+
+        self.team = Team.objects.create(domain_name="team", productowner_userid=self.owner)
+        self.team.members.add(self.user)
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.shared)
+
+        self.other_team = Team.objects.create(domain_name="other", productowner_userid=self.owner)
+        ProjectTeam.objects.create(team_id=self.other_team, project_id=self.hidden)
+
+    def test_accessible_ids(self):
+        access = AccessContext(self.user)
+
+        assert access.team_ids == frozenset({self.team.id})
+        assert access.project_ids == frozenset({self.owned.id, self.shared.id})
+        assert not access.can_access_project(self.hidden.id)
+
+    def test_roles_grant_team_access(self, make_user):
+        manager = make_user("manager")
+        self.other_team.projectmanager_userid = manager
+        self.other_team.save()
+
+        assert AccessContext(manager).project_ids == frozenset({self.hidden.id})
+        assert AccessContext(self.owner).team_ids == frozenset({self.team.id, self.other_team.id})
+
+    def test_teammate_ids(self, django_assert_num_queries, make_user):
+        colleague = make_user("colleague")
+        self.team.members.add(colleague)
+
+        with django_assert_num_queries(1):
+            assert AccessContext(self.user).teammate_ids == frozenset({self.owner.id, colleague.id})
+
+    def test_computed_once(self, django_assert_num_queries):
+        access = AccessContext(self.user)
+
+        with django_assert_num_queries(3):
+            for _ in range(3):
+                access.is_admin
+                access.team_ids
+                access.project_ids
+
+    def test_is_admin(self):
+        assert not AccessContext(self.user).is_admin
+
+        self.user.groups.add(Group.objects.create(name="Admin"))
+        assert AccessContext(self.user).is_admin
+
+    def test_is_admin_uses_cached_groups(self, django_assert_num_queries):
+        self.user._group_names = frozenset({"Admin"})
+
+        with django_assert_num_queries(0):
+            assert AccessContext(self.user).is_admin
+
+    def test_shared_per_request(self):
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+
+        assert get_access_context(request) is get_access_context(request)
+
+#Per-endpoint query counts
+@pytest.mark.django_db
+class TestAccessQueryCounts:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("member")
+        self.owner = make_user("owner")
+        self.client.force_authenticate(user=self.user)
+
+        self.teams = []
+        for i in range(5):
+            team = Team.objects.create(domain_name=f"team {i}", productowner_userid=self.owner, projectmanager_userid=self.owner)
+            team.members.add(self.user, make_user(f"member {i}"))
+            project = make_project(self.owner, f"Project {i}")
+            ProjectTeam.objects.create(team_id=team, project_id=project)
+            self.teams.append(team)
+        self.project = project
+
+    def test_project_list(self, django_assert_num_queries):
+        #projects joined against user_project_access
+        with django_assert_num_queries(1):
+            response = self.client.get(reverse('project-list'))
+        assert len(response.data) == 5
+
+    def test_project_detail(self, django_assert_num_queries):
+        #project + a single user_project_access lookup
+        with django_assert_num_queries(2):
+            response = self.client.get(reverse('project-detail', args=[self.project.id]))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_team_list(self, django_assert_num_queries):
+        #accessible team ids + teams with owner/manager + members, independent of the team count
+        with django_assert_num_queries(3):
+            response = self.client.get(reverse('list-create-team'))
+        assert len(response.data) == 5
+
+    def test_owner_only_team_endpoint(self, django_assert_num_queries):
+        #team + admin group check, the owner comparison no longer loads the user
+        with django_assert_num_queries(2):
+            response = self.client.delete(reverse('delete-team', args=[self.teams[0].id]))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,349 @@
+import pytest
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from junoapi.authentication import CognitoJWTAuthentication
+from junoapi.jwks import JWKSKeyStore, get_key_store, _stores
+from junoapi.claims_cache import VerifiedClaimsCache, get_claims_cache
+from junoapi import user_cache
+
+User = get_user_model()
+
+CLIENT_ID = 'test-client-id'
+
+def make_signing_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': kid, 'alg': 'RS256', 'use': 'sig'})
+    return private_key, jwk
+
+def make_token(private_key, kid, sub, expires_in=3600):
+    claims = {'sub': sub, 'aud': CLIENT_ID, 'exp': int(time.time()) + expires_in}
+    return jwt.encode(claims, private_key, algorithm='RS256', headers={'kid': kid})
+
+class JWKSServer:
+    #local stand-in for the Cognito JWKS endpoint
+    def __init__(self, jwks, cache_control=None, delay=0):
+        self.jwks = jwks
+        self.cache_control = cache_control
+        self.delay = delay
+        self.hits = 0
+
+        server = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                time.sleep(server.delay)
+                body = json.dumps(server.jwks).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if server.cache_control:
+                    self.send_header('Cache-Control', server.cache_control)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def signing_key():
+    return make_signing_key('key-1')
+
+@pytest.fixture
+def jwks_server(signing_key):
+    server = JWKSServer({'keys': [signing_key[1]]})
+    yield server
+    server.close()
+
+@pytest.fixture
+def cognito_env(monkeypatch, jwks_server):
+    monkeypatch.setenv('COGNITO_JWKS_URL', jwks_server.url)
+    monkeypatch.setenv('COGNITO_APP_CLIENT_ID', CLIENT_ID)
+    yield jwks_server
+    _stores.pop(jwks_server.url, None)
+
+#Testing - JWKS key store
+def test_key_store_fetches_once_for_many_lookups(jwks_server):
+    store = JWKSKeyStore(jwks_server.url)
+
+    for _ in range(20):
+        assert store.get_key('key-1') is not None
+    assert jwks_server.hits == 1
+
+def test_key_store_honors_cache_control(jwks_server):
+    jwks_server.cache_control = 'public, max-age=120'
+    store = JWKSKeyStore(jwks_server.url, ttl=3600, min_refetch_interval=10)
+    store.get_key('key-1')
+
+    assert store._expires_at - store._last_fetch == pytest.approx(120)
+
+def test_key_store_refetches_on_unknown_kid_once_per_interval(jwks_server):
+    store = JWKSKeyStore(jwks_server.url, min_refetch_interval=60)
+    store.get_key('key-1')
+
+    assert store.get_key('unknown') is None
+    assert store.get_key('unknown') is None
+    assert jwks_server.hits == 1
+
+    store._last_fetch -= 61
+    rotated_private, rotated_jwk = make_signing_key('key-2')
+    jwks_server.jwks = {'keys': [rotated_jwk]}
+
+    assert store.get_key('key-2') is not None
+    assert jwks_server.hits == 2
+
+def test_key_store_refreshes_in_background_before_expiry(jwks_server):
+    store = JWKSKeyStore(jwks_server.url, ttl=100, refresh_margin=50, min_refetch_interval=0)
+    store.get_key('key-1')
+    store._expires_at = time.monotonic() + 10
+
+    assert store.get_key('key-1') is not None
+    store._background.join(timeout=5)
+    assert jwks_server.hits == 2
+    assert store._expires_at - time.monotonic() > 50
+
+def test_key_store_single_flight(jwks_server):
+    jwks_server.delay = 0.2
+    store = JWKSKeyStore(jwks_server.url)
+
+    threads = [threading.Thread(target=store.get_key, args=('key-1',)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert jwks_server.hits == 1
+
+def test_key_store_serves_stale_keys_when_refresh_fails(jwks_server):
+    store = JWKSKeyStore(jwks_server.url, min_refetch_interval=30)
+    store.get_key('key-1')
+    jwks_server.close()
+    store._expires_at = 0
+
+    assert store.get_key('key-1') is not None
+    assert store._expires_at > time.monotonic()
+
+def test_get_key_store_is_process_wide(jwks_server):
+    try:
+        assert get_key_store(jwks_server.url) is get_key_store(jwks_server.url)
+    finally:
+        _stores.pop(jwks_server.url, None)
+
+#Testing - verified claims cache
+def test_claims_cache_hit_and_miss():
+    cache = VerifiedClaimsCache(max_size=10)
+    claims = {'sub': 'abc', 'exp': int(time.time()) + 60}
+
+    assert cache.get('token-a') is None
+    cache.set('token-a', claims)
+    assert cache.get('token-a') == claims
+    assert cache.stats() == {'size': 1, 'hits': 1, 'shared_hits': 0, 'misses': 1}
+
+def test_claims_cache_never_serves_expired_token():
+    cache = VerifiedClaimsCache()
+    cache.set('token-a', {'sub': 'abc', 'exp': int(time.time()) - 1})
+    assert cache.get('token-a') is None
+
+    cache._store(cache.digest('token-b'), {'sub': 'abc', 'exp': time.time() - 1})
+    assert cache.get('token-b') is None
+    assert cache.stats()['size'] == 0
+
+def test_claims_cache_size_cap_evicts_least_recent():
+    cache = VerifiedClaimsCache(max_size=2)
+    exp = int(time.time()) + 60
+    for token in ('a', 'b'):
+        cache.set(token, {'sub': token, 'exp': exp})
+    cache.get('a')
+    cache.set('c', {'sub': 'c', 'exp': exp})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+def test_claims_cache_shared_tier():
+    writer = VerifiedClaimsCache(cache_alias='default')
+    reader = VerifiedClaimsCache(cache_alias='default')
+    token = str(uuid.uuid4())
+    claims = {'sub': 'abc', 'exp': int(time.time()) + 60}
+
+    writer.set(token, claims)
+    assert reader.get(token) == claims
+    assert reader.stats()['shared_hits'] == 1
+    assert reader.get(token) == claims
+    assert reader.stats()['hits'] == 1
+
+#Testing - CognitoJWTAuthentication
+@pytest.mark.django_db
+class TestCognitoJWTAuthentication:
+    def setup_method(self):
+        get_claims_cache().clear()
+        user_cache.clear_local()
+        self.factory = APIRequestFactory()
+        self.auth = CognitoJWTAuthentication()
+        self.sub = str(uuid.uuid4())
+        self.user = User.objects.create_user(username="authuser", cognito_id=self.sub, password="test123")
+
+    def request_with(self, token):
+        return self.factory.get('/api/projects/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_authenticate_successful(self, cognito_env, signing_key):
+        token = make_token(signing_key[0], 'key-1', self.sub)
+
+        for _ in range(5):
+            user, _auth = self.auth.authenticate(self.request_with(token))
+            assert user == self.user
+        assert cognito_env.hits == 1
+        assert get_claims_cache().stats()['hits'] == 4
+
+    def test_cached_claims_skip_verification(self, cognito_env, signing_key, monkeypatch):
+        token = make_token(signing_key[0], 'key-1', self.sub)
+        self.auth.authenticate(self.request_with(token))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("token verified twice")
+        monkeypatch.setattr(jwt, 'decode', fail)
+
+        user, _auth = self.auth.authenticate(self.request_with(token))
+        assert user == self.user
+
+    def test_no_header(self):
+        assert self.auth.authenticate(self.factory.get('/api/projects/')) is None
+
+    def test_expired_token(self, cognito_env, signing_key):
+        token = make_token(signing_key[0], 'key-1', self.sub, expires_in=-10)
+
+        with pytest.raises(exceptions.AuthenticationFailed):
+            self.auth.authenticate(self.request_with(token))
+
+    def test_unknown_kid(self, cognito_env):
+        other_private, _jwk = make_signing_key('key-9')
+        token = make_token(other_private, 'key-9', self.sub)
+
+        with pytest.raises(exceptions.AuthenticationFailed, match="Public key not found"):
+            self.auth.authenticate(self.request_with(token))
+
+    def test_unknown_user(self, cognito_env, signing_key):
+        token = make_token(signing_key[0], 'key-1', str(uuid.uuid4()))
+
+        with pytest.raises(exceptions.AuthenticationFailed, match="User not found"):
+            self.auth.authenticate(self.request_with(token))
+
+    def test_warm_cache_makes_no_auth_queries(self, cognito_env, signing_key, django_assert_num_queries):
+        token = make_token(signing_key[0], 'key-1', self.sub)
+        self.auth.authenticate(self.request_with(token))
+        user_cache.clear_local()
+
+        #served from redis
+        with django_assert_num_queries(0):
+            user, _auth = self.auth.authenticate(self.request_with(token))
+        #served from the process LRU
+        with django_assert_num_queries(0):
+            user, _auth = self.auth.authenticate(self.request_with(token))
+        assert user.pk == self.user.pk
+        assert user.username == "authuser"
+
+    def test_get_user_by_id_warm_cache_makes_no_queries(self, cognito_env, signing_key, django_assert_num_queries):
+        client = APIClient()
+        token = make_token(signing_key[0], 'key-1', self.sub)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        client.get(f'/api/users/{self.sub}')
+
+        with django_assert_num_queries(0):
+            response = client.get(f'/api/users/{self.sub}')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['username'] == "authuser"
+
+#Testing - cognito_id -> user cache
+@pytest.mark.django_db
+class TestUserCache:
+    def setup_method(self):
+        user_cache.clear_local()
+        self.sub = str(uuid.uuid4())
+        self.user = User.objects.create_user(username="cacheduser", cognito_id=self.sub, password="test123")
+
+    def teardown_method(self):
+        user_cache.invalidate(self.sub)
+
+    def test_unknown_cognito_id(self):
+        assert user_cache.get_user_by_cognito_id(str(uuid.uuid4())) is None
+
+    def test_invalidated_on_save(self):
+        user_cache.get_user_by_cognito_id(self.sub)
+        self.user.username = "renamed"
+        self.user.save()
+
+        assert user_cache.get_user_by_cognito_id(self.sub).username == "renamed"
+
+    def test_invalidated_on_delete(self):
+        user_cache.get_user_by_cognito_id(self.sub)
+        self.user.delete()
+
+        assert user_cache.get_user_by_cognito_id(self.sub) is None
+        assert cache.get(f"user-snapshot:{self.sub}") is None
+
+    def test_invalidated_again_on_commit(self, django_capture_on_commit_callbacks):
+        stale = user_cache.get_user_by_cognito_id(self.sub)
+        with django_capture_on_commit_callbacks() as callbacks:
+            self.user.username = "renamed"
+            self.user.save()
+            #another request re-caches the row the transaction has not committed yet
+            cache.set(f"user-snapshot:{self.sub}", {**user_cache._load_snapshot(self.sub), 'username': stale.username})
+        for callback in callbacks:
+            callback()
+
+        user_cache.clear_local()
+        assert user_cache.get_user_by_cognito_id(self.sub).username == "renamed"
+
+    def test_cognito_id_change_drops_old_entry(self):
+        user_cache.get_user_by_cognito_id(self.sub)
+        user = User.objects.get(id=self.user.id)
+        user.cognito_id = str(uuid.uuid4())
+        user.save()
+
+        assert user_cache.get_user_by_cognito_id(self.sub) is None
+        assert user_cache.get_user_by_cognito_id(user.cognito_id).id == self.user.id
+        user_cache.invalidate(user.cognito_id)
+
+    def test_invalidated_on_group_change(self):
+        admin = Group.objects.create(name="Admin")
+        assert user_cache.get_user_by_cognito_id(self.sub)._group_names == frozenset()
+
+        self.user.groups.add(admin)
+        assert user_cache.get_user_by_cognito_id(self.sub)._group_names == {"Admin"}
+
+        admin.user_set.clear()
+        assert user_cache.get_user_by_cognito_id(self.sub)._group_names == frozenset()
+
+        admin.user_set.add(self.user)
+        assert user_cache.get_user_by_cognito_id(self.sub)._group_names == {"Admin"}
+
+        admin.delete()
+        assert user_cache.get_user_by_cognito_id(self.sub)._group_names == frozenset()
+
+    def test_saving_cached_user_keeps_password(self):
+        cached = user_cache.get_user_by_cognito_id(self.sub)
+        cached.email = "new@example.com"
+        cached.save()
+
+        self.user.refresh_from_db()
+        assert self.user.email == "new@example.com"
+        assert self.user.check_password("test123")
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from junoapi import outbox
+from junoapi.models import OutboxEvent
+from tests.test_realtime import subscribe
+from tests.test_search import make_task
+
+@pytest.fixture(autouse=True)
+def in_memory_layer(settings):
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+def row(event, group="project-1", entity="task", entity_id=1):
+    return OutboxEvent(group=group, entity=entity, entity_id=entity_id, event=event)
+
+def status(start, end):
+    return {'type': 'task.status', 'id': 1, 'from': start, 'to': end}
+
+#Testing - coalescing a batch
+class TestCoalesce:
+    def test_status_moves_fold(self):
+        rows = [row(status("To Do", "Work In Progress")), row(status("Work In Progress", "Completed"))]
+        assert outbox.coalesce(rows) == [("project-1", status("To Do", "Completed"))]
+
+    def test_status_round_trip_dropped(self):
+        rows = [row(status("To Do", "Completed")), row(status("Completed", "To Do"))]
+        assert outbox.coalesce(rows) == []
+
+    def test_updates_merge(self):
+        rows = [
+            row({'type': 'task.updated', 'id': 1, 'changes': {'priority': "Low", 'points': 3}}),
+            row(status("To Do", "Completed")),
+            row({'type': 'task.updated', 'id': 1, 'changes': {'points': 5}}),
+        ]
+        assert outbox.coalesce(rows) == [
+            ("project-1", {'type': 'task.updated', 'id': 1, 'changes': {'priority': "Low", 'points': 5, 'status': "Completed"}})
+        ]
+
+    def test_changes_fold_into_create(self):
+        rows = [
+            row({'type': 'task.created', 'task': {'id': 1, 'title': "Draft", 'status': "To Do"}}),
+            row({'type': 'task.updated', 'id': 1, 'changes': {'title': "Final"}}),
+            row(status("To Do", "Completed")),
+        ]
+        assert outbox.coalesce(rows) == [
+            ("project-1", {'type': 'task.created', 'task': {'id': 1, 'title': "Final", 'status': "Completed"}})
+        ]
+
+    def test_created_then_deleted_dropped(self):
+        rows = [row({'type': 'task.created', 'task': {'id': 1}}), row({'type': 'task.deleted', 'id': 1})]
+        assert outbox.coalesce(rows) == []
+
+    def test_delete_replaces_changes(self):
+        rows = [row(status("To Do", "Completed")), row({'type': 'task.deleted', 'id': 1})]
+        assert outbox.coalesce(rows) == [("project-1", {'type': 'task.deleted', 'id': 1})]
+
+    def test_groups_and_entities_kept_apart(self):
+        rows = [
+            row(status("To Do", "Completed")),
+            row({'type': 'comment.added', 'comment': {'id': 1}}, entity="comment"),
+            row(status("To Do", "Completed"), entity_id=2),
+            row({'type': 'task.deleted', 'id': 1}, group="project-2"),
+        ]
+        assert [group for group, _ in outbox.coalesce(rows)] == ["project-1", "project-1", "project-1", "project-2"]
+
+#Testing - rows written with the change
+@pytest.mark.django_db
+class TestRecord:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("recorder")
+        self.client.force_authenticate(user=self.user)
+        self.project = make_project(self.user, "Outbox")
+        self.task = make_task(self.project, self.user, "Record me")
+        OutboxEvent.objects.all().delete()
+
+    def test_row_written_with_change(self):
+        self.client.patch(reverse("update-task-status", args=[self.task.id]), {"status": "Completed"}, format='json')
+
+        stored = OutboxEvent.objects.get()
+        assert (stored.group, stored.entity, stored.entity_id) == (f"project-{self.project.id}", 'task', self.task.id)
+        assert stored.event['to'] == "Completed"
+
+    def test_rolled_back_with_change(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                self.client.patch(reverse("update-task-status", args=[self.task.id]), {"status": "Completed"}, format='json')
+                raise RuntimeError
+        assert not OutboxEvent.objects.exists()
+
+    def test_relay_publishes_and_deletes(self):
+        receive = subscribe(f"project-{self.project.id}")
+        for value in ("Work In Progress", "Under Review", "Completed"):
+            self.client.patch(reverse("update-task-status", args=[self.task.id]), {"status": value}, format='json')
+
+        assert receive() == {'type': 'task.status', 'id': self.task.id, 'from': "To Do", 'to': "Completed", 'project_id': self.project.id}
+        assert not OutboxEvent.objects.exists()
+        assert outbox.relay() == (0, 0)
+
+#Testing - concurrent relays (each thread needs its own committed view of the rows)
+@pytest.mark.django_db(transaction=True)
+def test_relays_skip_locked_rows():
+    outbox.record([("project-1", 'task', task_id, status("To Do", "Completed")) for task_id in range(1, 7)])
+    claimed = threading.Event()
+    release = threading.Event()
+
+    def slow_relay():
+        #holds the first three rows locked until released
+        with transaction.atomic():
+            locked = list(OutboxEvent.objects.select_for_update().order_by('id')[:3])
+            claimed.set()
+            release.wait(5)
+            OutboxEvent.objects.filter(id__in=[locked_row.id for locked_row in locked]).delete()
+        connection.close()
+
+    thread = threading.Thread(target=slow_relay)
+    thread.start()
+    claimed.wait(5)
+    try:
+        assert outbox.relay(batch_size=10) == (3, 3)
+    finally:
+        release.set()
+        thread.join()
+    assert not OutboxEvent.objects.exists()
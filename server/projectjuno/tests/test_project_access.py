@@ -0,0 +1,117 @@
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from junoapi.models import ProjectTeam, Team, UserProjectAccess
+from junoapi import project_access
+
+def access_rows(project=None):
+    queryset = UserProjectAccess.objects.all()
+    if project is not None:
+        queryset = queryset.filter(project_id=project)
+    return set(queryset.values_list('user_id', 'project_id', 'role'))
+
+@pytest.mark.django_db
+class TestUserProjectAccessMaintenance:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.owner = make_user("owner")
+        self.manager = make_user("manager")
+        self.member = make_user("member")
+        self.project = make_project(self.owner)
+        self.team = Team.objects.create(domain_name="team", productowner_userid=self.owner)
+
+    def assert_in_sync(self):
+        assert project_access.verify() == (set(), set())
+
+    def test_project_owner_row(self):
+        assert access_rows(self.project) == {(self.owner.id, self.project.id, 'owner')}
+
+        self.project.owner_id = self.member
+        self.project.save()
+        assert access_rows(self.project) == {(self.member.id, self.project.id, 'owner')}
+
+    def test_linking_team_grants_roles(self):
+        self.team.members.add(self.member)
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+
+        assert access_rows(self.project) == {
+            (self.owner.id, self.project.id, 'owner'),
+            (self.owner.id, self.project.id, 'product_owner'),
+            (self.member.id, self.project.id, 'member'),
+        }
+
+    def test_members_added_and_removed(self):
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+
+        self.team.members.add(self.member)
+        assert (self.member.id, self.project.id, 'member') in access_rows()
+
+        self.team.members.remove(self.member)
+        assert (self.member.id, self.project.id, 'member') not in access_rows()
+
+        self.member.team_members.add(self.team)
+        assert (self.member.id, self.project.id, 'member') in access_rows()
+
+        self.member.team_members.clear()
+        assert (self.member.id, self.project.id, 'member') not in access_rows()
+        self.assert_in_sync()
+
+    def test_manager_change(self):
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+        self.team.projectmanager_userid = self.manager
+        self.team.save()
+        assert (self.manager.id, self.project.id, 'project_manager') in access_rows()
+
+        self.team.projectmanager_userid = None
+        self.team.save()
+        assert (self.manager.id, self.project.id, 'project_manager') not in access_rows()
+
+    def test_unlinking_and_deleting(self):
+        self.team.members.add(self.member)
+        link = ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+
+        link.delete()
+        assert access_rows(self.project) == {(self.owner.id, self.project.id, 'owner')}
+
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+        self.team.delete()
+        assert access_rows(self.project) == {(self.owner.id, self.project.id, 'owner')}
+
+        self.project.delete()
+        assert access_rows() == set()
+
+    def test_user_delete(self):
+        self.team.members.add(self.member)
+        ProjectTeam.objects.create(team_id=self.team, project_id=self.project)
+
+        self.member.delete()
+        self.assert_in_sync()
+
+        self.owner.delete()
+        assert access_rows() == set()
+
+#Testing - rebuild_project_access command
+@pytest.mark.django_db
+def test_rebuild_and_verify_command(capsys, make_user, make_project):
+    owner = make_user("owner")
+    member = make_user("member")
+    project = make_project(owner)
+    team = Team.objects.create(domain_name="team", productowner_userid=owner)
+    team.members.add(member)
+    ProjectTeam.objects.create(team_id=team, project_id=project)
+
+    UserProjectAccess.objects.filter(user_id=member).delete()
+    UserProjectAccess.objects.create(user_id=member, project_id=project, role='owner')
+
+    with pytest.raises(CommandError):
+        call_command('rebuild_project_access', '--verify')
+    output = capsys.readouterr().out
+    assert "missing" in output and "stale" in output
+
+    call_command('rebuild_project_access')
+    assert "1 added, 1 removed" in capsys.readouterr().out
+
+    call_command('rebuild_project_access', '--verify')
+    assert "up to date" in capsys.readouterr().out
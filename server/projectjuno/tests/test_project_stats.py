@@ -0,0 +1,156 @@
+import pytest
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from junoapi.models import Project, Task
+from junoapi import project_stats
+
+def make_task(project, author, status="To Do", priority="Medium", points=None, due_in=5, assigned=None):
+    return Task.objects.create(
+        title="Task",
+        description="desc",
+        status=status,
+        priority=priority,
+        start_date=timezone.now(),
+        due_date=timezone.now() + timedelta(days=due_in),
+        points=points,
+        project_id=project,
+        author_userid=author,
+        assigned_userid=assigned
+    )
+
+@pytest.mark.django_db
+class TestProjectStats:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("owner")
+        self.dev = make_user("dev")
+        self.project = make_project(self.user)
+
+        make_task(self.project, self.user, "Completed", "High", points=5, due_in=-3, assigned=self.dev)
+        make_task(self.project, self.user, "To Do", "High", points=3, due_in=-1, assigned=self.dev)
+        make_task(self.project, self.user, "Work In Progress", "Low", points=2, assigned=self.user)
+        make_task(self.project, self.user, "To Do", "Low")
+
+    def test_aggregates(self):
+        stats = project_stats.compute([self.project.id])[self.project.id]
+
+        assert stats['tasks'] == 4
+        assert stats['by_status'] == {"Completed": 1, "To Do": 2, "Work In Progress": 1}
+        assert stats['by_priority'] == {"High": 2, "Low": 2}
+        assert stats['points'] == {'total': 10, 'remaining': 5}
+        #the completed task is past due but done
+        assert stats['overdue'] == 1
+        assert stats['assignees'] == [
+            {'assigned_userid': self.dev.id, 'tasks': 2, 'open': 1, 'remaining_points': 3},
+            {'assigned_userid': self.user.id, 'tasks': 1, 'open': 1, 'remaining_points': 2},
+            {'assigned_userid': None, 'tasks': 1, 'open': 1, 'remaining_points': 0},
+        ]
+
+    def test_empty_project(self, make_project):
+        empty = make_project(self.user, "Empty")
+
+        stats = project_stats.get_project_stats([empty.id])[empty.id]
+        assert stats['tasks'] == 0
+        assert stats['assignees'] == []
+
+    def test_cached_until_task_write(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert project_stats.get_project_stats([self.project.id])[self.project.id]['tasks'] == 4
+        with django_assert_num_queries(0):
+            assert project_stats.get_project_stats([self.project.id])[self.project.id]['tasks'] == 4
+
+        task = make_task(self.project, self.user, "Completed", points=1)
+        assert project_stats.get_project_stats([self.project.id])[self.project.id]['tasks'] == 5
+
+        task.delete()
+        assert project_stats.get_project_stats([self.project.id])[self.project.id]['tasks'] == 4
+
+    def test_moved_task_bumps_both_projects(self, make_project):
+        other = make_project(self.user, "Other")
+        project_stats.get_project_stats([self.project.id, other.id])
+
+        task = Task.objects.filter(project_id=self.project).first()
+        task.project_id = other
+        task.save()
+
+        stats = project_stats.get_project_stats([self.project.id, other.id])
+        assert stats[self.project.id]['tasks'] == 3
+        assert stats[other.id]['tasks'] == 1
+
+        #and back again, from the instance that was just saved
+        task.project_id = self.project
+        task.save()
+        stats = project_stats.get_project_stats([self.project.id, other.id])
+        assert stats[self.project.id]['tasks'] == 4
+        assert stats[other.id]['tasks'] == 0
+
+    def test_bulk_update_bumps_generation(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        project_stats.get_project_stats([self.project.id])
+
+        task_ids = Task.objects.filter(project_id=self.project).values_list('id', flat=True)
+        client.patch(reverse('bulk-update-tasks'), [{"id": task_id, "status": "Completed"} for task_id in task_ids], format='json')
+
+        stats = project_stats.get_project_stats([self.project.id])[self.project.id]
+        assert stats['by_status'] == {"Completed": 4}
+        assert stats['points']['remaining'] == 0
+
+    def test_many_projects_one_query(self, django_assert_num_queries, make_project):
+        projects = [make_project(self.user, f"Project {i}") for i in range(3)]
+        for project in projects:
+            make_task(project, self.user)
+
+        with django_assert_num_queries(1):
+            stats = project_stats.get_project_stats([project.id for project in projects] + [self.project.id])
+        assert [stats[project.id]['tasks'] for project in projects] == [1, 1, 1]
+
+@pytest.mark.django_db
+class TestProjectStatsViews:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("owner")
+        self.other_user = make_user("other")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = make_project(self.user)
+        self.hidden_project = make_project(self.other_user, "Hidden")
+        make_task(self.project, self.user, points=3)
+        make_task(self.hidden_project, self.other_user)
+
+    def test_project_stats(self):
+        response = self.client.get(reverse('project-stats', args=[self.project.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['project_id'] == self.project.id
+        assert response.data['points'] == {'total': 3, 'remaining': 3}
+
+    def test_inaccessible_project(self):
+        response = self.client.get(reverse('project-stats', args=[self.hidden_project.id]))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = self.client.get(reverse('project-stats', args=[999999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_multi_project_stats(self):
+        response = self.client.get(reverse('multi-project-stats'))
+        assert [stats['project_id'] for stats in response.data] == [self.project.id]
+
+        url = reverse('multi-project-stats') + f"?ids={self.project.id},{self.hidden_project.id}"
+        response = self.client.get(url)
+        assert [stats['project_id'] for stats in response.data] == [self.project.id]
+
+        response = self.client.get(reverse('multi-project-stats') + "?ids=abc")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauth_project_stats(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse('project-stats', args=[self.project.id]))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from junoapi import outbox, realtime
+from junoapi.models import Attachment, Comment, ProjectTeam, Team
+from junoapi.realtime import project_group, user_group
+from junoapi.routing import websocket_urlpatterns
+from tests.test_search import make_task
+
+@pytest.fixture(autouse=True)
+def in_memory_layer(settings):
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+def subscribe(group):
+    layer = get_channel_layer()
+    channel = async_to_sync(layer.new_channel)()
+    async_to_sync(layer.group_add)(group, channel)
+
+    async def receive(timeout=1):
+        return (await asyncio.wait_for(layer.receive(channel), timeout))['event']
+
+    def relay_and_receive(timeout=1):
+        outbox.relay()
+        return async_to_sync(receive)(timeout)
+    return relay_and_receive
+
+#Testing - events recorded by the write paths and relayed from the outbox
+@pytest.mark.django_db
+class TestChangeEvents:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("author")
+        self.client.force_authenticate(user=self.user)
+        self.project = make_project(self.user, "Events")
+        self.task = make_task(self.project, self.user, "Ship it")
+
+    def test_task_created(self):
+        receive = subscribe(project_group(self.project.id))
+        payload = {
+            "title": "New", "description": "desc", "status": "To Do", "priority": "High",
+            "start_date": "2026-01-01T00:00:00Z", "project_id": self.project.id, "author_userid": self.user.id,
+        }
+        response = self.client.post(reverse("create-list-tasks"), payload, format='json')
+
+        event = receive()
+        assert event['type'] == 'task.created'
+        assert event['project_id'] == self.project.id
+        assert event['task']['id'] == response.data['id']
+        assert event['task']['start_date'] == "2026-01-01T00:00:00Z"
+        assert 'comment' not in event['task']
+
+    def test_status_moved(self):
+        receive = subscribe(project_group(self.project.id))
+        self.client.patch(reverse("update-task-status", args=[self.task.id]), {"status": "Completed"}, format='json')
+
+        assert receive() == {
+            'type': 'task.status', 'id': self.task.id, 'from': "To Do", 'to': "Completed", 'project_id': self.project.id
+        }
+
+    def test_bulk_changes(self):
+        receive = subscribe(project_group(self.project.id))
+        changes = [{"id": self.task.id, "priority": "Low", "points": 8}]
+        self.client.patch(reverse("bulk-update-tasks"), changes, format='json')
+
+        assert receive() == {
+            'type': 'task.updated', 'id': self.task.id, 'changes': {'priority': "Low", 'points': 8}, 'project_id': self.project.id
+        }
+
+    def test_no_event_without_changes(self):
+        receive = subscribe(project_group(self.project.id))
+        self.client.patch(reverse("update-task-status", args=[self.task.id]), {"status": "To Do"}, format='json')
+
+        with pytest.raises(TimeoutError):
+            receive(timeout=0.1)
+
+    def test_task_deleted(self):
+        receive = subscribe(project_group(self.project.id))
+        task_id = self.task.id
+        self.client.delete(reverse("delete-task", args=[task_id]))
+
+        assert receive() == {'type': 'task.deleted', 'id': task_id, 'project_id': self.project.id}
+
+    def test_comment_added(self):
+        receive = subscribe(project_group(self.project.id))
+        self.client.post(reverse('list-create-comment', args=[self.task.id]), {"text": "Looks good"}, format='json')
+
+        comment = Comment.objects.get(task_id=self.task)
+        assert receive() == {
+            'type': 'comment.added',
+            'task_id': self.task.id,
+            'comment': {'id': comment.id, 'text': "Looks good", 'user_id': self.user.id, 'username': "author"},
+            'project_id': self.project.id,
+        }
+
+    def test_comment_deleted(self):
+        comment = Comment.objects.create(task_id=self.task, user_id=self.user, text="Typo")
+        receive = subscribe(project_group(self.project.id))
+        self.client.delete(reverse('delete-comment', args=[self.task.id, comment.id]))
+
+        assert receive() == {'type': 'comment.deleted', 'id': comment.id, 'task_id': self.task.id, 'project_id': self.project.id}
+
+    def test_attachment_added(self):
+        receive = subscribe(project_group(self.project.id))
+        payload = {"file_name": "spec.pdf", "file_url": "https://files.example/spec.pdf"}
+        self.client.post(f"/api/tasks/{self.task.id}/attachments/?user_id={self.user.id}", payload, format='json')
+
+        attachment = Attachment.objects.get(task_id=self.task)
+        event = receive()
+        assert event['type'] == 'attachment.added'
+        assert event['attachment']['id'] == attachment.id
+        assert event['task_id'] == self.task.id
+
+    def test_access_changed(self, make_user):
+        teammate = make_user("teammate")
+        team = Team.objects.create(domain_name="core", productowner_userid=self.user)
+        ProjectTeam.objects.create(team_id=team, project_id=self.project)
+        receive = subscribe(user_group(teammate.id))
+        outbox.relay()
+
+        self.client.patch(reverse('add-team-member', args=[team.id]), {"members": ["teammate"]}, format='json')
+
+        assert receive() == {'type': 'access.changed'}
+
+    def test_failed_write_sends_nothing(self):
+        receive = subscribe(project_group(self.project.id))
+        self.client.post(reverse('list-create-comment', args=[999]), {"text": "Lost"}, format='json')
+
+        with pytest.raises(TimeoutError):
+            receive(timeout=0.1)
+
+#Testing - the websocket consumer (committed rows, the consumer queries from its own thread)
+@pytest.mark.django_db(transaction=True)
+class TestProjectEventsConsumer:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("watcher")
+        self.owner = make_user("owner")
+        self.project = make_project(self.user, "Visible")
+        self.hidden = make_project(self.owner, "Hidden")
+        #the owners' own access events, published before anyone connects
+        outbox.relay()
+
+    def connect(self, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/events/")
+        communicator.scope['user'] = user
+        return communicator
+
+    def test_rejects_anonymous(self):
+        async def run():
+            communicator = self.connect(AnonymousUser())
+            connected, code = await communicator.connect()
+            assert not connected
+            assert code == 4401
+        async_to_sync(run)()
+
+    def test_receives_accessible_project_events(self):
+        async def run():
+            communicator = self.connect(self.user)
+            connected, _ = await communicator.connect()
+            assert connected
+
+            hidden_task = await database_sync_to_async(make_task)(self.hidden, self.owner, "Secret")
+            task = await database_sync_to_async(make_task)(self.project, self.user, "Visible work")
+            for user, changed in ((self.owner, hidden_task), (self.user, task)):
+                client = APIClient()
+                client.force_authenticate(user=user)
+                await database_sync_to_async(client.patch)(
+                    reverse("update-task-status", args=[changed.id]), {"status": "Completed"}, format='json'
+                )
+            await database_sync_to_async(outbox.relay)()
+
+            event = await communicator.receive_json_from()
+            assert event == {'type': 'task.status', 'id': task.id, 'from': "To Do", 'to': "Completed", 'project_id': self.project.id}
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+        async_to_sync(run)()
+
+    def test_resubscribes_when_access_changes(self):
+        async def run():
+            communicator = self.connect(self.user)
+            connected, _ = await communicator.connect()
+            assert connected
+
+            def share_hidden_project():
+                team = Team.objects.create(domain_name="shared", productowner_userid=self.owner)
+                ProjectTeam.objects.create(team_id=team, project_id=self.hidden)
+                team.members.add(self.user)
+                outbox.relay()
+            await database_sync_to_async(share_hidden_project)()
+            assert await communicator.receive_json_from() == {'type': 'access.changed'}
+
+            def create_task():
+                task = make_task(self.hidden, self.owner, "Now visible")
+                realtime.task_created(task)
+                outbox.relay()
+                return task
+            task = await database_sync_to_async(create_task)()
+            event = await communicator.receive_json_from()
+            assert event['type'] == 'task.created'
+            assert event['task']['id'] == task.id
+            await communicator.disconnect()
+        async_to_sync(run)()
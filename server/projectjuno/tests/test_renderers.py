@@ -0,0 +1,157 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import msgpack
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from junoapi.models import Attachment, Comment, Project, Task
+from junoapi.parsers import ORJSONParser
+from junoapi.renderers import ColumnarJSONRenderer, MessagePackRenderer, ORJSONRenderer, columns
+
+User = get_user_model()
+
+PAYLOADS = [
+    None,
+    [],
+    {"text": 'say "hi" \\ back\nline\ttab \x01\x7f é ☃ 🚀 \u2028\u2029 </script>', "empty": "", "none": None},
+    {"flags": [True, False], "ints": [0, -1, 2 ** 53], "floats": [0.1, 2.5, -3.75]},
+    {"price": Decimal("12.50"), "label": gettext_lazy("Completed"), "elapsed": timedelta(hours=1, seconds=3)},
+    {
+        "utc": datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        "micros": datetime(2026, 1, 2, 3, 4, 5, 120, tzinfo=dt_timezone.utc),
+        "offset": datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone(timedelta(hours=2))),
+        "naive": datetime(2026, 1, 2, 3, 4, 5),
+        "day": date(2026, 1, 2),
+        "clock": time(3, 4, 5),
+    },
+    {1: "int key", "id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    ReturnList([{"nested": {"deeper": [1, {"x": None}]}}], serializer=None),
+]
+
+#Testing - orjson rendering matches DRF's JSONRenderer byte for byte
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_same_bytes_as_json_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+def test_indent_falls_back_to_stdlib():
+    data = {"a": [1, 2]}
+    media_type = 'application/json; indent=4'
+    assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+    assert ORJSONRenderer().render(data, renderer_context={'indent': 2}) == b'{\n  "a": [\n    1,\n    2\n  ]\n}'
+
+def test_msgpack_uses_drf_encoder():
+    data = {"price": Decimal("12.50"), "label": gettext_lazy("Completed"), 1: [None, True]}
+    assert msgpack.unpackb(MessagePackRenderer().render(data), strict_map_key=False) == {"price": 12.5, "label": "Completed", 1: [None, True]}
+
+def test_columns():
+    assert columns([]) == {}
+    assert columns([{"id": 1, "tags": [1]}, {"id": 2, "tags": []}]) == {"id": [1, 2], "tags": [[1], []]}
+    assert ColumnarJSONRenderer().render({"detail": "Not found."}) == b'{"detail":"Not found."}'
+
+def test_parser():
+    body = '{"title": "Ünïcode", "points": 3, "tags": null}'.encode()
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b'{"title": '))
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b'{"points": NaN}'))
+
+def test_parser_other_charsets():
+    body = '{"title": "café"}'.encode('latin-1')
+    assert ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'}) == {"title": "café"}
+
+#Testing - content negotiation
+@pytest.mark.django_db
+class TestNegotiation:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="renderer", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+    def test_json_by_default(self):
+        response = self.client.get("/api/users/")
+
+        assert response['Content-Type'] == 'application/json'
+        assert isinstance(response.accepted_renderer, ORJSONRenderer)
+
+    def test_browsable_api(self):
+        response = self.client.get("/api/users/", HTTP_ACCEPT='text/html')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/html')
+        assert b'renderer' in response.content
+
+    def test_invalid_json_body(self):
+        response = self.client.patch("/api/tasks/bulk/", b'[{"id": 1,', content_type='application/json')
+
+        assert response.status_code == 400
+        assert response.json()['detail'].startswith('JSON parse error')
+
+#Testing - msgpack and columnar JSON on the bulk list endpoints
+@pytest.mark.django_db
+class TestBulkFormats:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="bulk", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            name="Bulk", description="desc", start_date=timezone.now(), due_date=timezone.now(), owner_id=self.user
+        )
+        for i in range(3):
+            task = Task.objects.create(
+                title=f"Task {i}", description="desc", status="To Do", priority="High", points=i,
+                start_date=timezone.now(), project_id=self.project, author_userid=self.user, assigned_userid=self.user
+            )
+            Comment.objects.create(text=f"comment {i}", task_id=task, user_id=self.user)
+            Attachment.objects.create(file_url="https://example.com/a.pdf", file_name="a.pdf", task_id=task, uploadedby_id=self.user)
+        self.urls = [
+            reverse("create-list-tasks") + f"?project_id={self.project.id}&ordering=id",
+            reverse("get-user-tasks", args=[self.user.id]) + "?ordering=id",
+            reverse("project-list"),
+        ]
+
+    def test_msgpack_same_data_as_json(self):
+        for url in self.urls:
+            expected = self.client.get(url).json()
+            response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+
+            assert response['Content-Type'] == 'application/msgpack'
+            assert expected and msgpack.unpackb(response.content) == expected
+
+    def test_columnar(self):
+        for url in self.urls:
+            rows = self.client.get(url).json()
+            separator = '&' if '?' in url else '?'
+            response = self.client.get(url + separator + 'format=columnar')
+
+            assert response['Content-Type'] == 'application/json'
+            table = response.json()
+            assert list(table) == list(rows[0])
+            assert [dict(zip(table, values)) for values in zip(*table.values())] == rows
+
+    def test_columnar_page(self):
+        response = self.client.get(reverse("create-list-tasks"), {"project_id": self.project.id, "page_size": 2, "format": "columnar"})
+
+        body = response.json()
+        assert body["next"] and body["previous"] is None
+        assert len(body["results"]["id"]) == 2
+
+    def test_json_stays_the_default(self):
+        response = self.client.get(self.urls[0])
+        assert response.json()[0]["title"] == "Task 0"
+
+    def test_other_views_do_not_offer_them(self):
+        assert self.client.get("/api/users/", {"format": "columnar"}).status_code == 404
+        assert self.client.get("/api/users/", HTTP_ACCEPT='application/msgpack').status_code == 406
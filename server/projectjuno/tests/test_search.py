@@ -0,0 +1,221 @@
+import pytest
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from junoapi.models import Comment, ProjectTeam, Task, Team
+from junoapi.search import SEARCH_CONFIG, search_projects, search_tasks, search_users, word_similarity_threshold
+
+def make_task(project, author, title="Task", description="desc"):
+    return Task.objects.create(
+        title=title,
+        description=description,
+        status="To Do",
+        priority="High",
+        start_date=timezone.now(),
+        project_id=project,
+        author_userid=author
+    )
+
+def lexemes(instance):
+    instance.refresh_from_db(fields=['search_vector'])
+    return {token.split(':')[0].strip("'") for token in instance.search_vector.split()}
+
+#Testing - trigger maintained search vectors
+@pytest.mark.django_db
+class TestSearchVectors:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("owner")
+        self.project = make_project(self.user, "Payments", "Checkout and invoicing")
+        self.task = make_task(self.project, self.user, "Refund flow", "Handle partial refunds")
+
+    def test_set_on_insert(self):
+        assert {"refund", "flow", "handl", "partial"} <= lexemes(self.task)
+        assert {"payment", "checkout", "invoic"} <= lexemes(self.project)
+
+    def test_updated_with_text(self):
+        self.task.title = "Chargeback flow"
+        self.task.save()
+
+        assert "chargeback" in lexemes(self.task)
+        assert "handl" in lexemes(self.task)
+
+    def test_untouched_by_other_columns(self):
+        Task.objects.filter(id=self.task.id).update(status="Completed")
+
+        assert "refund" in lexemes(self.task)
+
+    def test_full_text_match(self):
+        query = SearchQuery("refunds", config=SEARCH_CONFIG, search_type='websearch')
+        assert list(Task.objects.filter(search_vector=query)) == [self.task]
+
+#Testing - search queries
+@pytest.mark.django_db
+class TestSearch:
+    @pytest.fixture(autouse=True)
+    def threshold(self):
+        with word_similarity_threshold():
+            yield
+
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("katherine")
+        make_user("bob")
+        self.project = make_project(self.user, "Mobile app", "Release planning")
+        self.task = make_task(self.project, self.user, "Onboarding screens", "Design the signup flow")
+        make_task(self.project, self.user, "Billing", "Invoices")
+
+    def test_word_similarity(self):
+        assert list(search_users("kath")) == [self.user]
+        assert list(search_tasks("onbording")) == [self.task]
+        assert list(search_projects("mobil")) == [self.project]
+
+    def test_full_text(self):
+        assert list(search_tasks("signing up flows")) == [self.task]
+
+    def test_empty_query(self):
+        assert not search_tasks("").exists()
+
+
+    def test_index_backed(self, make_project):
+        project = make_project(self.user, "Bulk")
+        Task.objects.bulk_create([
+            Task(title=f"Task {i}", description=f"Description {i}", status="To Do", priority="Low",
+                 start_date=timezone.now(), project_id=project, author_userid=self.user)
+            for i in range(2000)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE task')
+            sql, params = search_tasks("onboarding").query.sql_with_params()
+            cursor.execute('EXPLAIN ' + sql, params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert 'Seq Scan' not in plan
+        assert 'task_title_trgm_idx' in plan
+        assert 'task_search_vector_idx' in plan
+
+#Testing - ranked, access scoped search endpoint
+@pytest.mark.django_db
+class TestSearchView:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("member")
+        self.owner = make_user("owner")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = make_project(self.user, "Onboarding revamp")
+        self.shared = make_project(self.owner, "Shared")
+        self.hidden = make_project(self.owner, "Onboarding hidden")
+        team = Team.objects.create(domain_name="team", productowner_userid=self.owner)
+        team.members.add(self.user)
+        ProjectTeam.objects.create(team_id=team, project_id=self.shared)
+
+        self.exact = make_task(self.project, self.user, "Onboarding", "Welcome screens")
+        self.partial = make_task(self.shared, self.owner, "Signup", "Onboarding emails for new accounts")
+        self.hidden_task = make_task(self.hidden, self.owner, "Onboarding", "Hidden work")
+
+        self.url = "/api/search/"
+
+    def search(self, **params):
+        return self.client.get(self.url, params)
+
+    def test_ranked_and_access_scoped(self):
+        response = self.search(q="onboarding")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.data['tasks']] == [self.exact.id, self.partial.id]
+        assert [project['id'] for project in response.data['projects']] == [self.project.id]
+        assert response.data['tasks'][0]['rank'] >= response.data['tasks'][1]['rank']
+
+    def test_slim_task_hits(self):
+        hit = self.search(q="onboarding", type="tasks").data['tasks'][0]
+
+        assert 'comment' not in hit and 'attachment' not in hit
+        assert hit['author'] == {'id': self.user.id, 'username': "member"}
+
+    def test_type_and_limit(self):
+        response = self.search(q="onboarding", type="tasks", limit=1)
+
+        assert set(response.data) == {'tasks'}
+        assert [task['id'] for task in response.data['tasks']] == [self.exact.id]
+
+    def test_invalid_params(self):
+        assert self.search(q="onboarding", type="labels").status_code == status.HTTP_400_BAD_REQUEST
+        assert self.search(q="onboarding", limit="0").status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_empty_query(self):
+        response = self.search(q="  ")
+        assert response.data == {'users': [], 'tasks': [], 'projects': [], 'comments': []}
+
+    def test_unauth_search(self):
+        self.client.force_authenticate(user=None)
+        assert self.search(q="onboarding").status_code == status.HTTP_403_FORBIDDEN
+
+#Testing - comment search, full text only
+@pytest.mark.django_db
+class TestCommentSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("member")
+        self.owner = make_user("owner")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = make_project(self.user, "Mine")
+        self.hidden = make_project(self.owner, "Hidden")
+        self.task = make_task(self.project, self.user, "Signup")
+        self.exact = Comment.objects.create(text="Deploying R&D release for 2 < 3 teams", task_id=self.task, user_id=self.user)
+        self.weak = Comment.objects.create(
+            text="Notes from standup about several things, one of them was a release", task_id=self.task, user_id=self.user
+        )
+        Comment.objects.create(text="Release it", task_id=make_task(self.hidden, self.owner), user_id=self.owner)
+        Comment.objects.create(text="Unrelated", task_id=self.task, user_id=self.user)
+
+    def test_hits_with_headline(self):
+        response = self.client.get("/api/search/", {'q': "releases", 'type': "comments"})
+
+        assert response.status_code == status.HTTP_200_OK
+        hits = response.data['comments']
+        assert [hit['id'] for hit in hits] == [self.exact.id, self.weak.id]
+        assert hits[0]['task_id'] == self.task.id
+        assert hits[0]['project_id'] == self.project.id
+        assert hits[0]['author'] == {'id': self.user.id, 'username': "member"}
+        assert hits[0]['headline'] == "Deploying R&amp;D <mark>release</mark> for 2 &lt; 3 teams"
+
+    def test_paginated(self):
+        url = "/api/search/comments/"
+        first = self.client.get(url, {'q': "release", 'page_size': 1})
+        second = self.client.get(first.data['next'])
+
+        assert first.data['count'] == 2
+        assert [hit['id'] for hit in first.data['results']] == [self.exact.id]
+        assert [hit['id'] for hit in second.data['results']] == [self.weak.id]
+        assert second.data['next'] is None
+
+    def test_best_hit_among_many_matches(self):
+        #every match is ranked, not just the first ones the index returns
+        Comment.objects.bulk_create(
+            Comment(text=f"Notes {i} from standup, one of them was a release", task_id=self.task, user_id=self.user)
+            for i in range(1000)
+        )
+        best = Comment.objects.create(text="Release release release", task_id=self.task, user_id=self.user)
+
+        response = self.client.get("/api/search/comments/", {'q': "release", 'page_size': 1})
+        assert response.data['count'] == 1003
+        assert [hit['id'] for hit in response.data['results']] == [best.id]
+
+    def test_follows_edits(self):
+        self.weak.text = "Nothing to see"
+        self.weak.save()
+
+        response = self.client.get("/api/search/comments/", {'q': "release"})
+        assert [hit['id'] for hit in response.data['results']] == [self.exact.id]
+
+    def test_unauth(self):
+        self.client.force_authenticate(user=None)
+        assert self.client.get("/api/search/comments/", {'q': "release"}).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,185 @@
+import pytest
+import threading
+from array import array
+
+from django.db import connection
+
+from junoapi.access import AccessContext
+from junoapi.models import Comment, ProjectTeam, Team
+from junoapi.ngram_index import NgramIndex, trigrams
+from junoapi.search_backends import InMemorySearchBackend, PostgresSearchBackend, get_search_backend, reset_search_backend
+from tests.test_search import make_task
+
+BACKENDS = {
+    'postgres': 'junoapi.search_backends.PostgresSearchBackend',
+    'memory': 'junoapi.search_backends.InMemorySearchBackend',
+}
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, settings, db):
+    settings.SEARCH_BACKEND = BACKENDS[request.param]
+    reset_search_backend()
+    yield get_search_backend()
+    reset_search_backend()
+
+def ids(hits):
+    return [hit.id for hit in hits]
+
+#Conformance suite - every SearchBackend must pass these
+@pytest.mark.django_db
+class TestSearchBackendConformance:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.user = make_user("katherine")
+        self.owner = make_user("bob")
+        self.access = AccessContext(self.user)
+
+        self.project = make_project(self.user, "Onboarding revamp")
+        self.shared = make_project(self.owner, "Shared")
+        self.hidden = make_project(self.owner, "Onboarding hidden")
+        team = Team.objects.create(domain_name="team", productowner_userid=self.owner)
+        team.members.add(self.user)
+        ProjectTeam.objects.create(team_id=team, project_id=self.shared)
+
+        self.exact = make_task(self.project, self.user, "Onboarding", "Welcome screens")
+        self.partial = make_task(self.shared, self.owner, "Signup", "Onboarding emails for new accounts")
+        self.hidden_task = make_task(self.hidden, self.owner, "Onboarding", "Hidden work")
+        make_task(self.project, self.user, "Billing", "Invoices")
+
+    def test_users(self, backend):
+        assert ids(backend.search_users("kath", 10)) == [self.user.id]
+
+    def test_typo_tolerant(self, backend):
+        assert ids(backend.search_tasks("onbording", self.access, 10))[0] == self.exact.id
+
+    def test_ranked_title_first(self, backend):
+        hits = list(backend.search_tasks("onboarding", self.access, 10))
+
+        assert ids(hits) == [self.exact.id, self.partial.id]
+        assert hits[0].rank >= hits[1].rank
+
+    def test_access_scoped(self, backend):
+        assert ids(backend.search_projects("onboarding", self.access, 10)) == [self.project.id]
+        assert self.hidden_task.id not in ids(backend.search_tasks("hidden", self.access, 10))
+
+    def test_limit(self, backend):
+        assert ids(backend.search_tasks("onboarding", self.access, 1)) == [self.exact.id]
+
+    def test_comments(self, backend):
+        comment = Comment.objects.create(text="Onboarding checklist", task_id=self.exact, user_id=self.user)
+        Comment.objects.create(text="Onboarding secrets", task_id=self.hidden_task, user_id=self.owner)
+
+        hits = list(backend.search_comments("onboarding", self.access))
+        assert ids(hits) == [comment.id]
+        assert hits[0].project_id == self.project.id
+
+    def test_empty_query(self, backend):
+        assert ids(backend.search_tasks("", self.access, 10)) == []
+
+    def test_slim_task_hits(self, backend):
+        hit = list(backend.search_tasks("onboarding", self.access, 1))[0]
+
+        assert hit.author_userid.username == "katherine"
+        assert hit.get_deferred_fields() >= {'points', 'search_vector'}
+
+    def test_follows_writes(self, backend, django_capture_on_commit_callbacks):
+        backend.search_tasks("roadmap", self.access, 10)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task = make_task(self.project, self.user, "Quarterly roadmap")
+        assert ids(backend.search_tasks("roadmap", self.access, 10)) == [task.id]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task.title = "Quarterly plan"
+            task.save()
+        assert ids(backend.search_tasks("roadmap", self.access, 10)) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task.delete()
+        assert ids(backend.search_tasks("quarterly", self.access, 10)) == []
+
+@pytest.mark.django_db
+def test_postgres_threshold_set_per_search(make_user):
+    user = make_user("katherine")
+    #whatever the session (or a pooled server connection) has set
+    with connection.cursor() as cursor:
+        cursor.execute("SET pg_trgm.word_similarity_threshold = 0.99")
+
+    assert ids(PostgresSearchBackend().search_users("kath", 10)) == [user.id]
+
+#Testing - in-memory backend snapshots
+@pytest.mark.django_db
+class TestInMemorySnapshots:
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user):
+        self.user = make_user("katherine")
+        self.backend = InMemorySearchBackend()
+        #the first build is waited for
+        assert ids(self.backend.search_users("kath", 10)) == [self.user.id]
+
+    def test_stale_index_rebuilt_in_background(self, settings, monkeypatch):
+        settings.SEARCH_MEMORY_INDEX_TTL = 0
+        builds, release = [], threading.Event()
+
+        def slow_rebuild():
+            builds.append(threading.current_thread().name)
+            release.wait(5)
+        monkeypatch.setattr(self.backend, 'rebuild', slow_rebuild)
+
+        #both searches are served from the stale snapshot, and only one build is started
+        assert ids(self.backend.search_users("kath", 10)) == [self.user.id]
+        assert ids(self.backend.search_users("kath", 10)) == [self.user.id]
+        release.set()
+        with self.backend._build_lock:
+            assert builds == ['search-index-build']
+
+    def test_writes_swap_the_snapshot(self, make_user):
+        before = self.backend._current()
+        other = make_user("kathy")
+        self.backend.update(other)
+        self.backend.remove(type(self.user), self.user.id)
+
+        assert ids(self.backend.search_users("kath", 10)) == [other.id]
+        #a search holding the old snapshot is not affected
+        assert before.changes == {}
+
+    def test_many_writes_rebuild_early(self, settings, monkeypatch, make_user):
+        settings.SEARCH_MEMORY_INDEX_MAX_CHANGES = 1
+        rebuilds = []
+        monkeypatch.setattr(self.backend, '_rebuild_in_background', lambda: rebuilds.append(1))
+
+        self.backend.update(make_user("kathy"))
+        assert rebuilds == []
+        self.backend.update(make_user("kathleen"))
+        assert rebuilds == [1]
+
+#Testing - n-gram index
+def test_trigrams_match_pg_trgm_padding():
+    assert trigrams("Hi there") == {"  h", " hi", "hi ", "  t", " th", "the", "her", "ere", "re "}
+
+def test_ngram_index_updates():
+    index = NgramIndex()
+    index.add(1, "onboarding")
+    index.add(2, "billing")
+
+    assert set(index.similarities("onboard", 0.5)) == {1}
+    assert all(isinstance(posting, array) for posting in index._postings)
+
+    index.add(1, "invoices")
+    assert index.similarities("onboard", 0.5) == {}
+    assert set(index.similarities("invoice", 0.5)) == {1}
+
+    index.remove(1)
+    assert index.similarities("invoice", 0.5) == {}
+    assert len(index) == 1
+
+def test_ngram_index_bigint_ids():
+    rows = [(2**40, "onboarding"), (3, "onboard")]
+    assert set(NgramIndex.build(rows).similarities("onboard", 0.5)) == {3, 2**40}
+
+    index = NgramIndex()
+    index.add(2**40, "onboarding")
+    index.add(3, "onboarding")
+    assert set(index.similarities("onboard", 0.5)) == {3, 2**40}
+    index.remove(2**40)
+    assert set(index.similarities("onboard", 0.5)) == {3}
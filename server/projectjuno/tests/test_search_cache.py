@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth.models import Group
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from junoapi import search_cache
+from junoapi.access import ADMIN_GROUP, AccessContext
+from junoapi.search_fanout import CategoryTimeout
+from junoapi.search_backends import reset_search_backend
+from tests.test_search import make_task
+
+def test_normalize():
+    assert search_cache.normalize("  Onboarding\tREVAMP ") == search_cache.normalize("onboarding revamp")
+    assert search_cache.normalize("Ｏｎｂｏａｒｄｉｎｇ") == "onboarding"
+
+#Testing - cached api/search/ results
+@pytest.mark.django_db
+class TestSearchCache:
+    @pytest.fixture(autouse=True)
+    def memory_backend(self, settings):
+        settings.SEARCH_BACKEND = 'junoapi.search_backends.InMemorySearchBackend'
+        reset_search_backend()
+        search_cache.reset_stats()
+        yield
+        reset_search_backend()
+
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("onboarder")
+        self.client.force_authenticate(user=self.user)
+        self.project = make_project(self.user, "Onboarding revamp")
+        self.task = make_task(self.project, self.user, "Onboarding", "Welcome screens")
+
+    def search(self, q, **params):
+        return self.client.get("/api/search/", {'q': q, **params}).data
+
+    def test_repeat_is_served_from_cache(self, django_assert_num_queries):
+        first = self.search("onboarding")
+
+        #only the access scope is read
+        with django_assert_num_queries(1):
+            again = self.search("  ONBOARDING ")
+
+        assert again == first
+        assert [task['id'] for task in again['tasks']] == [self.task.id]
+        assert search_cache.stats() == {'hits': 4, 'misses': 4, 'coalesced': 0, 'hit_rate': 0.5}
+
+    def test_limit_and_type_share_per_category_entries(self):
+        self.search("onboarding", type="tasks")
+        self.search("onboarding", type="tasks,projects")
+        self.search("onboarding", type="tasks", limit=1)
+
+        assert search_cache.stats()['hits'] == 1
+        assert search_cache.stats()['misses'] == 3
+
+    def test_writes_retire_results(self, django_capture_on_commit_callbacks):
+        self.search("onboarding")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task = make_task(self.project, self.user, "Onboarding checklist")
+        assert task.id in [hit['id'] for hit in self.search("onboarding")['tasks']]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.task.delete()
+        assert self.task.id not in [hit['id'] for hit in self.search("onboarding")['tasks']]
+
+    def test_scoped_by_project_access(self, make_user):
+        stranger = make_user("stranger")
+        same_access = AccessContext(self.user)
+        keys = search_cache.result_keys("onboarding", AccessContext(self.user), ['tasks', 'users'], 10)
+        other = search_cache.result_keys("onboarding", AccessContext(stranger), ['tasks', 'users'], 10)
+
+        assert search_cache.result_keys("onboarding", same_access, ['tasks', 'users'], 10) == keys
+        assert other['tasks'] != keys['tasks']
+        assert other['users'] == keys['users']
+
+        self.search("onboarding")
+        self.client.force_authenticate(user=stranger)
+        assert self.search("onboarding")['tasks'] == []
+
+    def test_searches_the_normalized_query(self):
+        #what is cached for one spelling is what the other would have found
+        assert self.search("ＯＮＢＯＡＲＤＩＮＧ") == self.search("  onboarding ")
+        assert [task['id'] for task in self.search("ＯＮＢＯＡＲＤＩＮＧ")['tasks']] == [self.task.id]
+
+    def test_empty_query_not_cached(self):
+        self.search("")
+        assert search_cache.stats()['misses'] == 0
+
+    def test_stats_admin_only(self):
+        url = "/api/search/cache-stats/"
+        assert self.client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        self.user.is_staff = True
+        self.user.save()
+        assert self.client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        self.user.groups.add(Group.objects.get_or_create(name=ADMIN_GROUP)[0])
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'hits', 'misses', 'coalesced', 'hit_rate'}
+
+#Testing - single flight
+def test_concurrent_misses_compute_once(settings):
+    search_cache.reset_stats()
+    key = f"test-single-flight:{time.monotonic()}"
+    calls = []
+
+    def slow_search():
+        calls.append(1)
+        time.sleep(0.2)
+        return [{'id': 1}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(search_cache.compute(key, slow_search))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [[{'id': 1}]] * 5
+    assert search_cache.stats()['coalesced'] == 4
+
+def test_waiter_gives_up_within_its_budget():
+    key = f"test-give-up:{time.monotonic()}"
+    started = threading.Event()
+
+    def slow_search():
+        started.set()
+        time.sleep(0.5)
+        return [{'id': 1}]
+
+    owner = threading.Thread(target=search_cache.compute, args=(key, slow_search))
+    owner.start()
+    started.wait()
+
+    calls = []
+    start = time.monotonic()
+    with pytest.raises(CategoryTimeout):
+        search_cache.compute(key, lambda: calls.append(1), wait=0.1)
+    assert time.monotonic() - start < 0.3
+    assert calls == []
+    #the owner's lock is still in place
+    assert search_cache._cache().get(f"{search_cache.LOCK_PREFIX}:{key}") is not None
+    owner.join()
+
+def test_only_the_owner_unlocks():
+    cache = search_cache._cache()
+    lock_key = f"{search_cache.LOCK_PREFIX}:test-unlock:{time.monotonic()}"
+    cache.set(lock_key, 1234, timeout=5)
+
+    search_cache._unlock(cache, lock_key, 4321)
+    assert cache.get(lock_key) == 1234
+    search_cache._unlock(cache, lock_key, 1234)
+    assert cache.get(lock_key) is None
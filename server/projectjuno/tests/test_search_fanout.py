@@ -0,0 +1,169 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from junoapi.search_backends import reset_search_backend
+from junoapi.search_fanout import (
+    CategoryTimeout, _in_worker, get_executor, local_budget, run_categories, run_serially, wait_categories
+)
+from tests.test_search import make_task
+
+def slow(seconds, result):
+    def run():
+        time.sleep(seconds)
+        return result
+    return run
+
+def thread_name():
+    return threading.current_thread().name
+
+def sleep_in_db():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_sleep(2)')
+    return ['u']
+
+def current_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('statement_timeout')")
+        return cursor.fetchone()[0]
+
+#Testing - running categories side by side
+@pytest.mark.django_db
+class TestRunCategories:
+    @pytest.fixture(autouse=True)
+    def budgets(self, settings):
+        settings.SEARCH_TIMEOUTS = {'users': 0.2, 'tasks': 1.0}
+
+    def test_overlapping(self):
+        start = time.monotonic()
+        results, timed_out = wait_categories({'users': slow(0.15, ['u']), 'tasks': slow(0.15, ['t'])})
+
+        assert results == {'users': ['u'], 'tasks': ['t']}
+        assert timed_out == []
+        assert time.monotonic() - start < 0.28
+
+    def test_late_category_is_partial(self):
+        start = time.monotonic()
+        results, timed_out = wait_categories({'users': slow(0.5, ['u']), 'tasks': slow(0.05, ['t'])})
+
+        assert results == {'users': [], 'tasks': ['t']}
+        assert timed_out == ['users']
+        assert time.monotonic() - start < 0.45
+
+    def test_budget_starts_with_the_category(self, settings):
+        #every pool thread busy for a while: queueing does not count against the budgets
+        settings.SEARCH_TIMEOUTS = {'users': 0.2, 'tasks': 0.2}
+        for _ in range(get_executor()._max_workers):
+            get_executor().submit(time.sleep, 0.3)
+
+        results, timed_out = wait_categories({'users': slow(0.05, ['u']), 'tasks': slow(0.05, ['t'])})
+        assert results == {'users': ['u'], 'tasks': ['t']}
+        assert timed_out == []
+
+    def test_statement_timeout_cancels_query(self, settings):
+        settings.SEARCH_TIMEOUTS = {'users': 0.1}
+
+        start = time.monotonic()
+        with pytest.raises(CategoryTimeout):
+            get_executor().submit(_in_worker, 'users', sleep_in_db).result()
+        assert time.monotonic() - start < 1
+
+    def test_serial_search_within_budget(self, settings):
+        settings.SEARCH_TIMEOUTS = {'users': 0.1}
+
+        start = time.monotonic()
+        assert run_serially({'users': sleep_in_db}) == ({'users': []}, ['users'])
+        assert time.monotonic() - start < 1
+
+    def test_local_budget_is_restored(self, settings):
+        settings.SEARCH_TIMEOUTS = {'users': 0.1}
+        before = current_statement_timeout()
+
+        with local_budget('users'):
+            assert current_statement_timeout() == '100ms'
+        assert current_statement_timeout() == before
+        #and the transaction is still usable after a cancelled query
+        with pytest.raises(CategoryTimeout):
+            with local_budget('users'):
+                sleep_in_db()
+        assert current_statement_timeout() == before
+
+    def test_serial_inside_transaction(self):
+        #the test transaction is open, so the pool is skipped
+        results, _ = run_categories({'users': thread_name, 'tasks': thread_name})
+        assert set(results.values()) == {threading.current_thread().name}
+
+    def test_errors_propagate(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            wait_categories({'users': fail, 'tasks': lambda: []})
+
+#Testing - outside a transaction, as in a request
+@pytest.mark.django_db(transaction=True)
+def test_busy_pool_runs_serially(settings):
+    results, _ = run_categories({'users': thread_name, 'tasks': thread_name})
+    assert all(name.startswith('search') for name in results.values())
+
+    settings.SEARCH_WORKERS = 1
+    results, _ = run_categories({'users': thread_name, 'tasks': thread_name})
+    assert set(results.values()) == {threading.current_thread().name}
+
+@pytest.mark.django_db(transaction=True)
+def test_pool_connection_kept_between_searches(settings):
+    settings.SEARCH_TIMEOUTS = {'users': 0.5, 'tasks': 0.5}
+
+    def backend_session():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid(), current_setting(%s)', ['statement_timeout'])
+            return cursor.fetchone()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        first = executor.submit(_in_worker, 'users', backend_session).result()
+        second = executor.submit(_in_worker, 'tasks', backend_session).result()
+        assert first == second == (first[0], '500ms')
+    finally:
+        executor.submit(lambda: connection.close()).result()
+        executor.shutdown()
+
+#Testing - SearchView through the pool (committed rows, visible to pool connections)
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentSearchView:
+    @pytest.fixture(autouse=True)
+    def memory_backend(self, settings):
+        settings.SEARCH_BACKEND = 'junoapi.search_backends.InMemorySearchBackend'
+        reset_search_backend()
+        yield
+        reset_search_backend()
+
+    @pytest.fixture(autouse=True)
+    def setup(self, make_user, make_project):
+        self.client = APIClient()
+        self.user = make_user("onboarder")
+        self.client.force_authenticate(user=self.user)
+        self.project = make_project(self.user, "Onboarding revamp")
+        self.task = make_task(self.project, self.user, "Onboarding", "Welcome screens")
+
+    def test_all_categories(self):
+        response = self.client.get("/api/search/", {'q': "onboard"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [user['id'] for user in response.data['users']] == [self.user.id]
+        assert [task['id'] for task in response.data['tasks']] == [self.task.id]
+        assert [project['id'] for project in response.data['projects']] == [self.project.id]
+        assert 'timed_out' not in response.data
+
+    def test_timed_out_category(self, settings):
+        settings.SEARCH_TIMEOUTS = {'users': 0}
+        response = self.client.get("/api/search/", {'q': "onboard", 'type': "users,tasks"})
+
+        assert response.data['users'] == []
+        assert response.data['timed_out'] == ['users']
+        assert [task['id'] for task in response.data['tasks']] == [self.task.id]
@@ -0,0 +1,122 @@
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from junoapi.models import Attachment, Comment, Project, ProjectTeam, Task, Team
+from junoapi.streaming import json_array
+
+User = get_user_model()
+
+def test_json_array():
+    assert b''.join(json_array([])) == b'[]'
+    assert b''.join(json_array([b'[1,2]', b'[]', b'[3]'])) == b'[1,2,3]'
+
+#Testing - ?stream=true list responses
+@pytest.mark.django_db
+class TestStreamingLists:
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, settings):
+        settings.LIST_STREAM_CHUNK_SIZE = 2
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="streamer", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            name="Stream", description="desc", start_date=timezone.now(), due_date=timezone.now(), owner_id=self.user
+        )
+        for i in range(5):
+            task = Task.objects.create(
+                title=f"Task {i}", description="desc", status="To Do", priority="High",
+                start_date=timezone.now(), project_id=self.project, author_userid=self.user
+            )
+            Comment.objects.create(text=f"comment {i}", task_id=task, user_id=self.user)
+            Attachment.objects.create(file_url="https://example.com/a.pdf", file_name="a.pdf", task_id=task, uploadedby_id=self.user)
+        self.tasks_url = reverse("create-list-tasks")
+
+    def fetch_both(self, url, params=None):
+        params = params or {}
+        buffered = self.client.get(url, params)
+        streamed = self.client.get(url, {**params, 'stream': 'true'})
+        assert streamed.streaming
+        assert streamed['Content-Type'] == 'application/json'
+        pieces = list(streamed.streaming_content)
+        return buffered.content, pieces
+
+    def test_users(self):
+        for i in range(4):
+            User.objects.create_user(username=f"user{i}", cognito_id=str(uuid.uuid4()), password="test123")
+        buffered, pieces = self.fetch_both("/api/users/")
+
+        assert b''.join(pieces) == buffered
+        #brackets around one piece per chunk of two users
+        assert len(pieces) == 2 + 3
+
+    def test_team_projects(self):
+        for i in range(3):
+            team = Team.objects.create(domain_name=f"team{i}", productowner_userid=self.user)
+            ProjectTeam.objects.create(team_id=team, project_id=self.project)
+        buffered, pieces = self.fetch_both(reverse("get-project-team"))
+
+        assert b''.join(pieces) == buffered
+
+    def test_tasks_sql_path(self):
+        buffered, pieces = self.fetch_both(self.tasks_url, {"project_id": self.project.id, "ordering": "id"})
+
+        assert b''.join(pieces) == buffered
+        assert len(pieces) == 2 + 3
+
+    def test_tasks_serializer_path_prefetches_per_chunk(self, settings, django_assert_num_queries):
+        settings.TASK_LIST_SQL_JSON = False
+        buffered = self.client.get(self.tasks_url, {"project_id": self.project.id, "ordering": "id"}).content
+        response = self.client.get(self.tasks_url, {"project_id": self.project.id, "ordering": "id", "stream": "1"})
+
+        #the task cursor, then comments and attachments for each of the three chunks
+        with django_assert_num_queries(1 + 3 * 2):
+            body = b''.join(response.streaming_content)
+        assert body == buffered
+
+    def test_sparse_fields(self):
+        response = self.client.get(self.tasks_url, {"project_id": self.project.id, "fields": "id,title", "stream": "true"})
+        assert b''.join(response.streaming_content).startswith(b'[{"id":')
+
+    def test_empty(self):
+        response = self.client.get(self.tasks_url, {"project_id": 0, "stream": "true"})
+        assert b''.join(response.streaming_content) == b'[]'
+
+    def test_paginated_not_streamed(self, settings):
+        settings.TASK_LIST_SQL_JSON = False
+        params = {"project_id": self.project.id, "page_size": 2, "stream": "true"}
+        response = self.client.get(self.tasks_url, params)
+        assert not response.streaming
+        assert len(response.data["results"]) == 2
+
+        response = self.client.get(response.data["next"])
+        assert not response.streaming
+        assert len(response.data["results"]) == 2
+
+    def test_browsable_api_not_streamed(self):
+        response = self.client.get(self.tasks_url, {"project_id": self.project.id, "stream": "true"}, HTTP_ACCEPT='text/html')
+        assert not response.streaming
+
+#Testing - under ASGI the chunks are produced by an async iterator
+@pytest.mark.django_db(transaction=True)
+def test_streams_over_asgi():
+    user = User.objects.create_user(username="asgi", cognito_id=str(uuid.uuid4()), password="test123")
+    for i in range(3):
+        User.objects.create_user(username=f"member{i}", cognito_id=str(uuid.uuid4()), password="test123")
+    buffered = APIClient().get("/api/users/").content
+
+    async def fetch():
+        client = AsyncClient()
+        response = await client.get("/api/users/", {"stream": "true"})
+        assert response.is_async
+        return b''.join([piece async for piece in response.streaming_content])
+    assert async_to_sync(fetch)() == buffered
+    assert user.username.encode() in buffered
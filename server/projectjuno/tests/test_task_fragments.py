@@ -0,0 +1,132 @@
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from junoapi import task_fragments
+from junoapi.models import Attachment, Comment, Project, Task
+
+User = get_user_model()
+
+#Testing - per-task fragment cache
+#transaction=True: change_seq is the writing transaction's id, and a test
+#wrapped in one transaction would give every write the same version
+@pytest.mark.django_db(transaction=True)
+class TestTaskFragments:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="fragments", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            name="Fragments", description="desc", start_date=timezone.now(), due_date=timezone.now(), owner_id=self.user
+        )
+        self.tasks = []
+        for i in range(4):
+            task = Task.objects.create(
+                title=f"Task {i}", description="desc", status="To Do", priority="High", points=i,
+                start_date=timezone.now(), due_date=timezone.now(), project_id=self.project,
+                author_userid=self.user, assigned_userid=self.user
+            )
+            Comment.objects.create(text=f"comment {i}", task_id=task, user_id=self.user)
+            self.tasks.append(task)
+        self.page = {"project_id": self.project.id, "page_size": 10, "ordering": "id"}
+        self.url = reverse("create-list-tasks")
+        task_fragments.reset_stats()
+
+    def results(self, params=None):
+        return self.client.get(self.url, params or self.page).json()["results"]
+
+    def counts(self):
+        stats = task_fragments.stats()
+        return stats["hits"], stats["misses"]
+
+    def test_same_as_serializer(self, settings):
+        cached = self.results()
+        assert self.results() == cached
+        user_tasks = self.client.get(reverse("get-user-tasks", args=[self.user.id]), {"ordering": "id"}).json()
+
+        settings.TASK_FRAGMENT_CACHE = False
+        assert self.results() == cached
+        assert self.client.get(reverse("get-user-tasks", args=[self.user.id]), {"ordering": "id"}).json() == user_tasks
+        assert self.counts() == (8, 4)
+
+    def test_hits_read_only_versions(self, django_assert_num_queries):
+        self.results()
+        with django_assert_num_queries(1):
+            self.results()
+        assert task_fragments.stats() == {"hits": 4, "misses": 4, "hit_rate": 0.5}
+
+    def test_task_edit(self):
+        self.results()
+        task = self.tasks[1]
+        task.title = "Renamed"
+        task.save()
+
+        results = self.results()
+        assert results[1]["title"] == "Renamed"
+        assert self.counts() == (3, 4 + 1)
+
+    def test_comments_and_attachments(self):
+        self.results()
+        Comment.objects.create(text="new", task_id=self.tasks[0], user_id=self.user)
+        Attachment.objects.create(file_url="https://example.com/a.pdf", file_name="a.pdf", task_id=self.tasks[2], uploadedby_id=self.user)
+        Comment.objects.filter(task_id=self.tasks[3]).delete()
+
+        results = self.results()
+        assert [comment["text"] for comment in results[0]["comment"]] == ["comment 0", "new"]
+        assert results[2]["attachment"][0]["file_name"] == "a.pdf"
+        assert results[3]["comment"] == []
+        assert self.counts() == (1, 4 + 3)
+
+    def test_user_edits(self):
+        self.results()
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        self.results()
+        assert self.counts() == (4, 4)
+
+        self.user.username = "renamed"
+        self.user.save()
+        results = self.results()
+        assert results[0]["author"]["username"] == "renamed"
+        assert results[0]["comment"][0]["username"] == "renamed"
+        assert self.counts() == (4, 4 + 4)
+
+    def test_cursor_pages(self):
+        params = {"project_id": self.project.id, "page_size": 3, "ordering": "-due_date"}
+        first = self.client.get(self.url, params).json()
+        second = self.client.get(first["next"]).json()
+
+        ids = [task["id"] for task in first["results"] + second["results"]]
+        assert ids == [task.id for task in reversed(self.tasks)]
+
+    def test_delta_sync(self, settings):
+        #the client's task load - a full one, then only what changed
+        settings.TASK_LIST_SQL_JSON = False
+        params = {"project_id": self.project.id, "since": 0}
+        full = self.client.get(self.url, params).json()
+        assert self.client.get(self.url, params).json()["tasks"] == full["tasks"]
+        assert self.counts() == (4, 4)
+
+        task = self.tasks[2]
+        task.title = "Renamed"
+        task.save()
+        changes = self.client.get(self.url, {**params, "since": full["seq"]}).json()
+        assert [task["title"] for task in changes["tasks"]] == ["Renamed"]
+        assert self.counts() == (4, 4 + 1)
+
+    def test_sparse_fields_not_cached(self):
+        response = self.client.get(self.url, {**self.page, "fields": "id,title"})
+
+        assert set(response.json()["results"][0]) == {"id", "title"}
+        assert self.counts() == (0, 0)
+
+    def test_deleted_between_reads(self):
+        tasks = list(task_fragments.versions(Task.objects.filter(project_id=self.project).order_by("id")))
+        self.tasks[0].delete()
+
+        data = task_fragments.serialize(tasks, Task.objects.all())
+        assert [task["id"] for task in data] == [task.id for task in self.tasks[1:]]
@@ -0,0 +1,68 @@
+import pytest
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
+
+from junoapi.models import Task, Project
+
+User = get_user_model()
+
+STATUSES = ['To Do', 'Work In Progress', 'Under Review', 'Completed']
+PRIORITIES = ['Urgent', 'High', 'Medium', 'Low', 'Backlog']
+
+#EXPLAIN the filtered task queries on a seeded dataset and check the composite indexes serve them
+@pytest.fixture
+def seeded(db):
+    users = [
+        User.objects.create_user(username=f"user{i}", cognito_id=str(uuid.uuid4()), password="test123")
+        for i in range(20)
+    ]
+    projects = [
+        Project.objects.create(
+            name=f"Project {i}",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=users[0]
+        ) for i in range(20)
+    ]
+    Task.objects.bulk_create([
+        Task(
+            title=f"Task {i}",
+            description="desc",
+            status=STATUSES[i % 4],
+            priority=PRIORITIES[(i * 7) % 5],
+            start_date=timezone.now(),
+            project_id=projects[i % 20],
+            author_userid=users[i % 20],
+            assigned_userid=users[(i * 3) % 20]
+        ) for i in range(5000)
+    ])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE task')
+    return users, projects
+
+def plan(queryset):
+    return queryset.explain()
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="EXPLAIN output is PostgreSQL specific")
+class TestTaskFilterIndexes:
+    def test_assignee_priority(self, seeded):
+        users, _projects = seeded
+        assert 'task_assigned_priority_idx' in plan(Task.objects.filter(assigned_userid=users[1], priority='High'))
+
+    def test_assignee_status(self, seeded):
+        users, _projects = seeded
+        assert 'task_assigned_status_idx' in plan(Task.objects.filter(assigned_userid=users[1], status='To Do'))
+
+    def test_project_status(self, seeded):
+        _users, projects = seeded
+        assert 'task_project_status_idx' in plan(Task.objects.filter(project_id=projects[1], status='Completed'))
+
+    def test_project_priority(self, seeded):
+        _users, projects = seeded
+        assert 'task_project_priority_idx' in plan(Task.objects.filter(project_id=projects[1], priority='Urgent'))
+
@@ -0,0 +1,93 @@
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from junoapi.models import Attachment, Comment, Project, Task
+from junoapi.selectors import get_tasks
+from junoapi.serializers import TaskSerializer
+
+User = get_user_model()
+
+#text JSON escaping is easy to get subtly wrong on
+TRICKY = 'say "hi" \\ back\nline\ttab \x01 é ☃ 🚀 \u2028\u2029 </script>'
+
+#Testing - the SQL rendered task list against TaskSerializer + JSONRenderer
+@pytest.mark.django_db
+class TestTaskJsonContract:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="renée", email="renee@example.com", cognito_id=str(uuid.uuid4()), password="test123")
+        self.other = User.objects.create_user(username="o'brien", cognito_id=str(uuid.uuid4()), password="test123", profilepicture_id="p/1.jpeg")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Contract", description="desc", owner_id=self.user,
+            start_date=datetime(2026, 1, 1, tzinfo=dt_timezone.utc), due_date=datetime(2026, 3, 1, tzinfo=dt_timezone.utc),
+        )
+        whole_second = Task.objects.create(
+            title=TRICKY, description="", status="To Do", priority="High", tags=None,
+            start_date=datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc), due_date=None, points=None,
+            project_id=self.project, author_userid=self.user,
+        )
+        with_micros = Task.objects.create(
+            title="Second", description=TRICKY, status="Completed", priority="Low", tags="backend",
+            start_date=datetime(2026, 1, 2, 3, 4, 5, 120, tzinfo=dt_timezone.utc),
+            due_date=datetime(1999, 12, 31, 23, 59, 59, 999999, tzinfo=dt_timezone.utc), points=0,
+            project_id=self.project, author_userid=self.other, assigned_userid=self.user,
+        )
+        Comment.objects.create(text=TRICKY, task_id=with_micros, user_id=self.other)
+        Comment.objects.create(text="second", task_id=with_micros, user_id=self.user)
+        Attachment.objects.create(file_url="https://example.com/a b.pdf?x=1&y=2", file_name=TRICKY, task_id=with_micros, uploadedby_id=None)
+        Attachment.objects.create(file_url="https://example.com/b.pdf", file_name="b.pdf", task_id=whole_second, uploadedby_id=self.user)
+
+        self.url = reverse("create-list-tasks")
+
+    def serializer_bytes(self, queryset):
+        return JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+
+    def test_byte_for_byte(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"project_id": self.project.id, "ordering": "id"})
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == self.serializer_bytes(get_tasks(project_id=self.project.id).order_by('id'))
+
+    def test_filters_and_ordering_kept(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "status": "Completed,To Do", "ordering": "-id"})
+
+        assert response.content == self.serializer_bytes(get_tasks(project_id=self.project.id).order_by('-id'))
+
+    def test_empty_list(self):
+        response = self.client.get(self.url, {"project_id": 0})
+        assert response.content == b'[]'
+
+    def test_same_as_serializer_path(self, settings):
+        params = {"project_id": self.project.id, "ordering": "id"}
+        sql = self.client.get(self.url, params).content
+        settings.TASK_LIST_SQL_JSON = False
+
+        assert self.client.get(self.url, params).content == sql
+
+    def test_delta_sync_full_load(self, settings):
+        #?since=0 is how the client loads a list
+        params = {"project_id": self.project.id, "since": 0}
+        sql = self.client.get(self.url, params)
+        seq = sql.json()["seq"]
+        tasks = self.serializer_bytes(get_tasks(project_id=self.project.id).order_by('id'))
+        assert sql.content == b'{"seq":%d,"tasks":%s,"deleted":[]}' % (seq, tasks)
+
+        settings.TASK_LIST_SQL_JSON = False
+        assert self.client.get(self.url, params).json() == sql.json()
+
+    def test_pages_and_fieldsets_use_serializer(self, django_assert_num_queries):
+        #the page's versions, then the uncached tasks with their comment and attachment prefetches
+        with django_assert_num_queries(4):
+            self.client.get(self.url, {"project_id": self.project.id, "page_size": 10})
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"project_id": self.project.id, "fields": "id,title"})
+        assert set(response.json()[0]) == {"id", "title"}
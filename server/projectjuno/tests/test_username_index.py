@@ -0,0 +1,81 @@
+import pytest
+import threading
+import uuid
+
+from django.contrib.auth import get_user_model
+
+from junoapi import username_index
+from junoapi.username_index import UsernameIndex
+
+User = get_user_model()
+
+def names(suggestions):
+    return [username for _, username in suggestions]
+
+def test_prefix_in_alphabetical_order():
+    index = UsernameIndex.build([(1, "carol"), (2, "Caroline"), (3, "bob"), (4, "carl")])
+
+    assert names(index.suggest("car", 10)) == ["carl", "carol", "Caroline"]
+    assert names(index.suggest("CARO", 1)) == ["carol"]
+
+def test_boosted_users_first():
+    index = UsernameIndex.build([(1, "carol"), (2, "caroline"), (3, "carl")])
+
+    assert names(index.suggest("car", 2, boost_ids={2})) == ["caroline", "carl"]
+
+def test_fuzzy_fallback():
+    index = UsernameIndex.build([(1, "katherine"), (2, "bob")])
+
+    assert names(index.suggest("katherin", 5)) == ["katherine"]
+    assert names(index.suggest("kathrine", 5)) == ["katherine"]
+    assert index.suggest("", 5) == []
+
+def test_incremental_updates():
+    index = UsernameIndex.build([(1, "carol"), (2, "bob")])
+    index.add(3, "carla")
+    index.add(1, "zed")
+    index.remove(2)
+
+    assert names(index.suggest("car", 5)) == ["carla"]
+    assert names(index.suggest("z", 5)) == ["zed"]
+    assert index.suggest("bob", 5) == []
+    assert len(index) == 2
+
+@pytest.mark.django_db
+def test_follows_user_signals(django_capture_on_commit_callbacks):
+    username_index.reset()
+    username_index.suggest("warm", 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user = User.objects.create_user(username="typeahead-user", cognito_id=str(uuid.uuid4()), password="test123")
+    assert names(username_index.suggest("typeahead", 5)) == ["typeahead-user"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+    assert username_index.suggest("typeahead", 5) == []
+    username_index.reset()
+
+def test_writes_leave_published_index_alone(monkeypatch):
+    published = UsernameIndex.build([(1, "carol")])
+    monkeypatch.setattr(username_index, "_index", published)
+
+    username_index._apply("add", 2, "carla")
+
+    assert names(published.suggest("car", 5)) == ["carol"]
+    assert names(username_index._index.suggest("car", 5)) == ["carla", "carol"]
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_index_rebuilt_in_background(settings):
+    username_index.reset()
+    username_index.suggest("warm", 1)
+    settings.USERNAME_INDEX_TTL = 0
+    #bulk_create sends no signals, as if written by another process
+    User.objects.bulk_create([User(username="background-user", cognito_id=str(uuid.uuid4()))])
+
+    assert username_index.suggest("background", 5) == []
+    for thread in threading.enumerate():
+        if thread.name == "username-index-build":
+            thread.join()
+    settings.USERNAME_INDEX_TTL = None
+    assert names(username_index.suggest("background", 5)) == ["background-user"]
+    username_index.reset()
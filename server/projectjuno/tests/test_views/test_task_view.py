@@ -1,12 +1,14 @@
 import pytest
 import uuid
 
+from django.core.management import call_command
 from django.utils import timezone
 from django.urls import reverse
 from datetime import timedelta
 from django.contrib.auth import get_user_model
 
-from junoapi.models import Task, Project
+from junoapi.models import Task, Project, Comment, Attachment, TaskTombstone
+from junoapi.selectors import get_tasks
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -94,6 +96,264 @@ class TestListCreateTaskView:
         response = self.client.get(self.url, {"project_id": self.project.id})
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+@pytest.mark.django_db
+class TestTaskKeysetPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Test Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.user
+        )
+        for i in range(5):
+            self.create_task(f"Task {i}")
+
+        self.url = reverse("create-list-tasks")
+
+    def create_task(self, title):
+        return Task.objects.create(
+            title=title,
+            description="desc",
+            status="To Do",
+            priority="high",
+            start_date=timezone.now(),
+            project_id=self.project,
+            author_userid=self.user,
+            assigned_userid=self.user
+        )
+
+    def test_walk_pages_with_cursor(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [t['title'] for t in data['results']] == ["Task 0", "Task 1"]
+
+        titles = []
+        next_url = response.json()['next']
+        while next_url:
+            data = self.client.get(next_url).json()
+            titles += [t['title'] for t in data['results']]
+            next_url = data['next']
+        assert titles == ["Task 2", "Task 3", "Task 4"]
+
+    def test_stable_under_concurrent_inserts(self):
+        first = self.client.get(self.url, {"project_id": self.project.id, "page_size": 3}).json()
+        self.create_task("Task 5")
+
+        second = self.client.get(first['next']).json()
+        assert [t['title'] for t in second['results']] == ["Task 3", "Task 4", "Task 5"]
+
+    def test_page_size_cap(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "page_size": 10000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['results']) == 5
+
+    def test_user_tasks_paginated(self):
+        url = reverse('get-user-tasks', args=[self.user.id])
+        response = self.client.get(url, {"page_size": 4})
+
+        assert len(response.json()['results']) == 4
+        assert response.json()['next'] is not None
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(self.url, {"project_id": self.project.id})
+        assert isinstance(response.json(), list)
+        assert len(response.json()) == 5
+
+    def test_nullable_and_repeated_ordering_fields(self):
+        #points and due_date have NULLs, status and priority repeat
+        tasks = list(Task.objects.filter(project_id=self.project).order_by('id'))
+        for task, points, days in zip(tasks, [3, None, 1, None, 3], [2, None, 1, 2, None]):
+            task.points = points
+            task.due_date = None if days is None else timezone.now() + timedelta(days=days)
+            task.status = "Completed" if task.points == 3 else "To Do"
+            task.save()
+
+        for ordering in ["points", "-points", "due_date", "-due_date", "status", "-priority,points", "title"]:
+            expected = [t['id'] for t in self.client.get(self.url, {"project_id": self.project.id, "ordering": ordering}).json()]
+
+            response = self.client.get(self.url, {"project_id": self.project.id, "ordering": ordering, "page_size": 2})
+            ids = [t['id'] for t in response.json()['results']]
+            while response.json()['next']:
+                response = self.client.get(response.json()['next'])
+                assert response.status_code == status.HTTP_200_OK
+                ids += [t['id'] for t in response.json()['results']]
+            assert ids == expected, ordering
+
+            #and back again from the last page
+            back = []
+            while response.json()['previous']:
+                response = self.client.get(response.json()['previous'])
+                back = [t['id'] for t in response.json()['results']] + back
+            assert back == expected[:len(back)] and len(back) == 4, ordering
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "cursor": "cD1bImEiXQ=="})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db
+class TestTaskSparseFieldsets:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Test Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.user
+        )
+        for i in range(3):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                description="desc",
+                status="To Do",
+                priority="high",
+                start_date=timezone.now(),
+                project_id=self.project,
+                author_userid=self.user,
+                assigned_userid=self.user
+            )
+            Comment.objects.create(text="comment", task_id=task, user_id=self.user)
+            Attachment.objects.create(file_url="https://example.com/a.pdf", file_name="a.pdf", task_id=task, uploadedby_id=self.user)
+
+        self.url = reverse("create-list-tasks")
+
+    def test_sparse_fields(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"project_id": self.project.id, "fields": "id,title,status,priority"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()[0]) == {"id", "title", "status", "priority"}
+
+    def test_expand_keeps_flat_fields(self, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = self.client.get(self.url, {"project_id": self.project.id, "expand": "comment"})
+
+        task = response.json()[0]
+        assert "attachment" not in task and "author" not in task
+        assert task["status"] == "To Do"
+        assert task["comment"][0]["username"] == "testuser"
+
+    def test_fields_with_expanded_users(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"project_id": self.project.id, "fields": "id,title", "expand": "author,assigned"})
+
+        task = response.json()[0]
+        assert set(task) == {"id", "title", "author", "assigned"}
+        assert task["author"]["username"] == "testuser"
+
+    def test_full_representation_by_default(self, django_assert_num_queries):
+        #one statement assembling tasks, users, comments and attachments (junoapi.task_json)
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"project_id": self.project.id})
+
+        task = response.json()[0]
+        assert {"author", "assigned", "comment", "attachment"} <= set(task)
+
+    def test_full_representation_skips_search_vector(self):
+        task = get_tasks(project_id=self.project.id).first()
+        assert task.get_deferred_fields() == {"search_vector"}
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "fields": "id,secret"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_user_tasks_sparse_fields(self):
+        url = reverse('get-user-tasks', args=[self.user.id])
+        response = self.client.get(url, {"fields": "id,title"})
+
+        assert set(response.json()[0]) == {"id", "title"}
+
+@pytest.mark.django_db
+class TestTaskFilters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", cognito_id=str(uuid.uuid4()), password="test123")
+        self.other_user = User.objects.create_user(username="other user", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Test Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.user
+        )
+        now = timezone.now()
+        self.create_task("Urgent todo", "To Do", "Urgent", self.user, now + timedelta(days=1), "backend, api")
+        self.create_task("High todo", "To Do", "High", self.other_user, now + timedelta(days=10), "frontend")
+        self.create_task("High done", "Completed", "High", self.user, now - timedelta(days=3), "backend")
+
+        self.url = reverse("create-list-tasks")
+
+    def create_task(self, title, task_status, priority, assignee, due_date, tags):
+        return Task.objects.create(
+            title=title,
+            description="desc",
+            status=task_status,
+            priority=priority,
+            tags=tags,
+            start_date=timezone.now(),
+            due_date=due_date,
+            project_id=self.project,
+            author_userid=self.user,
+            assigned_userid=assignee
+        )
+
+    def titles(self, params):
+        response = self.client.get(self.url, {"project_id": self.project.id, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [t['title'] for t in response.json()]
+
+    def test_filter_by_status_and_priority(self):
+        assert set(self.titles({"status": "To Do"})) == {"Urgent todo", "High todo"}
+        assert self.titles({"status": "To Do", "priority": "High"}) == ["High todo"]
+        assert set(self.titles({"priority": "Urgent,High", "status": "Completed"})) == {"High done"}
+
+    def test_filter_by_assignee(self):
+        assert self.titles({"assigned_userid": self.other_user.id}) == ["High todo"]
+
+    def test_filter_by_due_range(self):
+        today = timezone.now().date()
+        assert set(self.titles({"due_after": today.isoformat()})) == {"Urgent todo", "High todo"}
+        assert set(self.titles({"due_before": (today + timedelta(days=1)).isoformat()})) == {"Urgent todo", "High done"}
+
+    def test_filter_by_tag(self):
+        assert set(self.titles({"tag": "backend"})) == {"Urgent todo", "High done"}
+
+    def test_ordering(self):
+        assert self.titles({"ordering": "-due_date"}) == ["High todo", "Urgent todo", "High done"]
+        assert self.titles({"ordering": "due_date", "status": "To Do"}) == ["Urgent todo", "High todo"]
+
+    def test_ordering_with_cursor_pagination(self):
+        response = self.client.get(self.url, {"project_id": self.project.id, "ordering": "due_date", "page_size": 2})
+        first = [t['title'] for t in response.json()['results']]
+        second = [t['title'] for t in self.client.get(response.json()['next']).json()['results']]
+
+        assert first + second == ["High done", "Urgent todo", "High todo"]
+
+    def test_invalid_filters(self):
+        response = self.client.get(self.url, {"due_after": "next week"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.get(self.url, {"assigned_userid": "me"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_user_tasks_priority_filter(self):
+        url = reverse('get-user-tasks', args=[self.user.id])
+        response = self.client.get(url, {"priority": "High"})
+
+        assert [t['title'] for t in response.json()] == ["High done"]
+
 @pytest.mark.django_db
 class TestUpdateTaskStatusView:
     def setup_method(self):
@@ -142,6 +402,229 @@ class TestUpdateTaskStatusView:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+@pytest.mark.django_db
+class TestBulkUpdateTasksView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", cognito_id=str(uuid.uuid4()), password="test123")
+        self.other_user = User.objects.create_user(username="other user", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Test Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.user
+        )
+        self.hidden_project = Project.objects.create(
+            name="Hidden Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.other_user
+        )
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="desc",
+                status="To Do",
+                priority="Low",
+                start_date=timezone.now(),
+                points=1,
+                project_id=self.project,
+                author_userid=self.user
+            ) for i in range(3)
+        ]
+        self.hidden_task = Task.objects.create(
+            title="Hidden Task",
+            description="desc",
+            status="To Do",
+            priority="Low",
+            start_date=timezone.now(),
+            project_id=self.hidden_project,
+            author_userid=self.other_user
+        )
+
+        self.url = reverse("bulk-update-tasks")
+
+    def test_bulk_update_successful(self):
+        payload = [
+            {"id": self.tasks[0].id, "status": "Completed"},
+            {"id": self.tasks[1].id, "priority": "Urgent", "points": 8},
+            {"id": self.tasks[2].id, "assigned_userid": self.other_user.id},
+        ]
+        response = self.client.patch(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["updated"] == 3
+        assert response.data["results"][1] == {"id": self.tasks[1].id, "updated": ["priority", "points"]}
+
+        for task in self.tasks:
+            task.refresh_from_db()
+        assert self.tasks[0].status == "Completed"
+        assert self.tasks[0].priority == "Low"
+        assert (self.tasks[1].priority, self.tasks[1].points) == ("Urgent", 8)
+        assert self.tasks[2].assigned_userid == self.other_user
+        assert self.tasks[2].status == "To Do"
+
+    def test_per_item_errors(self):
+        payload = [
+            {"id": self.tasks[0].id, "status": "Completed"},
+            {"id": 999999, "status": "Completed"},
+            {"id": self.hidden_task.id, "status": "Completed"},
+            {"id": self.tasks[1].id, "assigned_userid": 999999},
+            {"id": self.tasks[2].id},
+            {"id": self.tasks[0].id, "status": "Under Review"},
+        ]
+        response = self.client.patch(self.url, payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["updated"] == 1
+        results = response.data["results"]
+        assert results[0] == {"id": self.tasks[0].id, "updated": ["status"]}
+        assert results[1]["error"] == "Task not found"
+        assert "permission" in results[2]["error"]
+        assert results[3]["error"] == "Assigned user not found"
+        assert "non_field_errors" in results[4]["error"]
+        assert results[5]["error"] == "Duplicate task id"
+
+        self.hidden_task.refresh_from_db()
+        self.tasks[0].refresh_from_db()
+        assert self.hidden_task.status == "To Do"
+        assert self.tasks[0].status == "Completed"
+
+    def test_query_count(self, django_assert_max_num_queries):
+        #savepoint + admin check + locked select with the access check + bulk update + outbox insert + release, independent of the item count
+        payload = [{"id": task.id, "status": "Completed"} for task in self.tasks]
+        with django_assert_max_num_queries(6):
+            response = self.client.patch(self.url, payload, format='json')
+        assert response.data["updated"] == 3
+
+    def test_invalid_payload(self):
+        response = self.client.patch(self.url, {"id": self.tasks[0].id, "status": "Completed"}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauth_bulk_update(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.patch(self.url, [{"id": self.tasks[0].id, "status": "Completed"}], format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+#committed rows - a sync's seq is the oldest running transaction, which would otherwise be the test's own
+@pytest.mark.django_db(transaction=True)
+class TestTaskDeltaSync:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.project = Project.objects.create(
+            name="Test Project",
+            description="desc",
+            start_date=timezone.now(),
+            due_date=timezone.now() + timedelta(days=5),
+            owner_id=self.user
+        )
+        self.other = Project.objects.create(
+            name="Other", description="desc", start_date=timezone.now(), due_date=timezone.now(), owner_id=self.user
+        )
+        self.tasks = [self.create_task(f"Task {i}") for i in range(4)]
+        self.url = reverse("create-list-tasks")
+
+    def create_task(self, title):
+        return Task.objects.create(
+            title=title,
+            description="desc",
+            status="To Do",
+            priority="High",
+            start_date=timezone.now(),
+            project_id=self.project,
+            author_userid=self.user
+        )
+
+    def sync(self, since, **params):
+        return self.client.get(self.url, {"project_id": self.project.id, "since": since, **params})
+
+    def test_full_load(self):
+        data = self.sync(0).json()
+
+        assert [task['title'] for task in data['tasks']] == ["Task 0", "Task 1", "Task 2", "Task 3"]
+        assert data['deleted'] == []
+        assert data['seq'] > 0
+        assert self.sync(data['seq']).json()['tasks'] == []
+
+    def test_changes_and_tombstones(self):
+        seq = self.sync(0).json()['seq']
+        edited, deleted, moved, untouched = self.tasks
+        new = self.create_task("Task 4")
+        self.client.patch(reverse("update-task-status", args=[edited.id]), {"status": "Completed"}, format='json')
+        self.client.delete(reverse("delete-task", args=[deleted.id]))
+        moved.project_id = self.other
+        moved.save()
+
+        data = self.sync(seq).json()
+        assert [(task['id'], task['status']) for task in data['tasks']] == [(edited.id, "Completed"), (new.id, "To Do")]
+        assert data['deleted'] == sorted([deleted.id, moved.id])
+
+        assert self.sync(data['seq']).json() == {'seq': data['seq'], 'tasks': [], 'deleted': []}
+
+    def test_moved_back_is_a_change(self):
+        seq = self.sync(0).json()['seq']
+        task = self.tasks[0]
+        for project in (self.other, self.project):
+            task.project_id = project
+            task.save()
+
+        data = self.sync(seq).json()
+        assert [hit['id'] for hit in data['tasks']] == [task.id]
+        assert data['deleted'] == []
+
+    def test_queryset_updates_and_children_count_as_changes(self):
+        seq = self.sync(0).json()['seq']
+        before = Task.objects.get(id=self.tasks[0].id).updated_at
+        Task.objects.filter(id=self.tasks[0].id).update(priority="Low")
+        Comment.objects.create(text="ping", task_id=self.tasks[1], user_id=self.user)
+        Attachment.objects.create(file_url="https://example.com/a.pdf", file_name="a.pdf", task_id=self.tasks[2], uploadedby_id=self.user)
+
+        data = self.sync(seq).json()
+        assert [task['id'] for task in data['tasks']] == [task.id for task in self.tasks[:3]]
+        assert Task.objects.get(id=self.tasks[0].id).updated_at > before
+
+    def test_pruned_tombstones_force_a_reload(self):
+        seq = self.sync(0).json()['seq']
+        deleted, kept = self.tasks[0], self.tasks[1]
+        self.client.delete(reverse("delete-task", args=[deleted.id]))
+        self.client.delete(reverse("delete-task", args=[kept.id]))
+        TaskTombstone.objects.filter(task_id=deleted.id).update(deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command('prune_task_tombstones', '--retention', str(30 * 24 * 3600))
+        assert list(TaskTombstone.objects.values_list('task_id', flat=True)) == [kept.id]
+
+        #the deletion the client needed is gone, so it gets the whole list to start over from
+        data = self.sync(seq).json()
+        assert data['reset'] is True
+        assert data['deleted'] == []
+        assert [task['id'] for task in data['tasks']] == [task.id for task in self.tasks[2:]]
+        assert self.sync(data['seq']).json() == {'seq': data['seq'], 'tasks': [], 'deleted': []}
+
+    def test_sparse_fields(self):
+        data = self.sync(0, fields="id,status").json()
+        assert set(data['tasks'][0]) == {"id", "status"}
+
+    def test_invalid_params(self):
+        assert self.sync("abc").status_code == status.HTTP_400_BAD_REQUEST
+        assert self.sync(-1).status_code == status.HTTP_400_BAD_REQUEST
+        response = self.client.get(self.url, {"since": 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_project_access(self):
+        stranger = User.objects.create_user(username="stranger", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=stranger)
+
+        assert self.sync(0).status_code == status.HTTP_403_FORBIDDEN
+
 @pytest.mark.django_db
 class TestGetUserTaskView:
     def setup_method(self):
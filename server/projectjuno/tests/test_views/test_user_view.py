@@ -0,0 +1,66 @@
+import pytest
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from junoapi import username_index
+from junoapi.models import Team
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestUserSuggestView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="me", cognito_id=str(uuid.uuid4()), password="test123")
+        self.client.force_authenticate(user=self.user)
+
+        self.users = {
+            name: User.objects.create_user(username=name, cognito_id=str(uuid.uuid4()), password="test123")
+            for name in ["anna", "annabel", "annika", "bob"]
+        }
+        team = Team.objects.create(domain_name="team", productowner_userid=self.user)
+        team.members.add(self.users["annika"])
+
+        username_index.reset()
+        self.url = reverse("user-suggest")
+
+    def teardown_method(self):
+        username_index.reset()
+
+    def test_prefix_suggestions(self):
+        response = self.client.get(self.url, {"q": "ann", "limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [user["username"] for user in response.data["users"]] == ["anna", "annabel"]
+
+    def test_team_boost(self):
+        response = self.client.get(self.url, {"q": "ann", "boost": "team"})
+
+        assert [user["username"] for user in response.data["users"]] == ["annika", "anna", "annabel"]
+        assert response.data["users"][0]["teammate"]
+
+    def test_etag(self):
+        response = self.client.get(self.url, {"q": "ann"})
+        etag = response["ETag"]
+        assert "private" in response["Cache-Control"]
+
+        response = self.client.get(self.url, {"q": "ann"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = self.client.get(self.url, {"q": "bo"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_invalid_limit(self):
+        response = self.client.get(self.url, {"q": "ann", "limit": "x"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauth_suggest(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url, {"q": "ann"})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN